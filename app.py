@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Mapping, Tuple
 
 from flask import Flask, jsonify, render_template, request
 
-from src.doyle_spiral import DoyleSpiral
+from src.doyle_spiral import DoyleMath, DoyleSpiral
 
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
 
+# Optional on-disk table of precomputed Doyle solutions shared by all workers.
+SOLUTION_TABLE_PATH = os.environ.get("DOYLE_SOLUTION_TABLE")
+if SOLUTION_TABLE_PATH and os.path.exists(SOLUTION_TABLE_PATH):
+    DoyleMath.solution_table.load(SOLUTION_TABLE_PATH)
+
 
 DEFAULT_PARAMS: Dict[str, Any] = {
     "p": 16,
@@ -27,8 +35,14 @@ DEFAULT_PARAMS: Dict[str, Any] = {
     "fill_pattern_offset": 0.0,
     "red_outline": False,
     "draw_group_outline": True,
+    "precision": 2,
 }
 
+# Recently rendered spirals; re-rendering one only redoes the stages whose parameters changed.
+SPIRAL_CACHE_SIZE = 8
+_spiral_cache: "OrderedDict[Tuple[Any, ...], Tuple[DoyleSpiral, threading.Lock]]" = OrderedDict()
+_spiral_cache_lock = threading.Lock()
+
 ALLOWED_MODES = {"doyle", "arram_boyle"}
 ALLOWED_ARC_MODES = {
     "closest",
@@ -93,10 +107,34 @@ def _parse_params(source: Mapping[str, Any]) -> Dict[str, Any]:
     params["fill_pattern_offset"] = max(0.0, as_float("fill_pattern_offset", DEFAULT_PARAMS["fill_pattern_offset"]))
     params["red_outline"] = _parse_bool(source, "red_outline", DEFAULT_PARAMS["red_outline"])
     params["draw_group_outline"] = _parse_bool(source, "draw_group_outline", DEFAULT_PARAMS["draw_group_outline"])
+    # Decimal places of the SVG coordinates; 0.01 px is far below what a laser resolves
+    params["precision"] = min(8, max(0, as_int("precision", DEFAULT_PARAMS["precision"])))
 
     return params
 
 
+def _cached_spiral(params: Mapping[str, Any]) -> Tuple[DoyleSpiral, threading.Lock]:
+    """Return the spiral for the geometry parameters and the lock guarding its renders."""
+    key = (params["p"], params["q"], params["t"], params["arc_mode"], params["num_gaps"])
+    with _spiral_cache_lock:
+        entry = _spiral_cache.get(key)
+        if entry is None:
+            spiral = DoyleSpiral(
+                params["p"],
+                params["q"],
+                params["t"],
+                arc_mode=params["arc_mode"],
+                num_gaps=params["num_gaps"],
+            )
+            entry = (spiral, threading.Lock())
+            _spiral_cache[key] = entry
+            if len(_spiral_cache) > SPIRAL_CACHE_SIZE:
+                _spiral_cache.popitem(last=False)
+        else:
+            _spiral_cache.move_to_end(key)
+    return entry
+
+
 def _render_spiral(spiral: DoyleSpiral, params: Mapping[str, Any], *, mode: str | None = None) -> Tuple[str, Dict[str, Any] | None]:
     render_mode = mode or params["mode"]
     svg = spiral.to_svg(
@@ -109,6 +147,7 @@ def _render_spiral(spiral: DoyleSpiral, params: Mapping[str, Any], *, mode: str
         red_outline=params["red_outline"],
         draw_group_outline=params["draw_group_outline"],
         fill_pattern_offset=params["fill_pattern_offset"],
+        precision=params["precision"],
     )
 
     geometry = None
@@ -134,14 +173,9 @@ def generate_spiral():
     params = {**DEFAULT_PARAMS, **_parse_params(payload)}
 
     try:
-        spiral = DoyleSpiral(
-            params["p"],
-            params["q"],
-            params["t"],
-            arc_mode=params["arc_mode"],
-            num_gaps=params["num_gaps"],
-        )
-        svg, geometry = _render_spiral(spiral, params)
+        spiral, lock = _cached_spiral(params)
+        with lock:
+            svg, geometry = _render_spiral(spiral, params)
     except Exception as exc:  # pragma: no cover - error path
         app.logger.exception("Failed to generate spiral")
         return jsonify({"error": str(exc)}), 400
@@ -158,14 +192,9 @@ def spiral_geometry():
     params["mode"] = "arram_boyle"
 
     try:
-        spiral = DoyleSpiral(
-            params["p"],
-            params["q"],
-            params["t"],
-            arc_mode=params["arc_mode"],
-            num_gaps=params["num_gaps"],
-        )
-        _, geometry = _render_spiral(spiral, params, mode="arram_boyle")
+        spiral, lock = _cached_spiral(params)
+        with lock:
+            _, geometry = _render_spiral(spiral, params, mode="arram_boyle")
     except Exception as exc:  # pragma: no cover - error path
         app.logger.exception("Failed to export spiral geometry")
         return jsonify({"error": str(exc)}), 400
@@ -173,5 +202,15 @@ def spiral_geometry():
     return jsonify({"geometry": geometry, "params": params})
 
 
+@app.cli.command("precompute-solutions")
+def precompute_solutions() -> None:
+    """Solve the full slider range and write it to ``DOYLE_SOLUTION_TABLE``."""
+    if not SOLUTION_TABLE_PATH:
+        raise SystemExit("Set DOYLE_SOLUTION_TABLE to the output path first.")
+    solved = DoyleMath.solution_table.precompute()
+    DoyleMath.solution_table.save(SOLUTION_TABLE_PATH)
+    print(f"Solved {solved} new systems; {len(DoyleMath.solution_table)} stored in {SOLUTION_TABLE_PATH}")
+
+
 if __name__ == "__main__":  # pragma: no cover - manual execution only
     app.run(debug=True)
@@ -8,32 +8,41 @@ Original file is located at
 """
 
 import numpy as np
-from scipy.optimize import root
 from scipy.spatial import cKDTree
-import svgwrite
 from IPython.display import display, SVG, clear_output
 import ipywidgets as widgets
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
 import random
 import math
+import cmath
 import itertools
-from matplotlib.path import Path as MplPath
+import functools
+import collections
 import json
+import os
+import tempfile
+import threading
+import html
 
 try:
+    import shapely
     from shapely.geometry import Polygon as ShapelyPolygon
-    from shapely.geometry import LineString, MultiLineString, GeometryCollection, MultiPolygon
-    from shapely.prepared import prep as shapely_prep
+    from shapely.geometry import GeometryCollection, MultiPolygon
     HAS_SHAPELY = True
 except ImportError:  # pragma: no cover - shapely is optional
+    shapely = None  # type: ignore
     ShapelyPolygon = None  # type: ignore
-    LineString = None  # type: ignore
-    MultiLineString = None  # type: ignore
     GeometryCollection = None  # type: ignore
     MultiPolygon = None  # type: ignore
-    shapely_prep = None  # type: ignore
     HAS_SHAPELY = False
 
+try:
+    import svgwrite
+    HAS_SVGWRITE = True
+except ImportError:  # pragma: no cover - svgwrite is optional
+    svgwrite = None  # type: ignore
+    HAS_SVGWRITE = False
+
 # ============================================
 # Base Geometry and Drawing Classes
 # ============================================
@@ -49,12 +58,12 @@ class Shape:
         """
         self.visible = visible
 
-    def to_svg(self, dwg: svgwrite.Drawing):
+    def to_svg(self, dwg: 'SvgStreamWriter'):
         """
         Abstract method to render the shape to an SVG element.
 
         Args:
-            dwg: The svgwrite Drawing object.
+            dwg: The drawing making the element (:class:`SvgStreamWriter` or svgwrite Drawing).
 
         Raises:
             NotImplementedError: This method must be implemented by subclasses.
@@ -68,6 +77,10 @@ class Shape:
 
 def convert_polygon_to_array(polygon):
     """Convert polygon from complex numbers or list to numpy array."""
+    if isinstance(polygon, np.ndarray):
+        if np.iscomplexobj(polygon):
+            return np.column_stack((polygon.real, polygon.imag))
+        return polygon
     if polygon and isinstance(polygon[0], complex):
         return np.array([(p.real, p.imag) for p in polygon])
     return np.array(polygon)
@@ -112,98 +125,1023 @@ def apply_polygon_inset(polygon_array, offset):
 
     return np.array(exterior.coords)
 
-def line_segment_intersection(p1, p2, p3, p4):
-    """Calculate intersection point between two line segments.
-    
+def inset_polygons(vertices: np.ndarray, offsets: np.ndarray, distances) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :func:`apply_polygon_inset` for many polygons in a few shapely 2 array calls.
+
+    All polygons are built as one geometry array, buffered inward at once
+    (mitre joins), and reduced to the exterior of their largest part, exactly
+    like the single-polygon version. Polygons with a distance <= 0 are
+    returned unchanged. Without shapely's array API the polygons are inset
+    one at a time.
+
+    Args:
+        vertices: Nx2 vertices of all polygons, polygon ``i`` being
+            ``vertices[offsets[i]:offsets[i + 1]]``, each with at least 3 points.
+        offsets: Polygon boundaries, starting with 0.
+        distances: Inset distance, scalar or one per polygon.
+
     Returns:
-        Tuple (t, x, y) if intersection exists, None otherwise.
-        t is the parameter along p1-p2 (0 to 1).
+        ``(vertices, offsets)`` of the insets in the same layout; an inset the
+        buffer consumed is empty.
     """
-    x1, y1 = p1
-    x2, y2 = p2
-    x3, y3 = p3
-    x4, y4 = p4
-    
-    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
-    if abs(denom) < 1e-10:
-        return None
-    
-    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
-    u = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / denom
-    
-    if 0 <= t <= 1 and 0 <= u <= 1:
-        ix = x1 + t * (x2 - x1)
-        iy = y1 + t * (y2 - y1)
-        return (t, ix, iy)
-    return None
-
-def find_line_polygon_intersections(line_start, line_end, polygon_edges):
-    """Find all intersection points between a line and polygon edges.
-    
+    count = len(offsets) - 1
+    distances = np.broadcast_to(np.asarray(distances, dtype=float), (count,))
+    shrink = np.flatnonzero(distances > 0)
+    results: List[Optional[np.ndarray]] = [vertices[offsets[i]:offsets[i + 1]] for i in range(count)]
+    one_by_one = shrink
+    if len(shrink) and HAS_SHAPELY and hasattr(shapely, "get_parts"):
+        counts = np.diff(offsets)[shrink]
+        rows = np.concatenate([np.arange(offsets[i], offsets[i + 1]) for i in shrink])
+        try:
+            rings = shapely.linearrings(vertices[rows], indices=np.repeat(np.arange(len(shrink)), counts))
+            buffered = shapely.buffer(shapely.polygons(rings), -distances[shrink], join_style="mitre")
+        except Exception:
+            buffered = None
+        if buffered is not None:
+            parts, owners = shapely.get_parts(buffered, return_index=True)
+            polygons = shapely.get_type_id(parts) == 3
+            parts, owners = parts[polygons], owners[polygons]
+            # Largest part per polygon; the stable sort keeps the first of equal areas
+            order = np.lexsort((-shapely.area(parts), owners))
+            owners, first = np.unique(owners[order], return_index=True)
+            coords, rings_of = shapely.get_coordinates(
+                shapely.get_exterior_ring(parts[order][first]), return_index=True
+            )
+            bounds = np.searchsorted(rings_of, np.arange(len(owners) + 1))
+            for i in shrink:
+                results[i] = None
+            for n, owner in enumerate(owners.tolist()):
+                results[shrink[owner]] = coords[bounds[n]:bounds[n + 1]]
+            one_by_one = shrink[:0]
+    for i in one_by_one:
+        results[i] = apply_polygon_inset(results[i], distances[i])
+    results = [np.empty((0, 2)) if r is None else r for r in results]
+    new_offsets = np.concatenate(([0], np.cumsum([len(r) for r in results], dtype=np.int64)))
+    return (np.concatenate(results) if results else np.empty((0, 2))), new_offsets
+
+# Curve positions closer than this (as a fraction of the curve) to an end count as that end
+_CURVE_END_TOL = 1e-7
+# Distance, relative to the outline's extent, beside a curve at which the winding number is probed
+_OUTLINE_PROBE = 1e-7
+
+
+def outline_primitives(outlines: List[List[Tuple['ArcElement', bool]]], scales=1.0, shifts=0j,
+                       tol: float = 1e-3) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+    """
+    The exact curves of many arc outlines, outline ``i`` mapped by ``z -> (z - shifts[i]) / scales[i]``.
+
+    An outline follows :meth:`DrawingContext.arc_path_data`: the arcs in
+    order, an arc not starting where the previous one ends joined to it by a
+    straight segment, and a straight segment closing the outline if needed.
+
+    Args:
+        outlines: Per outline its ``(arc, reversed)`` pairs in order (see
+            :meth:`ArcGroup.get_outline_arcs`).
+        scales: Complex scale (size and rotation) dividing the coordinates,
+            scalar or one per outline.
+        shifts: Point moved to the origin, scalar or one per outline.
+        tol: Unmapped gap above which arcs are joined by a straight segment.
+
     Returns:
-        Sorted list of (t, x, y) tuples where t is parameter along line.
+        ``((starts, ends, centers, radii, sweeps), offsets)``: the curves in
+        traversal order, outline ``i`` owning ``offsets[i]:offsets[i + 1]``;
+        segments have an infinite radius and no sweep.
     """
-    intersections = []
-    for i in range(len(polygon_edges)):
-        p3 = polygon_edges[i]
-        p4 = polygon_edges[(i + 1) % len(polygon_edges)]
-        
-        intersection = line_segment_intersection(line_start, line_end, p3, p4)
-        if intersection:
-            intersections.append(intersection)
-    
-    return sorted(intersections, key=lambda x: x[0])
+    count = len(outlines)
+    scales = np.broadcast_to(np.asarray(scales, dtype=complex), (count,))
+    shifts = np.broadcast_to(np.asarray(shifts, dtype=complex), (count,))
+    pairs = [pair for outline in outlines for pair in outline]
+    first = np.array([arc.start for arc, _ in pairs], dtype=complex)
+    last = np.array([arc.end for arc, _ in pairs], dtype=complex)
+    arc_centers = np.array([arc.circle.center for arc, _ in pairs], dtype=complex)
+    arc_radii = np.array([arc.circle.radius for arc, _ in pairs], dtype=float)
+    flipped = np.array([reversed_arc for _, reversed_arc in pairs], dtype=bool)
+    arc_counts = np.array([len(outline) for outline in outlines], dtype=np.int64)
+    arc_offsets = np.concatenate(([0], np.cumsum(arc_counts)))
+    owners = np.repeat(np.arange(count), arc_counts)
+    # ArcElement.sweep_angle for all arcs at once
+    arc_sweeps = np.mod(np.angle(last - arc_centers) - np.angle(first - arc_centers), 2 * np.pi)
+    arc_sweeps = np.where(arc_sweeps > np.pi, arc_sweeps - 2 * np.pi, arc_sweeps)
+    begins, finishes = np.where(flipped, last, first), np.where(flipped, first, last)
+    following = begins[arc_offsets[owners] + (np.arange(len(pairs)) - arc_offsets[owners] + 1) % arc_counts[owners]]
+    gaps = np.abs(following - finishes) > tol
+
+    # Every arc followed by its joining segment, if any
+    slots = np.arange(len(pairs)) + np.concatenate(([0], np.cumsum(gaps)[:-1])).astype(np.int64)
+    joins = slots[gaps] + 1
+    total = len(pairs) + int(gaps.sum())
+    starts, ends, centers = np.zeros(total, dtype=complex), np.zeros(total, dtype=complex), np.zeros(total, dtype=complex)
+    radii, sweeps = np.full(total, np.inf), np.zeros(total)
+    starts[slots], ends[slots], centers[slots] = begins, finishes, arc_centers
+    radii[slots], sweeps[slots] = arc_radii, np.where(flipped, -arc_sweeps, arc_sweeps)
+    starts[joins], ends[joins] = finishes[gaps], following[gaps]
+    curve_owners = np.zeros(total, dtype=np.int64)
+    curve_owners[slots] = owners
+    curve_owners[joins] = owners[gaps]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(curve_owners, minlength=count)))).astype(np.int64)
+    scale, shift = scales[curve_owners], shifts[curve_owners]
+    return ((starts - shift) / scale, (ends - shift) / scale, (centers - shift) / scale,
+            radii / np.abs(scale), sweeps), offsets
+
+
+def _curve_points(starts, ends, centers, radii, sweeps, fractions) -> np.ndarray:
+    """Points at ``fractions`` (0 at the start, 1 at the end) along arcs and segments."""
+    return np.where(np.isfinite(radii), centers + (starts - centers) * np.exp(1j * sweeps * fractions),
+                    starts + (ends - starts) * fractions)
+
+
+def _curve_tangents(starts, ends, centers, radii, sweeps, fractions) -> np.ndarray:
+    """Unit directions of travel at ``fractions`` along arcs and segments."""
+    radial = (starts - centers) * np.exp(1j * sweeps * fractions)
+    directions = np.where(np.isfinite(radii), 1j * np.sign(sweeps) * radial, ends - starts)
+    return directions / np.abs(directions)
+
+
+def _curve_fractions(points, starts, ends, centers, radii, sweeps) -> np.ndarray:
+    """Positions of ``points`` on the circles or lines of arcs and segments, as in :func:`_curve_points`."""
+    chord = ends - starts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(np.isfinite(radii), np.angle((points - centers) / (starts - centers)) / sweeps,
+                        ((points - starts) * chord.conj()).real / np.abs(chord) ** 2)
+
+
+def _curve_intersections(c1, r1, p1, t1, c2, r2, p2, t2) -> np.ndarray:
+    """
+    Intersections of pairs of whole circles or lines.
 
+    Curve ``k`` of a side is the circle ``(c[k], r[k])`` or, where ``r[k]`` is
+    infinite, the line through ``p[k]`` with unit direction ``t[k]``.
 
-def _shapely_geometry_to_segments(geometry):
-    """Convert shapely geometry result into a list of line segments."""
-    segments = []
-    if geometry is None or getattr(geometry, "is_empty", True):
-        return segments
+    Returns:
+        Complex array of shape (K, 2), NaN where there is no intersection; two
+        lines repeat their one point.
+    """
+    points = np.full((len(c1), 2), np.nan, dtype=complex)
+    circle1, circle2 = np.isfinite(r1), np.isfinite(r2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        both = circle1 & circle2
+        if both.any():
+            delta = c2[both] - c1[both]
+            d = np.abs(delta)
+            d = np.where(d > 0, d, np.nan)
+            a = (r1[both] ** 2 - r2[both] ** 2 + d ** 2) / (2 * d)
+            h = np.sqrt(r1[both] ** 2 - a ** 2)
+            mid = c1[both] + a * delta / d
+            points[both] = np.stack([mid + h * 1j * delta / d, mid - h * 1j * delta / d], axis=1)
+        for mixed, p, t, c, r in ((~circle1 & circle2, p1, t1, c2, r2), (circle1 & ~circle2, p2, t2, c1, r1)):
+            if mixed.any():
+                # Foot of the center on the line, plus and minus half the chord
+                p, t, c, r = p[mixed], t[mixed], c[mixed], r[mixed]
+                foot = p + t * (t.conj() * (c - p)).real
+                h = np.sqrt(r ** 2 - np.abs(c - foot) ** 2)
+                points[mixed] = np.stack([foot + h * t, foot - h * t], axis=1)
+        lines = ~circle1 & ~circle2
+        if lines.any():
+            cross = (t1[lines].conj() * t2[lines]).imag
+            cross = np.where(np.abs(cross) > 1e-12, cross, np.nan)
+            point = p1[lines] + t1[lines] * ((p2[lines] - p1[lines]).conj() * t2[lines]).imag / cross
+            points[lines] = point[:, None]
+    return points
+
+
+def _line_directions(starts, ends, radii) -> np.ndarray:
+    """Unit directions of the segments among arcs and segments (1 for arcs)."""
+    line = ~np.isfinite(radii)
+    return np.where(line, ends - starts, 1) / np.where(line, np.abs(ends - starts), 1)
+
+
+def _winding_numbers(points, owners, starts, ends, centers, radii, sweeps, offsets) -> np.ndarray:
+    """Winding numbers of ``points`` about the closed outlines of arcs and segments they belong to."""
+    counts = np.diff(offsets)[owners]
+    point_index = np.repeat(np.arange(len(points)), counts)
+    curve = np.repeat(offsets[:-1][owners], counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    x = points[point_index]
+    s, e, c, r, sweep = starts[curve], ends[curve], centers[curve], radii[curve], sweeps[curve]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        turn = np.nan_to_num(np.angle((e - x) / (s - x)))
+    # An arc also winds once around the points between it and its chord
+    chord = e - s
+    bulge = c + (s - c) * np.exp(0.5j * sweep)
+    between = (np.abs(x - c) < r) & (((x - s) * chord.conj()).imag * ((bulge - s) * chord.conj()).imag > 0)
+    turn += 2 * np.pi * np.sign(sweep) * between
+    return np.rint(np.bincount(point_index, weights=turn, minlength=len(points)) / (2 * np.pi)).astype(int)
+
+
+def arc_outline_boundary(starts, ends, centers, radii, sweeps, offsets) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+    """
+    Boundary of the regions filled by closed outlines of arcs and segments.
 
-    geom_type = getattr(geometry, "geom_type", None)
-    if geom_type == "LineString":
-        coords = list(geometry.coords)
-        if len(coords) >= 2:
-            start = tuple(map(float, coords[0]))
-            end = tuple(map(float, coords[-1]))
-            segments.append((start, end))
-    elif geom_type == "MultiLineString":
-        for line in geometry.geoms:  # type: ignore[attr-defined]
-            segments.extend(_shapely_geometry_to_segments(line))
-    elif geom_type == "GeometryCollection":
-        for geom in geometry.geoms:  # type: ignore[attr-defined]
-            segments.extend(_shapely_geometry_to_segments(geom))
+    Outlines may cross themselves; the filled region is where an outline winds
+    the same way as it does as a whole, as for :func:`clip_hatch_lines_batch`.
+    The curves are split where they cross each other, and the pieces with the
+    region on just one side are kept, turned to have it on their left.
 
-    return segments
+    Args:
+        starts, ends, centers, radii, sweeps: The curves of all outlines (see
+            :func:`outline_primitives`).
+        offsets: Outline boundaries in the curve arrays, starting with 0.
+
+    Returns:
+        ``(pieces, piece_offsets)``: the boundary pieces in the layout of the
+        input curves, outline ``i`` owning ``piece_offsets[i]:piece_offsets[i + 1]``.
+    """
+    offsets = np.asarray(offsets)
+    counts = np.diff(offsets)
+    count, total = len(counts), len(starts)
+    owners = np.repeat(np.arange(count), counts)
+    curves = (starts, ends, centers, radii, sweeps)
+    directions = _line_directions(starts, ends, radii)
+    arc = np.isfinite(radii)
+    nonempty = counts > 0
+    extents, areas = np.zeros(count), np.zeros(count)
+    if total:
+        segment_areas = np.where(arc, 0.5 * np.where(arc, radii, 0) ** 2 * (sweeps - np.sin(sweeps)), 0)
+        extents[nonempty] = np.maximum.reduceat(np.maximum(np.abs(starts), np.abs(ends)), offsets[:-1][nonempty])
+        areas[nonempty] = np.add.reduceat(0.5 * (starts.conj() * ends).imag + segment_areas, offsets[:-1][nonempty])
+    orientation = np.where(areas < 0, -1, 1)
+
+    # Crossings of every pair of curves of an outline, away from their ends
+    later = offsets[1:][owners] - np.arange(total) - 1
+    first = np.repeat(np.arange(total), later)
+    second = first + 1 + np.arange(later.sum()) - np.repeat(np.cumsum(later) - later, later)
+    found = _curve_intersections(centers[first], radii[first], starts[first], directions[first],
+                                 centers[second], radii[second], starts[second], directions[second]).ravel()
+    first, second = np.repeat(first, 2), np.repeat(second, 2)
+    real = ~np.isnan(found)
+    first, second, found = first[real], second[real], found[real]
+    at = [_curve_fractions(found, *(part[curve] for part in curves)) for curve in (first, second)]
+    on_both = (np.abs(at[0] - 0.5) <= 0.5 + _CURVE_END_TOL) & (np.abs(at[1] - 0.5) <= 0.5 + _CURVE_END_TOL)
+    split_curves, split_at = [np.arange(total), np.arange(total)], [np.zeros(total), np.ones(total)]
+    for curve, fraction in zip((first, second), at):
+        inner = on_both & (np.abs(fraction - 0.5) < 0.5 - _CURVE_END_TOL)
+        split_curves.append(curve[inner])
+        split_at.append(fraction[inner])
+    split_curves, split_at = np.concatenate(split_curves), np.concatenate(split_at)
+    order = np.lexsort((split_at, split_curves))
+    split_curves, split_at = split_curves[order], split_at[order]
+    # Tangent curves cross twice in one point
+    repeated = np.zeros(len(split_at), dtype=bool)
+    repeated[1:] = (split_curves[1:] == split_curves[:-1]) & (split_at[1:] - split_at[:-1] < _CURVE_END_TOL)
+    split_curves, split_at = split_curves[~repeated], split_at[~repeated]
+
+    # Pieces between consecutive splits, probed just left and right of their middle
+    pieces = np.flatnonzero(split_curves[1:] == split_curves[:-1])
+    curve = split_curves[pieces]
+    f0, f1 = split_at[pieces], split_at[pieces + 1]
+    part = tuple(p[curve] for p in curves)
+    middle = _curve_points(*part, 0.5 * (f0 + f1))
+    normal = 1j * _curve_tangents(*part, 0.5 * (f0 + f1)) * _OUTLINE_PROBE * extents[owners[curve]]
+    probes = np.concatenate((middle + normal, middle - normal))
+    winding = _winding_numbers(probes, np.tile(owners[curve], 2), *curves, offsets)
+    inside = winding * np.tile(orientation[owners[curve]], 2) > 0
+    left, right = inside[:len(curve)], inside[len(curve):]
+    keep = left != right
+    curve, f0, f1, flip = curve[keep], f0[keep], f1[keep], right[keep]
+    part = tuple(p[curve] for p in curves)
+    piece_starts = np.where(f0 == 0, starts[curve], _curve_points(*part, f0))
+    piece_ends = np.where(f1 == 1, ends[curve], _curve_points(*part, f1))
+    piece_sweeps = sweeps[curve] * (f1 - f0)
+    piece_starts, piece_ends = np.where(flip, piece_ends, piece_starts), np.where(flip, piece_starts, piece_ends)
+    piece_sweeps = np.where(flip, -piece_sweeps, piece_sweeps)
+
+    # An outline running twice the same way along a stretch (overlapping
+    # segments) leaves two copies of its pieces there, but one boundary
+    piece_owners = owners[curve]
+    later = np.searchsorted(piece_owners, piece_owners, side="right") - np.arange(len(curve)) - 1
+    first = np.repeat(np.arange(len(curve)), later)
+    second = first + 1 + np.arange(later.sum()) - np.repeat(np.cumsum(later) - later, later)
+    tol = _CURVE_END_TOL * extents[piece_owners[first]]
+    same = ((np.abs(piece_starts[first] - piece_starts[second]) <= tol)
+            & (np.abs(piece_ends[first] - piece_ends[second]) <= tol)
+            & (np.abs(piece_sweeps[first] - piece_sweeps[second]) <= _CURVE_END_TOL))
+    unique = np.ones(len(curve), dtype=bool)
+    unique[second[same]] = False
+    curve, piece_starts, piece_ends, piece_sweeps = (
+        curve[unique], piece_starts[unique], piece_ends[unique], piece_sweeps[unique])
+    piece_offsets = np.searchsorted(owners[curve], np.arange(count + 1))
+    return (piece_starts, piece_ends, centers[curve], radii[curve], piece_sweeps), piece_offsets
+
+
+def _slab_interval(alpha, beta, low, high) -> Tuple[np.ndarray, np.ndarray]:
+    """The open intervals of x with ``low < alpha * x + beta < high``, empty ones having start >= end."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a, b = (low - beta) / alpha, (high - beta) / alpha
+    flat = alpha == 0
+    level = (low < beta) & (beta < high)
+    lo = np.where(flat, np.where(level, -np.inf, np.inf), np.minimum(a, b))
+    hi = np.where(flat, np.where(level, np.inf, -np.inf), np.maximum(a, b))
+    return lo, hi
+
+
+def _expand_lines(first, last) -> Tuple[np.ndarray, np.ndarray]:
+    """Every ``(row, k)`` with ``first[row] <= k <= last[row]``."""
+    counts = np.maximum(last - first + 1, 0)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    return rows, first[rows] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def hatch_arc_outlines(starts, ends, centers, radii, sweeps, offsets, distances, spacings, angles,
+                       origins) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Clip parallel lines to the insets of closed outlines of arcs and segments, exactly.
+
+    The inset of the region an outline fills (see :func:`arc_outline_boundary`)
+    is the part of it at least the inset distance away from its boundary, so
+    on every line it is the region's intervals less the intervals within that
+    distance of a boundary piece: the disks about the piece ends, the band
+    along a segment and the annular sector along an arc. Both are found in
+    closed form, so nothing is sampled, insets that split keep every part and
+    insets a feature pinches off vanish, unlike :func:`inset_polygons`
+    followed by :func:`clip_hatch_lines_batch`.
+
+    Args:
+        starts, ends, centers, radii, sweeps: The curves of all outlines (see
+            :func:`outline_primitives`).
+        offsets: Outline boundaries in the curve arrays, starting with 0.
+        distances: Inset distance per outline (0 clips to the region itself).
+        spacings: Line spacing per outline.
+        angles: Line angle in degrees per outline.
+        origins: Complex point per outline that one of its lines passes through.
+
+    Returns:
+        ``(segments, segment_offsets)``: a complex (M, 2) array of segment
+        starts and ends and the boundaries of each outline's segments in it.
+    """
+    offsets = np.asarray(offsets)
+    count = len(offsets) - 1
+    distances = np.broadcast_to(np.asarray(distances, dtype=float), (count,))
+    spacings = np.broadcast_to(np.asarray(spacings, dtype=float), (count,))
+    origins = np.broadcast_to(np.asarray(origins, dtype=complex), (count,))
+    # Line space: the lines of an outline at the integer imaginary parts
+    frames = spacings * np.exp(1j * np.radians(np.broadcast_to(np.asarray(angles, dtype=float), (count,))))
+    (starts, ends, centers, radii, sweeps), piece_offsets = arc_outline_boundary(
+        *(np.asarray(p) for p in (starts, ends, centers, radii, sweeps)), offsets)
+    if not len(starts):
+        return np.empty((0, 2), dtype=complex), np.zeros(count + 1, dtype=np.int64)
+    owners = np.repeat(np.arange(count), np.diff(piece_offsets))
+    starts, ends, centers = ((z - origins[owners]) / frames[owners] for z in (starts, ends, centers))
+    radii, reach = radii / spacings[owners], distances / spacings
+    arc = np.isfinite(radii)
+
+    # Split arcs where they pass their top or bottom, so that every piece rises
+    # or falls throughout and spans at most half a turn
+    start_angles = np.angle(starts - centers)
+    split_curves, split_at = [np.arange(len(starts)), np.arange(len(starts))], [np.zeros(len(starts)), np.ones(len(starts))]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for extreme in (0.5 * np.pi, -0.5 * np.pi):
+            fraction = np.mod((extreme - start_angles) * np.sign(sweeps), 2 * np.pi) * np.sign(sweeps) / sweeps
+            inner = np.flatnonzero(arc & (fraction > _CURVE_END_TOL) & (fraction < 1 - _CURVE_END_TOL))
+            split_curves.append(inner)
+            split_at.append(fraction[inner])
+    split_curves, split_at = np.concatenate(split_curves), np.concatenate(split_at)
+    order = np.lexsort((split_at, split_curves))
+    split_curves, split_at = split_curves[order], split_at[order]
+    pieces = np.flatnonzero(split_curves[1:] == split_curves[:-1])
+    curve = split_curves[pieces]
+    f0, f1 = split_at[pieces], split_at[pieces + 1]
+    part = tuple(p[curve] for p in (starts, ends, centers, radii, sweeps))
+    p0 = np.where(f0 == 0, starts[curve], _curve_points(*part, f0))
+    p1 = np.where(f1 == 1, ends[curve], _curve_points(*part, f1))
+    c, r, sweep, on_arc, owner = centers[curve], radii[curve], part[4] * (f1 - f0), arc[curve], owners[curve]
+    y0, y1 = p0.imag, p1.imag
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+
+    # Boundary crossings, each line counting a piece over [low, high) as the polygon clipper does
+    rows, k = _expand_lines(np.ceil(low).astype(np.int64), np.ceil(high).astype(np.int64) - 1)
+    side = np.sign((0.5 * (p0 + p1) - c).real[rows])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        along = p0.real[rows] + (k - y0[rows]) / (y1 - y0)[rows] * (p1 - p0).real[rows]
+        around = c.real[rows] + side * np.sqrt(np.maximum(r[rows] ** 2 - (k - c.imag[rows]) ** 2, 0))
+    events = [(owner[rows], k, np.where(on_arc[rows], around, along), np.where(y1 < y0, 1, -1)[rows], 0)]
+
+    # Intervals within the inset distance of a piece, entering +1 and leaving -1
+    near_starts, near_ends, near_owners, near_k = [], [], [], []
+    d = reach[owner]
+    rows, k = _expand_lines(np.floor(low - d).astype(np.int64) + 1, np.ceil(high + d).astype(np.int64) - 1)
+    dy = k - c.imag[rows]
+    # Annular sectors along arcs: the ring about the center, within the wedge of the arc
+    d_rows, r_rows, sign_rows = d[rows], np.where(on_arc, r, 0)[rows], np.sign(sweep)[rows]
+    with np.errstate(invalid="ignore"):
+        outer = np.sqrt((r_rows + d_rows) ** 2 - dy ** 2)
+        inner = np.where(r_rows - d_rows > np.abs(dy), np.sqrt((r_rows - d_rows) ** 2 - dy ** 2), 0)
+    u, v = (p0 - c)[rows], (p1 - c)[rows]
+    wedge_lo1, wedge_hi1 = _slab_interval(-sign_rows * u.imag, sign_rows * u.real * dy, 0, np.inf)
+    wedge_lo2, wedge_hi2 = _slab_interval(sign_rows * v.imag, -sign_rows * v.real * dy, 0, np.inf)
+    wedge_lo, wedge_hi = np.maximum(wedge_lo1, wedge_lo2), np.minimum(wedge_hi1, wedge_hi2)
+    arc_rows = on_arc[rows] & (outer > 0)
+    for ring_lo, ring_hi in ((-outer, -inner), (inner, outer)):
+        near_starts.append(c.real[rows][arc_rows] + np.maximum(ring_lo, wedge_lo)[arc_rows])
+        near_ends.append(c.real[rows][arc_rows] + np.minimum(ring_hi, wedge_hi)[arc_rows])
+        near_owners.append(owner[rows][arc_rows])
+        near_k.append(k[arc_rows])
+    # Bands along segments
+    line_rows = ~on_arc[rows]
+    rows, k, d_rows = rows[line_rows], k[line_rows], d_rows[line_rows]
+    direction = (p1 - p0)[rows]
+    length = np.abs(direction)
+    direction = direction / np.where(length > 0, length, 1)
+    offset = direction.conj() * (1j * k - p0[rows])
+    band_lo1, band_hi1 = _slab_interval(direction.real, offset.real, 0, length)
+    band_lo2, band_hi2 = _slab_interval(-direction.imag, offset.imag, -d_rows, d_rows)
+    near_starts.append(np.maximum(band_lo1, band_lo2))
+    near_ends.append(np.minimum(band_hi1, band_hi2))
+    near_owners.append(owner[rows])
+    near_k.append(k)
+    # Disks about the piece ends, every end also starting a piece
+    d = reach[owners]
+    rows, k = _expand_lines(np.floor(starts.imag - d).astype(np.int64) + 1, np.ceil(starts.imag + d).astype(np.int64) - 1)
+    half = np.sqrt(np.maximum(d[rows] ** 2 - (k - starts.imag[rows]) ** 2, 0))
+    near_starts.append(starts.real[rows] - half)
+    near_ends.append(starts.real[rows] + half)
+    near_owners.append(owners[rows])
+    near_k.append(k)
+    near_starts, near_ends = np.concatenate(near_starts), np.concatenate(near_ends)
+    near_owners, near_k = np.concatenate(near_owners), np.concatenate(near_k)
+    real = near_starts < near_ends
+    for at, step in ((near_starts, 1), (near_ends, -1)):
+        events.append((near_owners[real], near_k[real], at[real], 0, step))
+
+    # Sweep every line: inside the region and near no piece
+    outline = np.concatenate([e[0] for e in events])
+    k = np.concatenate([e[1] for e in events])
+    x = np.concatenate([e[2] for e in events])
+    region_steps = np.concatenate([np.broadcast_to(e[3], len(e[0])) for e in events])
+    near_steps = np.concatenate([np.broadcast_to(e[4], len(e[0])) for e in events])
+    order = np.lexsort((x, k, outline))
+    outline, k, x, region_steps, near_steps = outline[order], k[order], x[order], region_steps[order], near_steps[order]
+    if not len(x):
+        return np.empty((0, 2), dtype=complex), np.zeros(count + 1, dtype=np.int64)
+    line_start = np.ones(len(x), dtype=bool)
+    line_start[1:] = (k[1:] != k[:-1]) | (outline[1:] != outline[:-1])
+    line_of = np.cumsum(line_start) - 1
+
+    def running(steps):
+        total = np.cumsum(steps)
+        return total - (total - steps)[line_start][line_of]
+
+    inside = (running(region_steps) > 0) & (running(near_steps) <= 0)
+    # Every line ends outside, whatever rounding did to its last crossing
+    inside[np.concatenate((line_start[1:], [True]))] = False
+    was_inside = np.concatenate(([False], inside[:-1])) & ~line_start
+    enter, leave = inside & ~was_inside, ~inside & was_inside
+    lines, x_start, x_end, outline = k[enter], x[enter], x[leave], outline[enter]
+    keep = x_end > x_start
+    lines, x_start, x_end, outline = lines[keep], x_start[keep], x_end[keep], outline[keep]
+    segments = origins[outline, None] + frames[outline, None] * (np.column_stack((x_start, x_end)) + 1j * lines[:, None])
+    segment_offsets = np.concatenate(([0], np.cumsum(np.bincount(outline, minlength=count))))
+    return segments, segment_offsets
+
+
+# Relative tolerance under which two distances count as tied. Tangent points are
+# only accurate to about sqrt(machine epsilon), so ties are judged that coarsely.
+_TIE_RTOL = 1e-6
+
+
+def tie_classes(values, scale: float = 1.0) -> List[float]:
+    """
+    Snaps values that are tied within ``_TIE_RTOL * scale`` to one shared value.
+
+    Sorted values are split into runs whose consecutive gaps stay within the
+    tolerance; every value is replaced by the smallest of its run. Sorting on
+    the result lets mirror-image ties fall through to the next sort key
+    instead of being decided by rounding noise.
+
+    Args:
+        values: Sort keys, e.g. distances or angles.
+        scale: Magnitude the tolerance is relative to, e.g. a circle radius.
+
+    Returns:
+        The snapped values, in the input order.
+    """
+    values = np.asarray(values, dtype=float)
+    if not values.size:
+        return []
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    run_start = np.ones(len(values), dtype=bool)
+    run_start[1:] = np.diff(sorted_values) > _TIE_RTOL * scale
+    snapped = np.empty_like(values)
+    snapped[order] = sorted_values[np.maximum.accumulate(np.where(run_start, np.arange(len(values)), 0))]
+    return snapped.tolist()
+
+
+def circle_intersection_points(c1: complex, r1: float, c2: complex, r2: float, tol: float = 1e-6) -> List[complex]:
+    """
+    Calculates the intersection points between two circles.
+
+    Uses the Law of Cosines to find the distance from the first center to the chord connecting
+    the intersection points, then finds the points on the circle along the perpendicular vector.
+
+    Returns:
+        A list of complex numbers representing the intersection points (0, 1, or 2 points).
+    """
+    d = abs(c1 - c2)
+
+    # Check for no intersection, tangency (external or internal), or one circle contained within another
+    if d > r1 + r2 + tol or d < abs(r1 - r2) - tol or d < tol:
+        return []
+
+    # Distance 'a' from center 1 to the chord connecting intersection points
+    a = (r1**2 - r2**2 + d**2) / (2 * d)
+    # Half the length of the chord, squared
+    h_sq = r1**2 - a**2
+    if h_sq < -tol: # Should not happen with checks above, but floating point safety
+        return []
+    # Half the length of the chord
+    h = np.sqrt(max(h_sq, 0))
+
+    # Midpoint of the chord
+    mid = c1 + a * (c2 - c1) / d
+    # Vector perpendicular to the line between centers, scaled by 1/d
+    perp_unit = 1j * (c2 - c1) / d
+
+    # The two intersection points
+    p1, p2 = mid + h * perp_unit, mid - h * perp_unit
+
+    # If h is near zero, the points are the same (tangency)
+    return [p1] if h < tol else [p1, p2]
+
+
+def circle_intersections_batch(centers: np.ndarray, radii: np.ndarray, owners: np.ndarray,
+                               others: np.ndarray, tol: float = 1e-6) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized :func:`circle_intersection_points` over candidate pairs.
+
+    Pair ``k`` intersects circle ``owners[k]`` with circle ``others[k]``, seen
+    from the owner. Points come back in pair order, the two points of a pair
+    in the same order as :func:`circle_intersection_points`.
+
+    Returns:
+        ``(owners, points, others)`` arrays with one entry per intersection point.
+    """
+    centers = np.asarray(centers, dtype=complex)
+    radii = np.asarray(radii, dtype=float)
+    owners = np.asarray(owners, dtype=int)
+    others = np.asarray(others, dtype=int)
+
+    c1, r1 = centers[owners], radii[owners]
+    delta = centers[others] - c1
+    r2 = radii[others]
+    d = np.abs(delta)
+
+    # Drop pairs without intersection, with containment, or with coincident centers
+    valid = (d <= r1 + r2 + tol) & (d >= np.abs(r1 - r2) - tol) & (d >= tol)
+    owners, others = owners[valid], others[valid]
+    c1, r1, r2, delta, d = c1[valid], r1[valid], r2[valid], delta[valid], d[valid]
+
+    # Distance from center 1 to the chord, and half the chord length
+    a = (r1**2 - r2**2 + d**2) / (2 * d)
+    h_sq = r1**2 - a**2
+    h = np.sqrt(np.maximum(h_sq, 0))
+
+    mid = c1 + a * delta / d
+    perp_unit = 1j * delta / d
+    points = np.stack([mid + h * perp_unit, mid - h * perp_unit], axis=1)
+    # A tangency (h below tol) yields a single point
+    keep = np.stack([h_sq >= -tol, (h_sq >= -tol) & (h >= tol)], axis=1)
+
+    return (
+        np.repeat(owners, 2).reshape(-1, 2)[keep],
+        points[keep],
+        np.repeat(others, 2).reshape(-1, 2)[keep],
+    )
+
+
+def first_unique_intersections(owners: np.ndarray, points: np.ndarray, decimals: int = 6) -> np.ndarray:
+    """
+    Indices of the first entry of every distinct ``(owner, point)``.
+
+    Points are compared after rounding to ``decimals`` places, so the same
+    intersection found through two different circles is kept once.
+
+    Returns:
+        Ascending indices into ``owners``/``points``.
+    """
+    if not len(points):
+        return np.empty(0, dtype=int)
+    # Adding 0.0 folds -0.0 into 0.0
+    key_re = np.round(points.real, decimals) + 0.0
+    key_im = np.round(points.imag, decimals) + 0.0
+    order = np.lexsort((key_im, key_re, owners))
+    key_re, key_im, sorted_owners = key_re[order], key_im[order], owners[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (
+        (sorted_owners[1:] != sorted_owners[:-1])
+        | (key_re[1:] != key_re[:-1])
+        | (key_im[1:] != key_im[:-1])
+    )
+    return np.sort(order[first])
+
+
+def clockwise_intersection_order(owners: np.ndarray, points: np.ndarray, centers: np.ndarray,
+                                 start_reference: complex) -> np.ndarray:
+    """
+    Permutation grouping entries by owner, each group sorted clockwise.
+
+    Within a group the first entry is the point closest to
+    ``start_reference``. Points tied for closest (mirror images about the line
+    to the reference, as in p == q spirals) resolve to the clockwise one, so
+    the choice does not depend on rounding noise or on the order the entries
+    were found in.
+
+    Args:
+        owners: Owning circle of each entry.
+        points: Intersection point of each entry.
+        centers: Center of the owning circle of each entry.
+        start_reference: Reference point selecting the first entry of each group.
+    """
+    if not len(points):
+        return np.empty(0, dtype=int)
+    groups, inverse = np.unique(owners, return_inverse=True)
+    entry_idx = np.arange(len(points))
+
+    # Choose the starting intersection by proximity to the reference point
+    distances = np.abs(points - start_reference)
+    closest = np.full(len(groups), np.inf)
+    np.minimum.at(closest, inverse, distances)
+    tied = distances <= (closest + _TIE_RTOL * np.maximum(closest, 1.0))[inverse]
+
+    angles = np.angle(points - centers)
+    rel_angles = np.angle(np.exp(1j * (angles - np.angle(start_reference - centers))))
+    # Clockwise is decreasing angle: the tied point with the smallest relative angle wins
+    score = np.where(tied, -rel_angles, -np.inf)
+    best = np.full(len(groups), -np.inf)
+    np.maximum.at(best, inverse, score)
+    is_start = tied & (score == best[inverse])
+    start_idx = np.full(len(groups), len(points))
+    np.minimum.at(start_idx, inverse[is_start], entry_idx[is_start])
+
+    # Clockwise offset from the start angle in [0, 2pi); lexsort is stable for equal offsets
+    clockwise_offset = (angles[start_idx][inverse] - angles) % (2 * np.pi)
+    return np.lexsort((clockwise_offset, owners))
+
+
+def arc_sweep_angle(center: complex, start: complex, end: complex) -> float:
+    """
+    Signed angle of the shorter arc from ``start`` to ``end`` about ``center``.
+
+    Returns:
+        The sweep in radians, in (-pi, pi].
+    """
+    a1 = np.angle(start - center)
+    a2 = np.angle(end - center)
+
+    # Calculate the clockwise angular difference [0, 2pi)
+    delta = (a2 - a1 + 2 * np.pi) % (2 * np.pi)
+
+    # Arc is drawn clockwise; use the smaller angular magnitude direction if needed
+    if delta > np.pi:
+        delta -= 2 * np.pi  # Result in [-2pi, 0] or [-pi, pi] if delta was > pi
+    return delta
+
+
+# Radius buckets per octave and sweep buckets per half turn for arc_steps_for_chord_error
+_ARC_RADIUS_BUCKETS = 8
+_ARC_SWEEP_BUCKETS = 256
+DEFAULT_ARC_STEPS = 40
+MIN_ARC_STEPS = 2
+MAX_ARC_STEPS = 1024
+
+
+@functools.lru_cache(maxsize=4096)
+def _bucket_arc_steps(radius_bucket: int, sweep_bucket: int, max_error: float) -> int:
+    """Sample count for the largest radius and sweep of a bucket (see arc_steps_for_chord_error)."""
+    radius = 2.0 ** (radius_bucket / _ARC_RADIUS_BUCKETS)
+    sweep = sweep_bucket * np.pi / _ARC_SWEEP_BUCKETS
+    if max_error >= radius:
+        return MIN_ARC_STEPS
+    # A chord spanning angle theta deviates r * (1 - cos(theta / 2)) from the arc
+    max_theta = 2.0 * math.acos(1.0 - max_error / radius)
+    segments = math.ceil(sweep / max_theta)
+    return int(min(MAX_ARC_STEPS, max(MIN_ARC_STEPS, segments + 1)))
+
+
+def arc_steps_for_chord_error(radius: float, sweep: float, max_error: float) -> int:
+    """
+    Number of sample points keeping every chord of an arc within ``max_error`` of it.
+
+    Radius and sweep are rounded up to buckets (1/8 octave, 1/256 half turn),
+    so the bound holds and results are cached per bucket.
+
+    Args:
+        radius: The arc radius, in the same units as ``max_error``.
+        sweep: The arc's angle in radians (sign ignored).
+        max_error: Maximum distance between a chord and the arc.
+
+    Returns:
+        The sample count (including both endpoints), between ``MIN_ARC_STEPS``
+        and ``MAX_ARC_STEPS``.
+
+    Raises:
+        ValueError: If ``max_error`` is not positive.
+    """
+    if max_error <= 0:
+        raise ValueError(f"max_error must be positive, got {max_error}")
+    if radius <= 0:
+        return MIN_ARC_STEPS
+    radius_bucket = math.ceil(math.log2(radius) * _ARC_RADIUS_BUCKETS)
+    sweep_bucket = math.ceil(abs(sweep) * _ARC_SWEEP_BUCKETS / np.pi)
+    return _bucket_arc_steps(radius_bucket, sweep_bucket, float(max_error))
+
+
+def sample_arcs(centers: np.ndarray, radii: np.ndarray, start_angles: np.ndarray,
+                sweeps: np.ndarray, steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Samples many arcs into one contiguous buffer.
+
+    Arc ``i`` gets ``steps[i]`` points evenly spaced in angle from
+    ``start_angles[i]`` to ``start_angles[i] + sweeps[i]``, like ``np.linspace``.
+
+    Args:
+        centers: Complex circle centers, one per arc.
+        radii: Circle radii.
+        start_angles: Angle of each arc's start point about its center.
+        sweeps: Signed sweep of each arc (see :func:`arc_sweep_angle`).
+        steps: Number of points per arc (at least 1).
+
+    Returns:
+        ``(points, offsets)``: a complex128 array holding all samples and the
+        ``len(steps) + 1`` offsets so arc ``i`` is ``points[offsets[i]:offsets[i + 1]]``.
+    """
+    steps = np.asarray(steps, dtype=np.int64)
+    offsets = np.zeros(len(steps) + 1, dtype=np.int64)
+    np.cumsum(steps, out=offsets[1:])
+    owners = np.repeat(np.arange(len(steps)), steps)
+    local = np.arange(offsets[-1]) - offsets[owners]
+
+    start_angles = np.asarray(start_angles, dtype=float)
+    sweeps = np.asarray(sweeps, dtype=float)
+    step_angle = sweeps / np.maximum(steps - 1, 1)
+    angles = local * step_angle[owners] + start_angles[owners]
+    # Pin the last sample to the exact end angle, as np.linspace does
+    last = offsets[1:][steps > 1] - 1
+    angles[last] = (start_angles + sweeps)[steps > 1]
+
+    points = np.asarray(centers, dtype=complex)[owners] + np.asarray(radii, dtype=float)[owners] * np.exp(1j * angles)
+    return points, offsets
+
+
+# Default memory budget of a LineFillCache, in (estimated) bytes.
+DEFAULT_LINE_FILL_CACHE_BYTES = 64 * 1024 * 1024
+# Rough per-item cost used by the cache's memory accounting.
+_CACHE_ITEM_BYTES = 512
+# Decimals of the area and perimeter in canonical polygon signatures, and the
+# largest vertex deviation of polygons sharing one (see LineFillCache.canonical_frame)
+_CANONICAL_DECIMALS = 5
+_CANONICAL_TOL = 1e-6
+# Significant digits kept of fill spacing, inset and angle mapped into a canonical frame
+_CANONICAL_PARAM_DIGITS = 6
+
+
+def _polygon_data_nbytes(polygon_data: Optional[Dict[str, Any]]) -> int:
+    """Estimated memory held by a prepared polygon."""
+    if polygon_data is None:
+        return _CACHE_ITEM_BYTES
+    return _CACHE_ITEM_BYTES + polygon_data["polygon_array"].nbytes + polygon_data["source_array"].nbytes
+
+
+def _segments_nbytes(segments: Optional[np.ndarray]) -> int:
+    return 0 if segments is None else segments.nbytes
 
 
 class LineFillCache:
-    """Cache for polygon line fills keyed by geometry and line settings."""
+    """
+    Cache for polygon line fills keyed by geometry and line settings.
 
-    def __init__(self):
+    Fill entries, prepared polygons and template entries share one LRU order
+    and one memory budget. Sizes are estimates (array ``nbytes`` plus fixed
+    per-object costs), good enough to keep a long-lived cache bounded. All
+    methods are thread-safe, so one cache can serve several renderers.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_LINE_FILL_CACHE_BYTES):
+        """
+        Initializes a LineFillCache.
+
+        Args:
+            max_bytes: Memory budget in estimated bytes; least recently used items are
+                evicted beyond it. None disables eviction.
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive or None")
+        self.max_bytes = max_bytes
         self._entries: Dict[
             Tuple[Any, float, float, float],
             Dict[str, Any]
         ] = {}
         self._polygon_cache: Dict[Tuple[Any, float], Optional[Dict[str, Any]]] = {}
+        # (polygon signature, offset) -> template entry, see template_entry
+        self._template_entries: Dict[Tuple[Any, float], Dict[str, Any]] = {}
+        # (id(template points), offset) -> (points, template key), so known templates skip hashing
+        self._template_aliases: Dict[Tuple[int, float], Tuple[np.ndarray, Tuple[Any, float]]] = {}
+        # (store, key) -> estimated bytes, in least to most recently used order
+        self._sizes: "collections.OrderedDict[Tuple[str, Any], int]" = collections.OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    def _stores(self) -> Dict[str, Dict[Any, Any]]:
+        return {
+            "fill": self._entries,
+            "polygon": self._polygon_cache,
+            "template": self._template_entries,
+            "alias": self._template_aliases,
+        }
+
+    def _touch(self, store: str, key: Any):
+        self._sizes.move_to_end((store, key))
+
+    def _account(self, store: str, key: Any, nbytes: int):
+        """Sets the size of an item, marks it most recently used and evicts beyond the budget."""
+        self._bytes += nbytes - self._sizes.get((store, key), 0)
+        self._sizes[(store, key)] = nbytes
+        self._sizes.move_to_end((store, key))
+        if self.max_bytes is None:
+            return
+        stores = self._stores()
+        # The newest item always stays, even when it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._sizes) > 1:
+            (old_store, old_key), old_bytes = self._sizes.popitem(last=False)
+            stores[old_store].pop(old_key, None)
+            self._bytes -= old_bytes
+            self.evictions += 1
+
+    def clear(self):
+        """Drops all cached items; the counters are kept."""
+        with self._lock:
+            for store in self._stores().values():
+                store.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup hits and misses, evictions, item count and estimated size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self._sizes),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
 
     @staticmethod
     def _normalize(value: float) -> float:
         return round(float(value), 9)
 
+    @classmethod
+    def normalize_angle(cls, angle: float) -> float:
+        """Hatch angle in degrees folded into [0, 180); lines at ``a`` and ``a + 180`` coincide."""
+        angle = cls._normalize(float(angle) % 180.0)
+        return 0.0 if angle >= 180.0 else angle
+
     @staticmethod
     def polygon_signature_from_array(array: np.ndarray) -> Tuple[Tuple[float, float], ...]:
         return tuple((round(float(x), 9), round(float(y), 9)) for x, y in array)
 
+    @staticmethod
+    def canonical_frame(array: np.ndarray) -> Tuple[Any, np.ndarray, complex, float]:
+        """
+        Transform-invariant form of a polygon.
+
+        The polygon is moved to its vertex mean, scaled to unit RMS radius and
+        rotated (and its vertices rolled) so that its farthest vertex lies
+        first, on the positive x-axis. The signature holds the vertex count,
+        area and perimeter in that frame; coordinates themselves are too noisy
+        to hash (similar outlines agree to about 1e-8), so polygons sharing a
+        signature must still be compared with :meth:`same_canonical_polygon`.
+
+        Returns:
+            ``(signature, local, center, scale)``: a hashable signature, the
+            Nx2 polygon in the local frame, and the complex ``center`` and
+            ``scale`` (rotation times size) mapping local points ``z`` back to
+            ``center + scale * z``.
+        """
+        signatures, local, centers, scales = LineFillCache.canonical_frames(
+            array[:, 0] + 1j * array[:, 1], np.array([0, len(array)])
+        )
+        return signatures[0], np.column_stack((local.real, local.imag)), complex(centers[0]), complex(scales[0])
+
+    @staticmethod
+    def canonical_frames(vertices: np.ndarray, offsets: np.ndarray) -> Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :meth:`canonical_frame` of many polygons at once.
+
+        Args:
+            vertices: Complex vertices of all polygons, polygon ``i`` being
+                ``vertices[offsets[i]:offsets[i + 1]]``; none may be empty.
+            offsets: Polygon boundaries, starting with 0.
+
+        Returns:
+            ``(signatures, local, centers, scales)``: a signature per polygon,
+            the complex local vertices laid out like ``vertices``, and complex
+            arrays of the centers and scales.
+        """
+        counts = np.diff(offsets)
+        starts = np.asarray(offsets[:-1])
+        owners = np.repeat(np.arange(len(counts)), counts)
+        centers = np.add.reduceat(vertices, starts) / counts
+        z = vertices - centers[owners]
+        radii = np.abs(z)
+        # First vertex at the largest distance from the center, per polygon
+        farthest = np.flatnonzero(radii == np.maximum.reduceat(radii, starts)[owners])
+        farthest = farthest[np.unique(owners[farthest], return_index=True)[1]]
+        sizes = np.sqrt(np.add.reduceat(z.real ** 2 + z.imag ** 2, starts) / counts)
+        scales = np.where(sizes > 0, z[farthest] / np.where(radii[farthest] > 0, radii[farthest], 1) * sizes, 1 + 0j)
+        # Roll each polygon so its farthest vertex comes first
+        position = np.arange(len(vertices)) - starts[owners]
+        local = z[starts[owners] + (position + (farthest - starts)[owners]) % counts[owners]] / scales[owners]
+        edges = local[starts[owners] + (position + 1) % counts[owners]] - local
+        areas = 0.5 * np.add.reduceat(local.real * edges.imag - local.imag * edges.real, starts)
+        perimeters = np.add.reduceat(np.abs(edges), starts)
+        signatures = list(zip(
+            counts.tolist(),
+            np.round(areas, _CANONICAL_DECIMALS).tolist(),
+            np.round(perimeters, _CANONICAL_DECIMALS).tolist(),
+        ))
+        return signatures, local, centers, scales
+
+    @staticmethod
+    def quantize(value: float, digits: int = _CANONICAL_PARAM_DIGITS) -> float:
+        """``value`` rounded to ``digits`` significant digits."""
+        value = float(value)
+        if value == 0 or not math.isfinite(value):
+            return value
+        return round(value, digits - 1 - math.floor(math.log10(abs(value))))
+
+    @staticmethod
+    def same_canonical_polygon(a: np.ndarray, b: np.ndarray) -> bool:
+        """Whether two polygons in canonical frames coincide up to ``_CANONICAL_TOL``."""
+        return a.shape == b.shape and bool(np.allclose(a, b, rtol=0, atol=_CANONICAL_TOL))
+
     def _make_key(self, polygon_signature: Any, offset: float, spacing: float, angle: float) -> Tuple[Any, float, float, float]:
         return (
             polygon_signature,
             self._normalize(offset),
             self._normalize(spacing),
-            self._normalize(angle),
+            self.normalize_angle(angle),
         )
 
+    def template_entry(self, template_points: np.ndarray, offset: float) -> Dict[str, Any]:
+        """
+        Entry for a shared template polygon, keyed by its rounded coordinates.
+
+        Templates with equal coordinates share an entry, also across spirals and
+        drawings. Template outlines are reused by identity, so the key of a known
+        points object is remembered and its coordinates are hashed only once.
+        The entry holds the prepared ``polygon_data`` and the clipped
+        ``segments`` per ``(spacing, angle)``; add segments with
+        :meth:`store_template_segments`.
+        """
+        alias_key = (id(template_points), self._normalize(offset))
+        with self._lock:
+            alias = self._template_aliases.get(alias_key)
+            if alias is not None and alias[0] is template_points:
+                key = alias[1]
+                self._touch("alias", alias_key)
+            else:
+                base_array = convert_polygon_to_array(template_points)
+                signature = None if base_array is None else self.polygon_signature_from_array(base_array)
+                key = (signature, alias_key[1])
+                # The alias holds the points so their id cannot be reused while it lives
+                self._template_aliases[alias_key] = (template_points, key)
+                self._account("alias", alias_key, _CACHE_ITEM_BYTES)
+            entry = self._template_entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._touch("template", key)
+                return entry
+            self.misses += 1
+            base_array = convert_polygon_to_array(template_points)
+            polygon_data = None
+            if base_array is not None:
+                polygon_data = self.prepare_polygon_data(base_array, offset)
+            entry = {"key": key, "polygon_data": polygon_data, "segments": {}}
+            self._template_entries[key] = entry
+            self._account("template", key, _polygon_data_nbytes(polygon_data))
+            return entry
+
+    def store_template_segments(
+        self,
+        entry: Dict[str, Any],
+        spacing: float,
+        angle: float,
+        segments: np.ndarray,
+    ) -> None:
+        """Records the clipped ``segments`` of a template entry for one line setting."""
+        settings = (self._normalize(spacing), self.normalize_angle(angle))
+        with self._lock:
+            entry["segments"][settings] = segments
+            key = entry["key"]
+            if self._template_entries.get(key) is entry:
+                nbytes = _polygon_data_nbytes(entry["polygon_data"])
+                nbytes += sum(_segments_nbytes(segs) for segs in entry["segments"].values())
+                self._account("template", key, nbytes)
+
     def ensure_entry(
         self,
         polygon_signature: Any,
@@ -212,21 +1150,42 @@ class LineFillCache:
         angle: float,
     ) -> Dict[str, Any]:
         key = self._make_key(polygon_signature, offset, spacing, angle)
-        entry = self._entries.get(key)
-        if entry is None:
-            polygon_data = None
-            if polygon_signature is not None:
-                polygon_data = self._polygon_cache.get(
-                    (polygon_signature, self._normalize(offset))
-                )
-            entry = {
-                "polygon_data": polygon_data,
-                "line_starts": None,
-                "line_ends": None,
-                "segments": None,
-            }
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._touch("fill", key)
+                if not entry["polygon_ready"]:
+                    self._attach_polygon(key, entry)
+                return entry
+            self.misses += 1
+            return self._new_entry(key)
+
+    def _attach_polygon(self, key: Tuple[Any, float, float, float], entry: Dict[str, Any]):
+        """Copies the prepared polygon for ``key`` into ``entry`` if the polygon cache has it."""
+        polygon_key = (key[0], key[1])
+        if polygon_key in self._polygon_cache:
+            self._touch("polygon", polygon_key)
+            # polygon_data may legitimately be None (inset consumed the polygon)
+            entry["polygon_data"] = self._polygon_cache[polygon_key]
+            entry["polygon_ready"] = True
+
+    def _new_entry(self, key: Tuple[Any, float, float, float]) -> Dict[str, Any]:
+        with self._lock:
+            entry = {"polygon_ready": False, "polygon_data": None, "segments": None}
+            self._attach_polygon(key, entry)
             self._entries[key] = entry
-        return entry
+            self._account("fill", key, _CACHE_ITEM_BYTES)
+            return entry
+
+    def _update_entry(self, key: Tuple[Any, float, float, float], **values):
+        """Sets fields of a fill entry (recreating it if evicted) and re-accounts its size."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._new_entry(key)
+            entry.update(values)
+            self._account("fill", key, _CACHE_ITEM_BYTES + _segments_nbytes(entry["segments"]))
 
     def store_polygon_data(
         self,
@@ -234,26 +1193,13 @@ class LineFillCache:
         offset: float,
         polygon_data: Optional[Dict[str, Any]],
     ) -> None:
-        normalized_offset = self._normalize(offset)
-        if polygon_signature is not None:
-            self._polygon_cache[(polygon_signature, normalized_offset)] = polygon_data
-
-        for (sig, off, _, _), entry in self._entries.items():
-            if sig == polygon_signature and off == normalized_offset:
-                entry["polygon_data"] = polygon_data
-
-    def store_line_endpoints(
-        self,
-        polygon_signature: Any,
-        offset: float,
-        spacing: float,
-        angle: float,
-        line_starts: Optional[np.ndarray],
-        line_ends: Optional[np.ndarray],
-    ) -> None:
-        entry = self.ensure_entry(polygon_signature, offset, spacing, angle)
-        entry["line_starts"] = line_starts
-        entry["line_ends"] = line_ends
+        """Stores a prepared polygon; fill entries for it pick it up on their next lookup."""
+        if polygon_signature is None:
+            return
+        polygon_key = (polygon_signature, self._normalize(offset))
+        with self._lock:
+            self._polygon_cache[polygon_key] = polygon_data
+            self._account("polygon", polygon_key, _polygon_data_nbytes(polygon_data))
 
     def store_segments(
         self,
@@ -261,10 +1207,10 @@ class LineFillCache:
         offset: float,
         spacing: float,
         angle: float,
-        segments: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+        segments: np.ndarray,
     ) -> None:
-        entry = self.ensure_entry(polygon_signature, offset, spacing, angle)
-        entry["segments"] = segments
+        key = self._make_key(polygon_signature, offset, spacing, angle)
+        self._update_entry(key, segments=segments)
 
     def prepare_polygon_data(
         self,
@@ -280,249 +1226,431 @@ class LineFillCache:
         else:
             clipped_array = np.array(base_array, dtype=float, copy=False)
 
+        return self.polygon_data_from_inset(base_array, clipped_array)
+
+    @staticmethod
+    def polygon_data_from_inset(base_array: np.ndarray, clipped_array: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Prepared polygon data for ``base_array`` whose inset is ``clipped_array`` (None or < 3 points if consumed)."""
         if clipped_array is None or len(clipped_array) < 3:
             return None
 
-        polygon_path = MplPath(clipped_array)
-        shapely_polygon = None
-        prepared_polygon = None
-
-        if HAS_SHAPELY and ShapelyPolygon is not None:
-            try:
-                shapely_polygon = ShapelyPolygon(clipped_array)
-                if shapely_polygon.is_empty:
-                    shapely_polygon = None
-                elif not shapely_polygon.is_valid:
-                    shapely_polygon = shapely_polygon.buffer(0)
-                    if shapely_polygon.is_empty:
-                        shapely_polygon = None
-            except Exception:
-                shapely_polygon = None
-
-            if shapely_polygon is not None and shapely_prep is not None:
-                try:
-                    prepared_polygon = shapely_prep(shapely_polygon)
-                except Exception:
-                    prepared_polygon = None
-
-        min_x, min_y = clipped_array[:, 0].min(), clipped_array[:, 1].min()
-        max_x, max_y = clipped_array[:, 0].max(), clipped_array[:, 1].max()
-        bbox_diag = math.hypot(max_x - min_x, max_y - min_y)
-        centroid = clipped_array.mean(axis=0)
+        # Insets repeat their first vertex, which GEOS picks by position; leave it out
+        # so the hatch phase does not depend on where the ring starts
+        vertices = clipped_array[:-1] if np.array_equal(clipped_array[0], clipped_array[-1]) else clipped_array
+        centroid = vertices.mean(axis=0)
 
         return {
+            # the polygon before the inset, to tell apart polygons sharing a signature
+            "source_array": base_array,
             "polygon_array": clipped_array,
-            "polygon_path": polygon_path,
-            "shapely_polygon": shapely_polygon,
-            "prepared_polygon": prepared_polygon,
-            "bbox_diag": bbox_diag,
             "centroid": centroid,
         }
 
-    def compute_line_endpoints(
-        self,
-        polygon_data: Dict[str, Any],
-        spacing: float,
-        angle: float,
-    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        bbox_diag = polygon_data.get("bbox_diag")
-        centroid = polygon_data.get("centroid")
-
-        if not bbox_diag or centroid is None:
-            return None, None
-
-        theta = math.radians(angle)
-        line_dir = np.array([math.cos(theta), math.sin(theta)])
-        perp_dir = np.array([-line_dir[1], line_dir[0]])
-
-        num_lines = int(bbox_diag / max(1e-6, spacing)) + 3
-        offsets = np.arange(-num_lines, num_lines + 1, dtype=float)[:, None] * spacing
-        offset_vectors = offsets * perp_dir
-        span = line_dir * bbox_diag * 2
-        start_base = centroid - span
-        end_base = centroid + span
-        line_starts = start_base + offset_vectors
-        line_ends = end_base + offset_vectors
-
-        return line_starts, line_ends
-
-
-def lines_in_polygon(
-    polygon,
-    line_spacing=5,
-    angle=0,
-    color="#000000",
-    stroke_width=0.5,
-    offset=0,
-    *,
-    polygon_array: Optional[np.ndarray] = None,
-    polygon_path: Optional[MplPath] = None,
-    shapely_polygon=None,
-    prepared_polygon=None,
-    bbox_diag: Optional[float] = None,
-    centroid: Optional[np.ndarray] = None,
-    line_starts: Optional[np.ndarray] = None,
-    line_ends: Optional[np.ndarray] = None,
-):
-    """Generate parallel lines clipped to polygon bounds.
 
-    Args:
-        polygon: List of complex numbers or Nx2 array of polygon vertices
-        line_spacing: Distance between parallel lines
-        angle: Line angle in degrees (0 = horizontal)
-        color: Line color (unused, kept for compatibility)
-        stroke_width: Line width (unused, kept for compatibility)
-        offset: Inward offset from polygon edge in pixels
-
-    Keyword Args:
-        polygon_array: Precomputed Nx2 array of polygon vertices (after inset)
-        polygon_path: Precomputed matplotlib path for point-in-polygon checks
-        shapely_polygon: Cached shapely polygon for clipping
-        prepared_polygon: Prepared shapely polygon for quick intersection tests
-        bbox_diag: Precomputed bounding box diagonal length
-        centroid: Precomputed polygon centroid
-        line_starts: Prebuilt start points for candidate lines
-        line_ends: Prebuilt end points for candidate lines
+_default_line_fill_cache: Optional[LineFillCache] = None
+_default_line_fill_cache_lock = threading.Lock()
 
-    Returns:
-        List of line segment tuples ((x1, y1), (x2, y2))
-    """
-    if polygon_array is None:
-        polygon_array = convert_polygon_to_array(polygon)
-    if polygon_array is None or polygon_array.shape[0] < 3:
-        return []
 
-    # Apply inward offset if specified (used when no cached array provided)
-    if offset:
-        polygon_array = apply_polygon_inset(polygon_array, offset)
-        if polygon_array is None or len(polygon_array) < 3:
-            return []
-        polygon_path = None
-        shapely_polygon = None
-        prepared_polygon = None
-        line_starts = None
-        line_ends = None
-
-    if polygon_path is None:
-        polygon_path = MplPath(polygon_array)
-
-    if line_starts is None or line_ends is None:
-        if centroid is None:
-            centroid = polygon_array.mean(axis=0)
-
-        if bbox_diag is None:
-            min_x, min_y = polygon_array[:, 0].min(), polygon_array[:, 1].min()
-            max_x, max_y = polygon_array[:, 0].max(), polygon_array[:, 1].max()
-            bbox_diag = math.hypot(max_x - min_x, max_y - min_y)
-        if not bbox_diag:
-            return []
+def default_line_fill_cache() -> LineFillCache:
+    """The process-wide LineFillCache used by drawings and spirals not given their own."""
+    global _default_line_fill_cache
+    with _default_line_fill_cache_lock:
+        if _default_line_fill_cache is None:
+            _default_line_fill_cache = LineFillCache()
+        return _default_line_fill_cache
 
-        # Calculate line direction and perpendicular offset direction
-        theta = math.radians(angle)
-        line_dir = np.array([math.cos(theta), math.sin(theta)])
-        perp_dir = np.array([-line_dir[1], line_dir[0]])
-
-        # Generate parallel lines
-        num_lines = int(bbox_diag / max(1e-6, line_spacing)) + 3
-        offsets = np.arange(-num_lines, num_lines + 1, dtype=float)[:, None] * line_spacing
-        offset_vectors = offsets * perp_dir
-        span = line_dir * bbox_diag * 2
-        start_base = centroid - span
-        end_base = centroid + span
-        line_starts = start_base + offset_vectors
-        line_ends = end_base + offset_vectors
-    else:
-        line_starts = np.asarray(line_starts, dtype=float)
-        line_ends = np.asarray(line_ends, dtype=float)
-        if line_starts.shape[0] == 0 or line_ends.shape[0] == 0:
-            return []
 
-    line_segments = []
+def set_default_line_fill_cache(cache: Optional[LineFillCache]):
+    """Replaces the process-wide LineFillCache; None makes the next use create a fresh one."""
+    global _default_line_fill_cache
+    with _default_line_fill_cache_lock:
+        _default_line_fill_cache = cache
 
-    # Use shapely when available for robust clipping
-    if HAS_SHAPELY and shapely_polygon is not None and LineString is not None and MultiLineString is not None:
-        lines_to_clip = []
-        for start, end in zip(line_starts, line_ends):
-            line = LineString([tuple(start), tuple(end)])
-            if prepared_polygon is None or prepared_polygon.intersects(line):
-                lines_to_clip.append(line)
 
-        if lines_to_clip:
-            if len(lines_to_clip) == 1:
-                clipped = shapely_polygon.intersection(lines_to_clip[0])
-            else:
-                multi = MultiLineString(lines_to_clip)
-                clipped = shapely_polygon.intersection(multi)
+def clip_hatch_lines(polygon_array: np.ndarray, spacing: float, angle: float,
+                     origin: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Clip a family of parallel lines to a polygon with a vectorized scanline pass.
 
-            line_segments.extend(
-                ((float(x1), float(y1)), (float(x2), float(y2)))
-                for (x1, y1), (x2, y2) in _shapely_geometry_to_segments(clipped)
-                if (x1, y1) != (x2, y2)
-            )
+    The lines run at ``angle`` degrees through ``origin + k * spacing * normal``
+    for every integer ``k``. The polygon is rotated into line space, where each
+    line is a scanline; every edge is intersected with all scanlines it spans
+    at once, and the crossings are sorted by (line, position). Edges count as
+    spanning ``[min, max)`` of their scanline coordinates, so vertices on a
+    scanline are not counted twice.
+
+    Group outlines often cross themselves, so instead of pairing crossings
+    even-odd, a running winding number decides what is inside: points wound
+    the same way as the ring as a whole. For simple rings this is the plain
+    interior; for self-intersecting ones it matches shapely's ``buffer(0)``,
+    which drops loops running the other way.
+
+    Args:
+        polygon_array: Nx2 polygon vertices; the ring is closed implicitly.
+        spacing: Distance between lines.
+        angle: Line angle in degrees.
+        origin: Point one of the lines passes through; the vertex mean if None.
+
+    Returns:
+        Array of shape (M, 2, 2) holding each segment's start and end point,
+        ordered by line and then along the line direction.
+    """
+    polygon_array = np.asarray(polygon_array, dtype=float)
+    if origin is None:
+        origin = polygon_array.mean(axis=0)
+    segments, _ = clip_hatch_lines_batch(
+        polygon_array, np.array([0, len(polygon_array)]), [spacing], [angle], [origin]
+    )
+    return segments
 
-        return line_segments
 
-    # Fallback: manual clipping using polygon intersections
-    for start, end in zip(line_starts, line_ends):
-        intersections = find_line_polygon_intersections(start, end, polygon_array)
+def clip_hatch_lines_batch(vertices: np.ndarray, offsets: np.ndarray, spacings, angles,
+                           origins) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :func:`clip_hatch_lines` for many polygons, each with its own line family, in one pass.
 
-        for j in range(0, len(intersections) - 1, 2):
-            _, x1, y1 = intersections[j]
-            _, x2, y2 = intersections[j + 1]
+    Args:
+        vertices: Nx2 vertices of all polygons, polygon ``i`` being
+            ``vertices[offsets[i]:offsets[i + 1]]``.
+        offsets: Polygon boundaries, starting with 0.
+        spacings: Line spacing per polygon.
+        angles: Line angle in degrees per polygon.
+        origins: Kx2 point per polygon that one of its lines passes through.
 
-            mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-            if polygon_path.contains_point((mid_x, mid_y)):
-                line_segments.append(((x1, y1), (x2, y2)))
+    Returns:
+        ``(segments, segment_offsets)``: an (M, 2, 2) array of segments and the
+        boundaries of each polygon's segments in it.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    offsets = np.asarray(offsets)
+    counts = np.diff(offsets)
+    polygon_count = len(counts)
+    if not len(vertices):
+        return np.empty((0, 2, 2)), np.zeros(polygon_count + 1, dtype=np.int64)
+    spacings = np.asarray(spacings, dtype=float)
+    theta = np.radians(np.asarray(angles, dtype=float))
+    line_dirs = np.column_stack((np.cos(theta), np.sin(theta)))
+    normals = np.column_stack((-line_dirs[:, 1], line_dirs[:, 0]))
+    origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+
+    owners = np.repeat(np.arange(polygon_count), counts)
+    relative = vertices - origins[owners]
+    u0 = np.einsum("ij,ij->i", relative, line_dirs[owners])
+    t0 = np.einsum("ij,ij->i", relative, normals[owners]) / spacings[owners]
+    following = offsets[owners] + (np.arange(len(vertices)) - offsets[owners] + 1) % counts[owners]
+    u1, t1 = u0[following], t0[following]
+    # Scanlines k crossed by each edge: ceil(min(t)) <= k < ceil(max(t))
+    first = np.ceil(np.minimum(t0, t1)).astype(np.int64)
+    crossings = np.ceil(np.maximum(t0, t1)).astype(np.int64) - first
+    total = int(crossings.sum())
+    if total == 0:
+        return np.empty((0, 2, 2)), np.zeros(polygon_count + 1, dtype=np.int64)
+
+    edges = np.repeat(np.arange(len(crossings)), crossings)
+    k = first[edges] + np.arange(total) - np.repeat(np.cumsum(crossings) - crossings, crossings)
+    u = u0[edges] + (k - t0[edges]) / (t1[edges] - t0[edges]) * (u1[edges] - u0[edges])
+    # Crossing direction, signed so that entering a counter-clockwise ring counts +1
+    winding = np.where(t1[edges] < t0[edges], 1, -1)
+    nonempty = counts > 0
+    twice_area = np.zeros(polygon_count)
+    twice_area[nonempty] = np.add.reduceat(u0 * t1 - u1 * t0, offsets[:-1][nonempty])
+    orientation = np.where(twice_area > 0, 1, -1)
+
+    polygon = owners[edges]
+    order = np.lexsort((u, k, polygon))
+    k, u, polygon = k[order], u[order], polygon[order]
+    # Every scanline winds back to zero, so one cumulative sum serves all of them
+    inside = np.cumsum(winding[order]) * orientation[polygon] > 0
+    was_inside = np.concatenate(([False], inside[:-1]))
+    enter, leave = inside & ~was_inside, ~inside & was_inside
+    lines, u_start, u_end, polygon = k[enter], u[enter], u[leave], polygon[enter]
+    keep = u_end > u_start
+    lines, u_start, u_end, polygon = lines[keep], u_start[keep], u_end[keep], polygon[keep]
+
+    base = origins[polygon] + (lines * spacings[polygon])[:, None] * normals[polygon]
+    starts = base + u_start[:, None] * line_dirs[polygon]
+    ends = base + u_end[:, None] * line_dirs[polygon]
+    segment_offsets = np.concatenate(([0], np.cumsum(np.bincount(polygon, minlength=polygon_count))))
+    return np.stack((starts, ends), axis=1), segment_offsets
 
-    return line_segments
 
 # ============================================
 # DRAWING CONTEXT
 # SVG rendering and coordinate normalization
 # ============================================
 
+def format_svg_numbers(values, precision: Optional[int] = None) -> List[str]:
+    """
+    Compact SVG text for many numbers at once.
+
+    Args:
+        values: Numbers (any array shape, read flat).
+        precision: Decimal places to round to; None keeps every digit.
+
+    Returns:
+        The shortest text reading back as each rounded value, without a
+        trailing ``.0`` or a negative zero.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    if precision is not None:
+        values = np.round(values, precision)
+    # Adding zero turns -0.0 into 0.0
+    return [text[:-2] if text.endswith(".0") else text for text in map(repr, (values + 0.0).tolist())]
+
+
+# SVG namespaces declared by the root element, as svgwrite writes them
+_SVG_NAMESPACES = ('xmlns="http://www.w3.org/2000/svg" xmlns:ev="http://www.w3.org/2001/xml-events" '
+                   'xmlns:xlink="http://www.w3.org/1999/xlink"')
+
+
+def _svg_attributes(attributes: Dict[str, Any]) -> str:
+    """SVG attribute text for svgwrite-style keywords (``stroke_width`` for ``stroke-width``, ``class_`` for ``class``)."""
+    return "".join(
+        f' {name.rstrip("_").replace("_", "-")}="{html.escape(value) if isinstance(value, str) else value}"'
+        for name, value in attributes.items() if value is not None
+    )
+
+
+class SvgElement:
+    """A container element of :class:`SvgStreamWriter`, such as a pattern, formatted when it is added."""
+    def __init__(self, tag: str, attributes: Dict[str, Any]):
+        self.tag = tag
+        self.attributes = attributes
+        self.children: List[Any] = []
+
+    def __setitem__(self, name: str, value: Any):
+        self.attributes[name] = value
+
+    def add(self, element):
+        """Appends a child element and returns it."""
+        self.children.append(element)
+        return element
+
+    def __str__(self) -> str:
+        children = "".join(str(child) for child in self.children)
+        return f"<{self.tag}{_svg_attributes(self.attributes)}>{children}</{self.tag}>"
+
+
+class _SvgDefinitions:
+    """The ``defs`` of an :class:`SvgStreamWriter`: each definition is written in its own ``<defs>`` when added."""
+    def __init__(self, writer: 'SvgStreamWriter'):
+        self._writer = writer
+
+    def add(self, element):
+        self._writer.add(f"<defs>{element}</defs>")
+        return element
+
+
+class SvgStreamWriter:
+    """
+    Lean stand-in for ``svgwrite.Drawing`` that writes elements as text while they are drawn.
+
+    It offers the ``svgwrite.Drawing`` calls :class:`DrawingContext` and the
+    shapes' ``to_svg`` methods make, with svgwrite's keywords, but its element
+    factories return the finished markup and :meth:`add` appends it to a list
+    or writes it to a file straight away, so no element tree is built,
+    validated or serialized at the end.
+    """
+    def __init__(self, size: Tuple[Any, Any] = ("100%", "100%"), out: Optional[TextIO] = None):
+        """
+        Initializes an SvgStreamWriter.
+
+        Args:
+            size: Width and height of the document.
+            out: Text file to write the document to; None keeps it for :meth:`tostring`.
+        """
+        self.width, self.height = size
+        self._viewbox: Optional[str] = None
+        self._out = out
+        self._parts: List[str] = []
+        self._started = False
+        self.defs = _SvgDefinitions(self)
+
+    def viewbox(self, minx: float = 0, miny: float = 0, width: float = 0, height: float = 0):
+        """Sets the viewBox; written with the root element, so set it before drawing to a file."""
+        self._viewbox = f"{minx},{miny},{width},{height}"
+
+    def _root(self) -> str:
+        viewbox = f' viewBox="{self._viewbox}"' if self._viewbox is not None else ""
+        return f'<svg baseProfile="full" height="{self.height}" version="1.1"{viewbox} width="{self.width}" {_SVG_NAMESPACES}>'
+
+    def add(self, element):
+        """Writes an element made by the factories (markup or an :class:`SvgElement`) and returns it."""
+        text = str(element)
+        if self._out is None:
+            self._parts.append(text)
+        else:
+            if not self._started:
+                self._out.write(self._root())
+                self._started = True
+            self._out.write(text)
+        return element
+
+    def line(self, start=(0, 0), end=(0, 0), **extra) -> str:
+        """A ``<line>`` from ``start`` to ``end``."""
+        return f'<line x1="{start[0]}" y1="{start[1]}" x2="{end[0]}" y2="{end[1]}"{_svg_attributes(extra)} />'
+
+    def path(self, d: str = "", **extra) -> str:
+        """A ``<path>`` with path data ``d``."""
+        return f'<path d="{d}"{_svg_attributes(extra)} />'
+
+    def polygon(self, points=(), **extra) -> str:
+        """A ``<polygon>`` through the ``(x, y)`` ``points``."""
+        return f'<polygon points="{" ".join(f"{x},{y}" for x, y in points)}"{_svg_attributes(extra)} />'
+
+    def polyline(self, points=(), **extra) -> str:
+        """A ``<polyline>`` through the ``(x, y)`` ``points``."""
+        return f'<polyline points="{" ".join(f"{x},{y}" for x, y in points)}"{_svg_attributes(extra)} />'
+
+    def circle(self, center=(0, 0), r: float = 1, **extra) -> str:
+        """A ``<circle>`` about ``center`` with radius ``r``."""
+        return f'<circle cx="{center[0]}" cy="{center[1]}" r="{r}"{_svg_attributes(extra)} />'
+
+    def pattern(self, insert=None, size=None, **extra) -> SvgElement:
+        """A ``<pattern>`` container at ``insert`` with tile ``size``; register it with ``defs.add``."""
+        attributes: Dict[str, Any] = {}
+        if insert is not None:
+            attributes["x"], attributes["y"] = insert
+        if size is not None:
+            attributes["width"], attributes["height"] = size
+        attributes.update(extra)
+        return SvgElement("pattern", attributes)
+
+    def tostring(self) -> str:
+        """
+        Returns the whole document.
+
+        Raises:
+            RuntimeError: If the document is written to a file.
+        """
+        if self._out is not None:
+            raise RuntimeError("The SVG is written to a file; call finish() instead")
+        return self._root() + "".join(self._parts) + "</svg>"
+
+    def finish(self):
+        """Closes the document written to the file (the root element too if nothing was drawn)."""
+        if self._out is None:
+            return
+        if not self._started:
+            self._out.write(self._root())
+            self._started = True
+        self._out.write("</svg>")
+
+
 class DrawingContext:
     """
     Handles SVG drawing and coordinate normalization.
 
     Manages the SVG drawing object and scales geometric elements to fit within the viewbox.
     """
-    def __init__(self, size: int = 800):
+    ARC_OUTPUTS = ("polyline", "arc")
+    FILL_INSETS = ("arc", "polygon")
+    SVG_BACKENDS = ("stream", "svgwrite")
+    HATCH_OUTPUTS = ("lines", "path")
+
+    def __init__(self, size: int = 800, arc_output: str = "polyline", arc_tolerance: Optional[float] = None,
+                 line_fill_cache: Optional[LineFillCache] = None, fill_inset: str = "arc",
+                 svg_backend: str = "stream", out: Optional[TextIO] = None, hatch_output: str = "lines",
+                 precision: Optional[int] = None):
         """
         Initializes a DrawingContext.
 
         Args:
             size: The size of the square drawing area in pixels.
+            arc_output: How arcs and group outlines are written: ``"polyline"``
+                (sampled points) or ``"arc"`` (exact SVG ``A`` commands).
+            arc_tolerance: Maximum chord deviation in output pixels used by
+                :meth:`arc_steps`; None samples every arc with ``DEFAULT_ARC_STEPS``.
+            line_fill_cache: Cache of clipped line fills to reuse across drawings;
+                the process-wide :func:`default_line_fill_cache` if None.
+            fill_inset: How group line fills are inset: ``"arc"`` (exactly, from
+                the group's arcs) or ``"polygon"`` (by buffering its sampled outline).
+            svg_backend: ``"stream"`` writes elements as text as they are drawn
+                (:class:`SvgStreamWriter`); ``"svgwrite"`` builds an svgwrite
+                element tree, as earlier versions did.
+            out: Text file to write the SVG to (finished by :meth:`finish`)
+                instead of keeping it for :meth:`to_string`.
+            hatch_output: How line fills are written: ``"lines"`` (one
+                ``<line>`` per segment) or ``"path"`` (one ``<path>`` per group
+                with a ``M..L..`` subpath per segment).
+            precision: Decimal places of every coordinate written (see
+                :func:`format_svg_numbers`); None writes every digit.
+
+        Raises:
+            ValueError: If ``arc_output`` is not one of ``ARC_OUTPUTS``,
+                ``fill_inset`` not one of ``FILL_INSETS``, ``svg_backend`` not
+                one of ``SVG_BACKENDS``, ``hatch_output`` not one of
+                ``HATCH_OUTPUTS``, ``arc_tolerance`` is not positive or
+                ``precision`` is negative.
+            ImportError: If ``svg_backend`` is ``"svgwrite"`` and svgwrite is
+                not installed.
         """
+        if arc_output not in self.ARC_OUTPUTS:
+            raise ValueError(f"Unknown arc output: {arc_output}")
+        if fill_inset not in self.FILL_INSETS:
+            raise ValueError(f"Unknown fill inset: {fill_inset}")
+        if svg_backend not in self.SVG_BACKENDS:
+            raise ValueError(f"Unknown SVG backend: {svg_backend}")
+        if hatch_output not in self.HATCH_OUTPUTS:
+            raise ValueError(f"Unknown hatch output: {hatch_output}")
+        if svg_backend == "svgwrite" and not HAS_SVGWRITE:
+            raise ImportError("svg_backend='svgwrite' requires the svgwrite package")
+        if arc_tolerance is not None and arc_tolerance <= 0:
+            raise ValueError(f"arc_tolerance must be positive, got {arc_tolerance}")
+        if precision is not None and precision < 0:
+            raise ValueError(f"precision must not be negative, got {precision}")
         self.size = size
-        self.dwg = svgwrite.Drawing(size=(size, size))
+        self.precision = precision
+        self.arc_output = arc_output
+        self.arc_tolerance = arc_tolerance
+        self.fill_inset = fill_inset
+        self.svg_backend = svg_backend
+        self.hatch_output = hatch_output
+        self._out = out
+        if svg_backend == "svgwrite":
+            self.dwg = svgwrite.Drawing(size=(size, size))
+        else:
+            self.dwg = SvgStreamWriter(size=(size, size), out=out)
         self.scale_factor = 1.0
-        self._line_fill_cache = LineFillCache()
+        self._line_fill_cache = line_fill_cache if line_fill_cache is not None else default_line_fill_cache()
 
-    def set_normalization_scale(self, elements: List['CircleElement']):
+    def set_normalization_scale(self, elements):
         """
         Calculates and sets the scale factor to fit elements into the viewbox.
 
         The scale factor is determined by the maximum extent of the circles (center + radius).
 
         Args:
-            elements: A list of CircleElement objects to consider for scaling.
+            elements: A CircleSet or a list of CircleElement objects to consider for scaling.
         """
-        if not elements:
+        if not len(elements):
             self.scale_factor = 1.0
-            self.dwg.viewbox(-self.size/2, -self.size/2, self.size, self.size)
+            self.dwg.viewbox(*self.format_numbers([-self.size/2, -self.size/2, self.size, self.size]))
             return
 
-        coords = [c.center for c in elements]
-        radii = [c.radius for c in elements]
+        if isinstance(elements, CircleSet):
+            max_extent = elements.max_extent()
+        else:
+            coords = [c.center for c in elements]
+            radii = [c.radius for c in elements]
 
-        # Find the maximum extent including circle radii
-        max_extent = max(max(abs(z.real) + r, abs(z.imag) + r) for z, r in zip(coords, radii))
+            # Find the maximum extent including circle radii
+            max_extent = max(max(abs(z.real) + r, abs(z.imag) + r) for z, r in zip(coords, radii))
 
         # Tighter padding: scale such that the max extent fits within 95% of the viewbox half-size
         self.scale_factor = (self.size / 2.1) / max_extent
         # Set the viewbox to center the drawing
-        self.dwg.viewbox(-self.size/2, -self.size/2, self.size, self.size)
+        self.dwg.viewbox(*self.format_numbers([-self.size/2, -self.size/2, self.size, self.size]))
+
+    def format_numbers(self, values) -> List[str]:
+        """:func:`format_svg_numbers` at this drawing's precision."""
+        return format_svg_numbers(values, self.precision)
+
+    def format_coordinates(self, points) -> List[Tuple[str, str]]:
+        """``(x, y)`` text of complex points at this drawing's precision."""
+        points = np.asarray(points, dtype=complex).ravel()
+        numbers = self.format_numbers(np.column_stack((points.real, points.imag)))
+        return list(zip(numbers[0::2], numbers[1::2]))
 
 
     def draw_scaled(self, element: Shape, **kwargs):
@@ -534,29 +1662,38 @@ class DrawingContext:
             **kwargs: Additional keyword arguments to pass to the element's to_svg method.
         """
         if isinstance(element, CircleElement):
-            # Apply scaling to center and radius
-            scaled_center = element.center * self.scale_factor
-            scaled_radius = element.radius * self.scale_factor
-            # Create a temporary scaled element for drawing purposes
-            scaled_element = CircleElement(scaled_center, scaled_radius, element.visible)
-            svg_element = scaled_element.to_svg(self.dwg, **kwargs)
+            if not element.visible:
+                svg_element = None
+            else:
+                # Scale center and radius and write them like all other coordinates
+                scaled_center = element.center * self.scale_factor
+                cx, cy, r = self.format_numbers([scaled_center.real, scaled_center.imag, element.radius * self.scale_factor])
+                svg_element = self.dwg.circle(center=(cx, cy), r=r, fill=kwargs.get("color", "#4CB39B"),
+                                              fill_opacity=kwargs.get("opacity", 0.8))
 
         elif isinstance(element, ArcElement):
             if not element.visible:
                 svg_element = None
+            elif self.arc_output == "arc":
+                svg_element = self.dwg.path(
+                    d=self.arc_path_data([(element, False)]),
+                    fill="none",
+                    stroke=kwargs.get("color", "#000000"),
+                    stroke_width=kwargs.get("width", 1.2)
+                )
             else:
                 points = element.get_cached_points()
                 if points is None:
                     points = element.get_points()
 
-                if not points:
+                if not len(points):
                     svg_element = None
                 else:
-                    scaled_points = [p * self.scale_factor for p in points]
+                    coordinates = self.format_coordinates(np.asarray(points) * self.scale_factor)
                     color = kwargs.get("color", "#000000")
                     width = kwargs.get("width", 1.2)
-                    path_data = ["M", f"{scaled_points[0].real},{scaled_points[0].imag}"]
-                    path_data.extend(f"L{p.real},{p.imag}" for p in scaled_points[1:])
+                    path_data = ["M", "{},{}".format(*coordinates[0])]
+                    path_data.extend(f"L{x},{y}" for x, y in coordinates[1:])
                     svg_element = self.dwg.path(
                         d=" ".join(path_data),
                         fill="none",
@@ -571,6 +1708,94 @@ class DrawingContext:
         if svg_element is not None:
             self.dwg.add(svg_element)
 
+    def arc_steps(self, circle: 'CircleElement', start: complex, end: complex) -> int:
+        """
+        Sample count for the arc of ``circle`` from ``start`` to ``end``.
+
+        With an ``arc_tolerance`` the count keeps the drawn chords within that many
+        pixels of the arc at the current ``scale_factor``, so set the scale first.
+        """
+        if self.arc_tolerance is None:
+            return DEFAULT_ARC_STEPS
+        return arc_steps_for_chord_error(
+            circle.radius * self.scale_factor,
+            arc_sweep_angle(circle.center, start, end),
+            self.arc_tolerance,
+        )
+
+    def arc_path_data(self, arcs: List[Tuple['ArcElement', bool]], closed: bool = False, tol: float = 1e-3) -> str:
+        """
+        Builds scaled SVG path data with one ``A`` command per arc.
+
+        Args:
+            arcs: ``(arc, reversed)`` pairs in drawing order (see
+                :meth:`ArcGroup.get_outline_arcs`).
+            closed: Whether to close the path with ``Z``.
+            tol: Unscaled gap above which an arc is joined to the previous one
+                with a straight ``L`` segment, as the sampled polyline would be.
+
+        Returns:
+            The path ``d`` attribute, or an empty string if ``arcs`` is empty.
+        """
+        if not arcs:
+            return ""
+        scale = self.scale_factor
+        first, first_reversed = arcs[0]
+        start = (first.end if first_reversed else first.start) * scale
+        # Commands with placeholders, filled with all numbers formatted at once
+        path_data = ["M{},{}"]
+        numbers = [start.real, start.imag]
+        pen = start
+        for arc, reversed_arc in arcs:
+            radius = arc.circle.radius * scale
+            sweep = arc.sweep_angle
+            begin, end = (arc.end, arc.start) if reversed_arc else (arc.start, arc.end)
+            begin, end = begin * scale, end * scale
+            if abs(begin - pen) > tol * scale:
+                path_data.append("L{},{}")
+                numbers += [begin.real, begin.imag]
+            pen = end
+            # Arcs never exceed half a turn; y points down, so positive angles sweep with flag 1
+            sweep_flag = int((sweep > 0) != reversed_arc)
+            path_data.append(f"A{{}},{{}} 0 0,{sweep_flag} {{}},{{}}")
+            numbers += [radius, radius, end.real, end.imag]
+        if closed:
+            path_data.append("Z")
+        return " ".join(path_data).format(*self.format_numbers(numbers))
+
+    def hatch_path_data(self, segments: np.ndarray) -> str:
+        """
+        Path data drawing line segments as one subpath each.
+
+        Args:
+            segments: Complex (M, 2) array of segment starts and ends (see
+                :meth:`line_fill_segments`).
+
+        Returns:
+            The path ``d`` attribute, ``M`` to each start and ``L`` to its end.
+        """
+        numbers = self.format_numbers(np.column_stack((segments.real, segments.imag))[:, [0, 2, 1, 3]])
+        return "".join(
+            f"M{x1},{y1}L{x2},{y2}"
+            for x1, y1, x2, y2 in zip(numbers[0::4], numbers[1::4], numbers[2::4], numbers[3::4])
+        )
+
+    def draw_circle_set(self, circle_set: 'CircleSet', color="#4CB39B", opacity=0.8):
+        """
+        Draws every visible circle of a CircleSet after scaling, without materializing elements.
+
+        Args:
+            circle_set: The circles to draw.
+            color: The fill color of the circles.
+            opacity: The fill opacity of the circles.
+        """
+        mask = circle_set.visible
+        centers = circle_set.centers[mask] * self.scale_factor
+        radii = circle_set.radii[mask] * self.scale_factor
+        numbers = self.format_numbers(np.column_stack((centers.real, centers.imag, radii)))
+        for cx, cy, r in zip(numbers[0::3], numbers[1::3], numbers[2::3]):
+            self.dwg.add(self.dwg.circle(center=(cx, cy), r=r, fill=color, fill_opacity=opacity))
+
     def make_line_pattern(self, pattern_id="linePattern", spacing=10, angle=45, color="black", stroke_width=1):
         """Create a robust, angle-agnostic parallel line pattern.
 
@@ -601,87 +1826,208 @@ class DrawingContext:
         self.dwg.defs.add(pattern)
         return pattern
     
-    def _draw_clipped_line_fill(self, coords, points, stroke, stroke_width, line_pattern_settings, draw_outline, line_offset):
-        """Draw polygon with clipped parallel line fill."""
-        line_spacing, line_angle = line_pattern_settings
+    def _clipped_line_segments(self, points, line_spacing, line_angle, line_offset):
+        """
+        Clip parallel lines to the (inset) polygon ``points``, memoized in the line fill cache.
 
-        base_array = convert_polygon_to_array(points)
-        polygon_signature = None
-        if base_array is not None and len(base_array) >= 3:
-            polygon_signature = LineFillCache.polygon_signature_from_array(base_array)
+        Returns:
+            Complex array of shape (M, 2) with each segment's start and end.
+        """
+        segments, _ = self.line_fill_segments([points], line_spacing, line_angle, line_offset)
+        return segments
 
-        cache_entry = self._line_fill_cache.ensure_entry(
-            polygon_signature,
-            line_offset,
-            line_spacing,
-            line_angle,
-        )
+    def line_fill_segments(self, polygons, line_spacing, line_angles, line_offset,
+                           arcs: Optional[List[List[Tuple['ArcElement', bool]]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clip parallel lines to many (inset) polygons at once, memoized in the line fill cache.
 
-        polygon_data = cache_entry.get("polygon_data")
-        if polygon_signature is not None and polygon_data is None:
-            polygon_data = self._line_fill_cache.prepare_polygon_data(base_array, line_offset)
-            self._line_fill_cache.store_polygon_data(polygon_signature, line_offset, polygon_data)
-            polygon_data = cache_entry.get("polygon_data")
+        The cache works in each polygon's canonical frame (see
+        :meth:`LineFillCache.canonical_frame`): spacing, angle and inset are
+        mapped into it, so congruent polygons anywhere on the canvas share one
+        entry, and the cached segments are mapped back onto the polygons. The
+        frames, the insets (:func:`inset_polygons`) and the clipping
+        (:func:`clip_hatch_lines_batch`) of all cache misses each run as one
+        batch. Polygons sampled from arcs can pass those, which are then inset
+        and clipped exactly (:func:`hatch_arc_outlines`) instead of their samples.
 
-        if polygon_data is None:
-            line_segments = cache_entry.get("segments")
-            if line_segments is None:
-                line_segments = []
-                self._line_fill_cache.store_segments(
-                    polygon_signature,
-                    line_offset,
-                    line_spacing,
-                    line_angle,
-                    line_segments,
+        Args:
+            polygons: Sequence of complex point arrays (or Nx2 arrays), in canvas units.
+            line_spacing: Distance between lines.
+            line_angles: Line angle in degrees, scalar or one per polygon.
+            line_offset: Inward offset applied before clipping.
+            arcs: Optional unscaled ``(arc, reversed)`` outline of every polygon
+                (see :meth:`ArcGroup.get_outline_arcs`), the polygon being its
+                samples; empty lists fall back to insetting the polygon.
+
+        Returns:
+            ``(segments, segment_offsets)``: a complex (M, 2) array of segment
+            starts and ends, polygon ``i`` owning rows
+            ``segment_offsets[i]:segment_offsets[i + 1]``.
+        """
+        if len(polygons) == 0:
+            return np.empty((0, 2), dtype=complex), np.zeros(1, dtype=np.int64)
+
+        cache = self._line_fill_cache
+        arrays = [np.asarray(points) for points in polygons]
+        arrays = [a if np.iscomplexobj(a) or a.ndim == 1 else a[:, 0] + 1j * a[:, 1] for a in arrays]
+        angles = np.broadcast_to(np.asarray(line_angles, dtype=float), (len(arrays),))
+        usable = [i for i, a in enumerate(arrays) if len(a) >= 3]
+        results: List[Optional[np.ndarray]] = [None] * len(arrays)
+        centers = np.zeros(len(arrays), dtype=complex)
+        scales = np.ones(len(arrays), dtype=complex)
+        on_arcs = [bool(arcs is not None and line_offset > 0 and arcs[i]) for i in range(len(arrays))]
+
+        if usable:
+            counts = [len(arrays[i]) for i in usable]
+            offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+            signatures, local, frame_centers, frame_scales = LineFillCache.canonical_frames(
+                np.concatenate([arrays[i] for i in usable]).astype(complex), offsets
+            )
+            centers[usable], scales[usable] = frame_centers, frame_scales
+            local_xy = np.column_stack((local.real, local.imag))
+
+            # Look every polygon up; misses sharing a key with an earlier polygon reuse its work
+            work = []      # (index, local array, entry or None, key params, polygon data, ready)
+            owner_of = {}  # cache key -> position in work
+            followers = []  # (index, position in work)
+            for n, i in enumerate(usable):
+                polygon_local = local_xy[offsets[n]:offsets[n + 1]]
+                # Quantized so that the frame's noise does not split keys; the clipping uses
+                # the quantized values too, so a hit returns what a miss would compute
+                size = abs(frame_scales[n])
+                local_spacing = LineFillCache.quantize(line_spacing / size)
+                local_angle = LineFillCache.normalize_angle(
+                    round(angles[i] - math.degrees(cmath.phase(frame_scales[n])), _CANONICAL_PARAM_DIGITS))
+                local_offset = LineFillCache.quantize(line_offset / size)
+                # Exact insets differ from polygon insets, so they are cached apart
+                signature = (signatures[n], "arc") if on_arcs[i] else signatures[n]
+                params = (signature, local_offset, local_spacing, local_angle)
+                key = cache._make_key(*params)
+                if key in owner_of:
+                    position = owner_of[key]
+                    if LineFillCache.same_canonical_polygon(work[position][1], polygon_local):
+                        followers.append((i, position))
+                        continue
+                    key = None
+
+                entry = cache.ensure_entry(*params) if key is not None else None
+                polygon_data = entry["polygon_data"] if entry else None
+                ready = bool(entry and entry["polygon_ready"])
+                if ready and polygon_data is not None and not LineFillCache.same_canonical_polygon(
+                        polygon_data["source_array"], polygon_local):
+                    # Another polygon with the same signature owns the entry; clip this one uncached
+                    entry, ready = None, False
+                if entry is not None and entry["segments"] is not None:
+                    results[i] = entry["segments"]
+                    continue
+                if entry is not None:
+                    owner_of[key] = len(work)
+                work.append((i, polygon_local, entry, params, polygon_data, ready))
+
+            # Inset all polygons not prepared yet in one batch; outlines of arcs are inset
+            # while clipping, so their prepared data is just the polygon and its hatch origin
+            unprepared = [w for w in range(len(work)) if not work[w][5]]
+            sampled = [w for w in unprepared if not on_arcs[work[w][0]]]
+            insets = {w: work[w][1] for w in unprepared}
+            if sampled:
+                sources = [work[w][1] for w in sampled]
+                inset_vertices, inset_offsets = inset_polygons(
+                    np.concatenate(sources),
+                    np.concatenate(([0], np.cumsum([len(a) for a in sources], dtype=np.int64))),
+                    [work[w][3][1] for w in sampled],
                 )
-        else:
-            line_starts = cache_entry.get("line_starts")
-            line_ends = cache_entry.get("line_ends")
-            if line_starts is None or line_ends is None:
-                line_starts, line_ends = self._line_fill_cache.compute_line_endpoints(
-                    polygon_data,
-                    line_spacing,
-                    line_angle,
+                for m, w in enumerate(sampled):
+                    insets[w] = inset_vertices[inset_offsets[m]:inset_offsets[m + 1]]
+            for w in unprepared:
+                i, polygon_local, entry, params, _, _ = work[w]
+                polygon_data = LineFillCache.polygon_data_from_inset(polygon_local, insets[w])
+                if entry is not None:
+                    cache.store_polygon_data(params[0], params[1], polygon_data)
+                work[w] = (i, polygon_local, entry, params, polygon_data, True)
+
+            # Clip the lines of every polygon that still needs them in one batch each
+            for w in range(len(work)):
+                results[work[w][0]] = np.empty((0, 2), dtype=complex)
+            clip = [w for w in range(len(work)) if work[w][4] is not None and not on_arcs[work[w][0]]]
+            if clip:
+                insets = [work[w][4]["polygon_array"] for w in clip]
+                segments, segment_offsets = clip_hatch_lines_batch(
+                    np.concatenate(insets),
+                    np.concatenate(([0], np.cumsum([len(a) for a in insets], dtype=np.int64))),
+                    [work[w][3][2] for w in clip],
+                    [work[w][3][3] for w in clip],
+                    [work[w][4]["centroid"] for w in clip],
                 )
-                self._line_fill_cache.store_line_endpoints(
-                    polygon_signature,
-                    line_offset,
-                    line_spacing,
-                    line_angle,
-                    line_starts,
-                    line_ends,
+                segments = segments @ np.array([1, 1j])
+                for m, w in enumerate(clip):
+                    results[work[w][0]] = segments[segment_offsets[m]:segment_offsets[m + 1]]
+            exact = [w for w in range(len(work)) if work[w][4] is not None and on_arcs[work[w][0]]]
+            if exact:
+                # Curves in the same local frame as the polygon
+                owners = [work[w][0] for w in exact]
+                curves, curve_offsets = outline_primitives(
+                    [arcs[i] for i in owners], scales[owners] / self.scale_factor, centers[owners] / self.scale_factor)
+                segments, segment_offsets = hatch_arc_outlines(
+                    *curves, curve_offsets,
+                    [work[w][3][1] for w in exact],
+                    [work[w][3][2] for w in exact],
+                    [work[w][3][3] for w in exact],
+                    [work[w][4]["centroid"] @ np.array([1, 1j]) for w in exact],
                 )
+                for m, w in enumerate(exact):
+                    results[work[w][0]] = segments[segment_offsets[m]:segment_offsets[m + 1]]
+            for i, polygon_local, entry, params, _, _ in work:
+                if entry is not None:
+                    cache.store_segments(*params, results[i])
+            for i, position in followers:
+                results[i] = results[work[position][0]]
+
+        # Map every polygon's local segments back onto the canvas
+        local_segments = [np.empty((0, 2), dtype=complex) if r is None else r for r in results]
+        segment_offsets = np.concatenate(([0], np.cumsum([len(r) for r in local_segments], dtype=np.int64)))
+        owners = np.repeat(np.arange(len(arrays)), np.diff(segment_offsets))
+        segments = np.concatenate(local_segments) if local_segments else np.empty((0, 2), dtype=complex)
+        segments = centers[owners, None] + scales[owners, None] * segments
+        return segments, segment_offsets
+
+    def _template_line_segments(self, template_points, line_spacing, line_angle, line_offset):
+        """Clip parallel lines to a template polygon whose inset is prepared once and reused.
+
+        Returns the segments like :meth:`_clipped_line_segments`, in the template's frame.
+        """
+        entry = self._line_fill_cache.template_entry(template_points, line_offset)
+        polygon_data = entry["polygon_data"]
+        if polygon_data is None:
+            return np.empty((0, 2), dtype=complex)
+        line_angle = LineFillCache.normalize_angle(line_angle)
+        segments = entry["segments"].get((LineFillCache._normalize(line_spacing), line_angle))
+        if segments is None:
+            segments = clip_hatch_lines(
+                polygon_data["polygon_array"], line_spacing, line_angle, polygon_data["centroid"]
+            ) @ np.array([1, 1j])
+            self._line_fill_cache.store_template_segments(entry, line_spacing, line_angle, segments)
+        return segments
 
-            line_segments = cache_entry.get("segments")
-            if line_segments is None:
-                if line_starts is None or line_ends is None:
-                    line_segments = []
-                else:
-                    line_segments = lines_in_polygon(
-                        points,
-                        line_spacing=line_spacing,
-                        angle=line_angle,
-                        offset=0,
-                        polygon_array=polygon_data.get("polygon_array"),
-                        polygon_path=polygon_data.get("polygon_path"),
-                        shapely_polygon=polygon_data.get("shapely_polygon"),
-                        prepared_polygon=polygon_data.get("prepared_polygon"),
-                        bbox_diag=polygon_data.get("bbox_diag"),
-                        centroid=polygon_data.get("centroid"),
-                        line_starts=line_starts,
-                        line_ends=line_ends,
-                    )
+    def _draw_clipped_line_fill(self, coords, points, stroke, stroke_width, line_pattern_settings, draw_outline, line_offset,
+                                template=None, arc_path=None, line_segments=None):
+        """Draw polygon with clipped parallel line fill."""
+        line_spacing, line_angle = line_pattern_settings
 
-                self._line_fill_cache.store_segments(
-                    polygon_signature,
-                    line_offset,
-                    line_spacing,
-                    line_angle,
-                    line_segments,
-                )
+        if line_segments is None and template is None:
+            line_segments = self._clipped_line_segments(points, line_spacing, line_angle, line_offset)
+        elif line_segments is None:
+            # Clip against the congruent template polygon at the counter-rotated angle,
+            # then rotate the segments into place: same world-space angle, cached inset.
+            template_points, rotation = template
+            rotation_deg = math.degrees(np.angle(rotation))
+            line_segments = rotation * self._template_line_segments(
+                template_points, line_spacing, line_angle - rotation_deg, line_offset
+            )
 
         # Optionally draw polygon outline
-        if draw_outline:
+        if draw_outline and arc_path:
+            self.dwg.add(self.dwg.path(d=arc_path, fill="none", stroke=stroke, stroke_width=stroke_width))
+        elif draw_outline:
             self.dwg.add(self.dwg.polygon(
                 points=coords,
                 fill="none", 
@@ -689,9 +2035,15 @@ class DrawingContext:
                 stroke_width=stroke_width
             ))
         
-        # Draw clipped line segments
+        # Draw clipped line segments (complex start and end per row)
         line_color = stroke or "#000000"
-        for (x1, y1), (x2, y2) in line_segments:
+        if self.hatch_output == "path":
+            if len(line_segments):
+                self.dwg.add(self.dwg.path(d=self.hatch_path_data(line_segments), fill="none",
+                                           stroke=line_color, stroke_width=0.5))
+            return
+        numbers = self.format_numbers(np.column_stack((line_segments.real, line_segments.imag))[:, [0, 2, 1, 3]])
+        for x1, y1, x2, y2 in zip(numbers[0::4], numbers[1::4], numbers[2::4], numbers[3::4]):
             self.dwg.add(self.dwg.line(
                 start=(x1, y1), 
                 end=(x2, y2),
@@ -702,7 +2054,10 @@ class DrawingContext:
     def draw_group_outline(self, points: List[complex], fill: Optional[str] = None, 
                           stroke: Optional[str] = None, stroke_width: float = 1.0, 
                           line_pattern_settings = (3, 0), use_clipped_lines: bool = False, 
-                          draw_outline: bool = True, line_offset: float = 0):
+                          draw_outline: bool = True, line_offset: float = 0,
+                          template: Optional[Tuple[List[complex], complex]] = None,
+                          arcs: Optional[List[Tuple['ArcElement', bool]]] = None,
+                          line_segments: Optional[np.ndarray] = None):
         """Draw a polygon with optional line pattern fill.
         
         Args:
@@ -714,18 +2069,41 @@ class DrawingContext:
             use_clipped_lines: Use precise clipped lines instead of SVG patterns
             draw_outline: Whether to draw polygon outline
             line_offset: Inward offset for line clipping
+            template: Optional ``(template_points, rotation)`` where ``points`` is
+                ``template_points`` rotated about the origin by the unit complex
+                ``rotation``; line fills are then clipped against the template so
+                congruent polygons share its cached inset geometry.
+            arcs: Optional unscaled ``(arc, reversed)`` outline arcs; with
+                ``arc_output == "arc"`` the outline is written from these as
+                ``A`` commands and ``points`` are only needed for line fills.
+            line_segments: Optional precomputed line fill as returned by
+                :meth:`line_fill_segments`; ``line_pattern_settings``,
+                ``line_offset`` and ``template`` are then not used for clipping.
         """
-        if not points:
+        arc_path = None
+        if arcs and self.arc_output == "arc":
+            start = arcs[0][0].end if arcs[0][1] else arcs[0][0].start
+            end = arcs[-1][0].start if arcs[-1][1] else arcs[-1][0].end
+            arc_path = self.arc_path_data(arcs, closed=abs(start - end) <= 1e-3)
+        if not len(points) and not arc_path:
             return
         
-        coords = [(p.real, p.imag) for p in points]
+        points = np.asarray(points, dtype=complex)
+        coords = self.format_coordinates(points)
         
         # Use clipped lines for pattern fills (new method)
         if use_clipped_lines or fill in ("pattern", "clipped_lines"):
             self._draw_clipped_line_fill(
                 coords, points, stroke, stroke_width, 
-                line_pattern_settings, draw_outline, line_offset
+                line_pattern_settings, draw_outline, line_offset, template, arc_path, line_segments
             )
+        elif arc_path:
+            self.dwg.add(self.dwg.path(
+                d=arc_path,
+                fill=fill or "none",
+                stroke=stroke or "#000000",
+                stroke_width=stroke_width
+            ))
         elif fill is not None:
             # Solid color fill
             self.dwg.add(self.dwg.polygon(
@@ -750,16 +2128,26 @@ class DrawingContext:
         """
         return self.dwg.tostring()
 
+    def finish(self):
+        """Completes the SVG written to ``out``; svgwrite drawings are only written now."""
+        if self._out is None:
+            return
+        if self.svg_backend == "svgwrite":
+            self.dwg.write(self._out)
+        else:
+            self.dwg.finish()
+
 class CircleElement(Shape):
     """
     Represents a circle in the geometry, handling intersections.
 
-    Each circle has a unique ID, a center (complex number), and a radius.
+    Each circle has an ID, a center (complex number), and a radius.
     It can compute intersections with other circles and find its neighbours.
     """
     _id_counter = 0
 
-    def __init__(self, center: complex, radius: float, visible: bool = True):
+    def __init__(self, center: complex, radius: float, visible: bool = True,
+                 circle_id: Optional[int] = None):
         """
         Initializes a CircleElement.
 
@@ -767,10 +2155,14 @@ class CircleElement(Shape):
             center: The center of the circle as a complex number.
             radius: The radius of the circle.
             visible: Whether the circle should be visible in the drawing.
+            circle_id: Explicit ID, e.g. the circle's index in its spiral. If None,
+                a process-wide counter hands out a fresh one.
         """
         super().__init__(visible)
-        CircleElement._id_counter += 1
-        self.id = CircleElement._id_counter
+        if circle_id is None:
+            CircleElement._id_counter += 1
+            circle_id = CircleElement._id_counter
+        self.id = circle_id
         self.center = complex(center)
         self.radius = float(radius)
         # List of (point: complex, other_circle: CircleElement)
@@ -781,9 +2173,6 @@ class CircleElement(Shape):
         """
         Calculates the intersection points between this circle and another.
 
-        Uses the Law of Cosines to find the distance from the center to the chord connecting
-        the intersection points, then finds the points on the circle along the perpendicular vector.
-
         Args:
             other: The other CircleElement to intersect with.
             tol: Tolerance for floating point comparisons.
@@ -791,32 +2180,7 @@ class CircleElement(Shape):
         Returns:
             A list of complex numbers representing the intersection points (0, 1, or 2 points).
         """
-        d = abs(self.center - other.center)
-        r1, r2 = self.radius, other.radius
-
-        # Check for no intersection, tangency (external or internal), or one circle contained within another
-        if d > r1 + r2 + tol or d < abs(r1 - r2) - tol or d < tol:
-            return []
-
-        # Distance 'a' from center 1 to the chord connecting intersection points
-        a = (r1**2 - r2**2 + d**2) / (2 * d)
-        # Half the length of the chord, squared
-        h_sq = r1**2 - a**2
-        if h_sq < -tol: # Should not happen with checks above, but floating point safety
-            return []
-        # Half the length of the chord
-        h = np.sqrt(max(h_sq, 0))
-
-        # Midpoint of the chord
-        mid = self.center + a * (other.center - self.center) / d
-        # Vector perpendicular to the line between centers, scaled by 1/d
-        perp_unit = 1j * (other.center - self.center) / d
-
-        # The two intersection points
-        p1, p2 = mid + h * perp_unit, mid - h * perp_unit
-
-        # If h is near zero, the points are the same (tangency)
-        return [p1] if h < tol else [p1, p2]
+        return circle_intersection_points(self.center, self.radius, other.center, other.radius, tol)
 
     def compute_intersections(self, circles: List['CircleElement'], start_reference: Optional[complex] = None, tol: float = 1e-3):
         """
@@ -831,42 +2195,26 @@ class CircleElement(Shape):
         """
         self.intersections.clear()
         self.neighbours.clear()
-        seen = set()
-
-        for other in circles:
-            if other is self:
-                continue
-            # Get intersection points with another circle
-            pts = self._get_intersection_points(other, tol)
-            for p in pts:
-                # Use a slightly coarse rounding for deduplication of points
-                key = (round(p.real, 6), round(p.imag, 6))
-                if key not in seen:
-                    self.intersections.append((p, other))
-                    seen.add(key)
-                    self.neighbours.add(other)
-
-        if not self.intersections:
+        others = [other for other in circles if other is not self]
+        if not others:
             return
 
-        c = self.center
+        # Index 0 is this circle, candidates follow in the order given
+        centers = np.array([self.center] + [o.center for o in others], dtype=complex)
+        radii = np.array([self.radius] + [o.radius for o in others], dtype=float)
+        owners, points, found = circle_intersections_batch(
+            centers, radii, np.zeros(len(others), dtype=int), np.arange(1, len(others) + 1), tol
+        )
+        keep = first_unique_intersections(owners, points)
+        owners, points, found = owners[keep], points[keep], found[keep]
+
         # Default reference point is the circle's center
         if start_reference is None:
-            start_reference = c
-
-        # Choose the starting intersection by proximity to the reference point
-        start_idx = int(np.argmin([abs(p - start_reference) for p, _ in self.intersections]))
-        start_point = self.intersections[start_idx][0]
-        start_angle = np.angle(start_point - c)
-
-        def clockwise_offset(angle):
-            """Compute clockwise offset from start_angle in [0, 2pi)."""
-            # The angle is relative to the center of *this* circle
-            offset = (start_angle - angle) % (2 * np.pi)
-            return offset
-
-        # Sort intersections by clockwise offset from the starting point
-        self.intersections.sort(key=lambda x: clockwise_offset(np.angle(x[0] - c)))
+            start_reference = self.center
+        order = clockwise_intersection_order(owners, points, centers[owners], start_reference)
+        for point, j in zip(points[order].tolist(), found[order].tolist()):
+            self.intersections.append((point, others[j - 1]))
+            self.neighbours.add(others[j - 1])
 
     def get_neighbour_circles(
         self,
@@ -905,13 +2253,17 @@ class CircleElement(Shape):
             a = np.angle(other.center - spiral_center)
             # relative in [0, 2*pi)
             rel = (a - base_angle) % (2 * np.pi)
-            return rel
+            # Just below 2*pi is the same direction as 0
+            return 0.0 if rel > 2 * np.pi - _TIE_RTOL else rel
 
-        # Build sort keys: primary = relative angle, secondary = distance (optional)
+        # Build sort keys: primary = relative angle, secondary = distance (optional).
+        # Neighbours at the same angle (an inner and an outer one when p == q) are
+        # tied exactly, so they are told apart by distance rather than rounding noise.
+        angles = dict(zip(neighbours, tie_classes([relative_angle_to_base(c) for c in neighbours])))
         if tie_by_distance:
-            neighbours.sort(key=lambda c: (relative_angle_to_base(c), abs(c.center - self.center)))
+            neighbours.sort(key=lambda c: (angles[c], abs(c.center - self.center)))
         else:
-            neighbours.sort(key=relative_angle_to_base)
+            neighbours.sort(key=lambda c: angles[c])
 
         # numpy.angle gives CCW angles increasing; `rel` increases CCW from base direction.
         # If user wants clockwise order, reverse the CCW ordering.
@@ -921,22 +2273,315 @@ class CircleElement(Shape):
         return neighbours
 
 
-    def to_svg(self, dwg: svgwrite.Drawing, color="#4CB39B", opacity=0.8):
+    def to_svg(self, dwg: 'SvgStreamWriter', color="#4CB39B", opacity=0.8, precision: Optional[int] = None):
         """
         Renders the circle to an SVG element.
 
         Args:
-            dwg: The svgwrite Drawing object.
+            dwg: The drawing making the element (:class:`SvgStreamWriter` or svgwrite Drawing).
             color: The fill color of the circle.
             opacity: The fill opacity of the circle.
+            precision: Decimal places of the coordinates (see :func:`format_svg_numbers`).
 
         Returns:
-            An svgwrite Circle object, or None if the circle is not visible.
+            The drawing's circle element, or None if the circle is not visible.
         """
         if not self.visible:
             return None
-        cx, cy = self.center.real, self.center.imag
-        return dwg.circle(center=(cx, cy), r=self.radius, fill=color, fill_opacity=opacity)
+        cx, cy, r = format_svg_numbers([self.center.real, self.center.imag, self.radius], precision)
+        return dwg.circle(center=(cx, cy), r=r, fill=color, fill_opacity=opacity)
+
+class CircleSet:
+    """
+    Columnar store for a set of circles.
+
+    Centers, radii and lattice indices live in NumPy arrays; intersections and
+    neighbours are kept CSR-style (``*_offsets[i]:*_offsets[i + 1]`` slices the
+    flat arrays for circle ``i``). A set holds no Python objects per circle, so
+    large spirals stay compact and can be shipped between processes as plain
+    arrays (see :meth:`to_arrays`). :meth:`to_elements` materializes
+    :class:`CircleElement` objects when object-based code needs them.
+    """
+
+    # (family, step) offsets of the six tangent neighbours: multiply by a, 1/a, b, 1/b, b/a, a/b
+    LATTICE_OFFSETS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, -1), (-1, 1))
+
+    ARRAY_FIELDS = (
+        "centers", "radii", "families", "steps", "visible",
+        "intersection_offsets", "intersection_points", "intersection_others",
+        "neighbour_offsets", "neighbour_indices",
+    )
+
+    def __init__(self, centers, radii, families=None, steps=None, visible=True):
+        """
+        Initializes a CircleSet without intersections.
+
+        Args:
+            centers: Complex circle centers.
+            radii: Circle radii.
+            families: Spiral family index per circle (-1 when unknown).
+            steps: Step along the family per circle (0 when unknown).
+            visible: Visibility flag, either per circle or shared by all.
+        """
+        self.centers = np.asarray(centers, dtype=complex).ravel()
+        n = self.centers.size
+        self.radii = np.asarray(radii, dtype=float).ravel()
+        self.families = np.full(n, -1, dtype=int) if families is None else np.asarray(families, dtype=int).ravel()
+        self.steps = np.zeros(n, dtype=int) if steps is None else np.asarray(steps, dtype=int).ravel()
+        self.visible = np.broadcast_to(np.asarray(visible, dtype=bool), (n,)).copy()
+        self.clear_intersections()
+
+    def __len__(self) -> int:
+        return self.centers.size
+
+    def clear_intersections(self):
+        """Drops all intersection and neighbour data."""
+        n = len(self)
+        self.intersection_offsets = np.zeros(n + 1, dtype=int)
+        self.intersection_points = np.empty(0, dtype=complex)
+        self.intersection_others = np.empty(0, dtype=int)
+        self.neighbour_offsets = np.zeros(n + 1, dtype=int)
+        self.neighbour_indices = np.empty(0, dtype=int)
+
+    @classmethod
+    def concatenate(cls, circle_sets: List['CircleSet']) -> 'CircleSet':
+        """Stacks several sets into one, shifting intersection indices accordingly."""
+        merged = cls(
+            np.concatenate([cs.centers for cs in circle_sets]),
+            np.concatenate([cs.radii for cs in circle_sets]),
+            np.concatenate([cs.families for cs in circle_sets]),
+            np.concatenate([cs.steps for cs in circle_sets]),
+            np.concatenate([cs.visible for cs in circle_sets]),
+        )
+        bases = np.cumsum([0] + [len(cs) for cs in circle_sets])
+        owners = np.concatenate([
+            base + np.repeat(np.arange(len(cs)), np.diff(cs.intersection_offsets))
+            for base, cs in zip(bases, circle_sets)
+        ])
+        merged.set_intersections(
+            owners.astype(int),
+            np.concatenate([cs.intersection_points for cs in circle_sets]),
+            np.concatenate([base + cs.intersection_others for base, cs in zip(bases, circle_sets)]).astype(int),
+        )
+        return merged
+
+    @classmethod
+    def from_elements(cls, elements: List['CircleElement']) -> 'CircleSet':
+        """Builds a set (including intersections among ``elements``) from CircleElement objects."""
+        circle_set = cls(
+            [c.center for c in elements],
+            [c.radius for c in elements],
+            visible=[c.visible for c in elements],
+        )
+        index_of = {id(c): i for i, c in enumerate(elements)}
+        owners, points, others = [], [], []
+        for i, c in enumerate(elements):
+            for point, other in c.intersections:
+                j = index_of.get(id(other))
+                if j is not None:
+                    owners.append(i)
+                    points.append(point)
+                    others.append(j)
+        circle_set.set_intersections(
+            np.array(owners, dtype=int), np.array(points, dtype=complex), np.array(others, dtype=int)
+        )
+        return circle_set
+
+    def set_intersections(self, owners: np.ndarray, points: np.ndarray, others: np.ndarray):
+        """
+        Stores intersection entries and derives the neighbour lists.
+
+        Args:
+            owners: Circle index each entry belongs to; entries of one owner keep their relative order.
+            points: Intersection point of each entry.
+            others: Index of the other circle of each entry.
+        """
+        n = len(self)
+        order = np.argsort(owners, kind="stable")
+        self.intersection_points = np.asarray(points, dtype=complex)[order]
+        self.intersection_others = np.asarray(others, dtype=int)[order]
+        self.intersection_offsets = np.concatenate(([0], np.cumsum(np.bincount(owners, minlength=n))))
+
+        pairs = np.unique(np.stack([owners, others], axis=1).reshape(-1, 2), axis=0)
+        self.neighbour_indices = pairs[:, 1].copy()
+        self.neighbour_offsets = np.concatenate(([0], np.cumsum(np.bincount(pairs[:, 0], minlength=n))))
+
+    def intersection_counts(self) -> np.ndarray:
+        """Number of intersection points per circle."""
+        return np.diff(self.intersection_offsets)
+
+    def intersections_of(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(points, other_indices)`` views for circle ``index``, in clockwise order."""
+        lo, hi = self.intersection_offsets[index], self.intersection_offsets[index + 1]
+        return self.intersection_points[lo:hi], self.intersection_others[lo:hi]
+
+    def neighbours_of(self, index: int) -> np.ndarray:
+        """Return the (sorted) indices of circles intersecting circle ``index``."""
+        lo, hi = self.neighbour_offsets[index], self.neighbour_offsets[index + 1]
+        return self.neighbour_indices[lo:hi]
+
+    def max_extent(self) -> float:
+        """Largest |x| or |y| reached by any circle (center plus radius)."""
+        if not len(self):
+            return 0.0
+        return float(np.max(np.maximum(np.abs(self.centers.real), np.abs(self.centers.imag)) + self.radii))
+
+    def lattice_neighbours(self, p: int, q: int) -> np.ndarray:
+        """
+        Derives the six tangent neighbours of every circle from its (family, step) index.
+
+        Circle (f, k) sits at ``a**(k+1) * b**f``, so its neighbours are fixed
+        index offsets (see :attr:`LATTICE_OFFSETS`). Families wrap around via
+        ``b**q == a**p``: family ``q`` at step ``k`` is family ``0`` at step ``k + p``.
+
+        Args:
+            p: The p parameter of the spiral the set was generated from.
+            q: The q parameter of the spiral the set was generated from.
+
+        Returns:
+            An ``(n, 6)`` array of neighbour indices, -1 where the neighbour is
+            not part of the set (or the circle has no lattice index). Several
+            circles sharing one (family, step) index, e.g. an outer circle that
+            repeats a visible one, are ambiguous: their rows and every lookup of
+            their index are -1, so they fall back to a spatial search.
+        """
+        n = len(self)
+        neighbours = np.full((n, len(self.LATTICE_OFFSETS)), -1, dtype=int)
+        indexed = np.flatnonzero(self.families >= 0)
+        if not indexed.size:
+            return neighbours
+
+        families, steps = self.families[indexed], self.steps[indexed]
+        # Dense (family, step) -> index lookup, padded for wrapped steps
+        lo = int(steps.min()) - p - 1
+        span = int(steps.max()) + p + 1 - lo + 1
+        keys = families * span + (steps - lo)
+        grid = np.full(q * span, -1, dtype=int)
+        grid[keys] = indexed
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = counts[inverse] > 1
+        grid[keys[shared]] = -1
+        indexed, families, steps = indexed[~shared], families[~shared], steps[~shared]
+
+        for col, (d_family, d_step) in enumerate(self.LATTICE_OFFSETS):
+            nf = families + d_family
+            nk = steps + d_step
+            nk = np.where(nf >= q, nk + p, np.where(nf < 0, nk - p, nk))
+            nf = nf % q
+            neighbours[indexed, col] = grid[nf * span + (nk - lo)]
+        return neighbours
+
+    def _kdtree_candidates(self, indices: np.ndarray, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Spatially searched ``(owners, others)`` candidate pairs for the circles in ``indices``.
+
+        Radii in a spiral span orders of magnitude, so a single tree searched
+        with the largest radius would return nearly every circle. Circles are
+        split into classes of radius within a factor of two, each searched
+        with its own largest radius; pairs whose discs cannot touch are dropped.
+        """
+        centers, radii = self.centers, self.radii
+        xy = np.column_stack([centers.real, centers.imag])
+        query_xy, query_r = xy[indices], radii[indices]
+        radius_class = np.floor(np.log2(np.maximum(radii, 1e-300) / max(float(radii.min()), 1e-300))).astype(int)
+
+        owners, others = [], []
+        for cls_id in np.unique(radius_class):
+            members = np.flatnonzero(radius_class == cls_id)
+            tree = cKDTree(xy[members])
+            found = tree.query_ball_point(query_xy, query_r + float(radii[members].max()) + tol)
+            counts = np.fromiter((len(f) for f in found), dtype=int, count=len(found))
+            cls_owners = np.repeat(indices, counts)
+            cls_others = members[np.fromiter((j for f in found for j in f), dtype=int, count=int(counts.sum()))]
+            touching = np.abs(centers[cls_owners] - centers[cls_others]) <= radii[cls_owners] + radii[cls_others] + tol
+            owners.append(cls_owners[touching])
+            others.append(cls_others[touching])
+        return np.concatenate(owners), np.concatenate(others)
+
+    def compute_intersections(self, start_reference: complex = 0j, tol: float = 1e-3,
+                              lattice: Optional[Tuple[int, int]] = None):
+        """
+        Computes all pairwise intersections and stores them clockwise per circle.
+
+        Gives the same result as :meth:`CircleElement.compute_intersections` for
+        every circle of the set, but runs as a handful of array passes over all
+        candidate pairs (see :func:`circle_intersections_batch`).
+
+        Args:
+            start_reference: Reference point selecting the first intersection of each circle.
+            tol: Tolerance for floating point comparisons.
+            lattice: Spiral ``(p, q)``. When given, candidates come from
+                :meth:`lattice_neighbours`; only circles missing a lattice neighbour
+                (the boundary of the set) fall back to a KD-tree search. When None,
+                every circle uses the KD-tree.
+        """
+        n = len(self)
+        if not n:
+            self.clear_intersections()
+            return
+
+        if lattice is not None:
+            neighbours = self.lattice_neighbours(*lattice)
+            complete = (neighbours >= 0).all(axis=1)
+            lattice_owners = np.repeat(np.flatnonzero(complete), neighbours.shape[1])
+            lattice_others = neighbours[complete].ravel()
+            searched = np.flatnonzero(~complete)
+        else:
+            lattice_owners = lattice_others = np.empty(0, dtype=int)
+            searched = np.arange(n)
+        kd_owners, kd_others = self._kdtree_candidates(searched, tol)
+
+        owners = np.concatenate([lattice_owners, kd_owners])
+        others = np.concatenate([lattice_others, kd_others])
+        # Candidates ascending per owner, so duplicates resolve the same way for both sources
+        order = np.lexsort((others, owners))
+        owners, others = owners[order], others[order]
+        distinct = owners != others
+        owners, points, others = circle_intersections_batch(
+            self.centers, self.radii, owners[distinct], others[distinct], tol
+        )
+
+        keep = first_unique_intersections(owners, points)
+        owners, points, others = owners[keep], points[keep], others[keep]
+        order = clockwise_intersection_order(owners, points, self.centers[owners], start_reference)
+        self.set_intersections(owners[order], points[order], others[order])
+
+    def to_elements(self, first_id: int = 1) -> List['CircleElement']:
+        """Materializes CircleElement objects with intersections and neighbours filled in.
+
+        Element ``i`` gets ID ``first_id + i``, so the IDs depend only on the set's order.
+        """
+        elements = [
+            CircleElement(c, r, v, circle_id=first_id + i)
+            for i, (c, r, v) in enumerate(zip(self.centers.tolist(), self.radii.tolist(), self.visible.tolist()))
+        ]
+        self.apply_to_elements(elements)
+        return elements
+
+    def apply_to_elements(self, elements: List['CircleElement']):
+        """Writes this set's intersections and neighbours into matching ``elements``."""
+        points = self.intersection_points.tolist()
+        others = self.intersection_others.tolist()
+        offsets = self.intersection_offsets.tolist()
+        neighbours = self.neighbour_indices.tolist()
+        neighbour_offsets = self.neighbour_offsets.tolist()
+        for i, element in enumerate(elements):
+            lo, hi = offsets[i], offsets[i + 1]
+            element.intersections = [(points[k], elements[others[k]]) for k in range(lo, hi)]
+            element.neighbours = {elements[j] for j in neighbours[neighbour_offsets[i]:neighbour_offsets[i + 1]]}
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Return the set as a dict of arrays (e.g. for ``np.savez`` or inter-process transfer)."""
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'CircleSet':
+        """Rebuilds a set from :meth:`to_arrays` output."""
+        circle_set = cls(arrays["centers"], arrays["radii"], arrays["families"], arrays["steps"], arrays["visible"])
+        for name in cls.ARRAY_FIELDS[5:]:
+            setattr(circle_set, name, np.asarray(arrays[name]))
+        return circle_set
+
 
 class ArcElement(Shape):
     """
@@ -944,7 +2589,7 @@ class ArcElement(Shape):
 
     An arc is defined by the circle it lies on and its start and end points.
     """
-    def __init__(self, circle: CircleElement, start: complex, end: complex, steps: int = 40, visible: bool = True):
+    def __init__(self, circle: CircleElement, start: complex, end: complex, steps: int = DEFAULT_ARC_STEPS, visible: bool = True):
         """
         Initializes an ArcElement.
 
@@ -1004,11 +2649,36 @@ class ArcElement(Shape):
             self._steps = new_value
             self._invalidate_points_cache()
 
-    def get_cached_points(self) -> Optional[List[complex]]:
+    def get_cached_points(self) -> Optional[np.ndarray]:
         """Return the cached arc sample points if available."""
         return self._points_cache
 
-    def get_points(self) -> List[complex]:
+    def set_points_from(self, source: 'ArcElement', transform: complex):
+        """
+        Seeds the sample points with ``source``'s mapped by ``z -> transform * z``.
+
+        Only valid when this arc is that image of ``source`` with the same steps.
+        Nothing is seeded while ``source`` has not been sampled yet.
+        """
+        points = source.get_cached_points()
+        if points is not None and len(points) == self.steps:
+            self._points_cache = points * transform
+
+    @property
+    def sweep_angle(self) -> float:
+        """Signed angle from start to end about the circle center, in (-pi, pi]."""
+        return arc_sweep_angle(self.circle.center, self.start, self.end)
+
+    def set_points(self, points: np.ndarray):
+        """
+        Sets the sample points, e.g. a view into a :func:`sample_arcs` buffer.
+
+        Args:
+            points: ``steps`` complex points from start to end (not copied).
+        """
+        self._points_cache = points
+
+    def get_points(self) -> np.ndarray:
         """
         Calculates the discrete points defining the arc.
 
@@ -1016,48 +2686,43 @@ class ArcElement(Shape):
         then generates a sequence of points along the arc.
 
         Returns:
-            A list of complex numbers representing the points along the arc.
+            A complex array of the points along the arc (shared; do not modify).
         """
         if self._points_cache is not None:
             return self._points_cache
 
         c = self.circle.center
-        r = self.circle.radius
         a1 = np.angle(self.start - c)
-        a2 = np.angle(self.end - c)
-
-        # Calculate the clockwise angular difference [0, 2pi)
-        delta = (a2 - a1 + 2 * np.pi) % (2 * np.pi)
-
-        # Arc is drawn clockwise; use the smaller angular magnitude direction if needed
-        if delta > np.pi:
-            delta -= 2 * np.pi  # Result in [-2pi, 0] or [-pi, pi] if delta was > pi
-
-        # Generate points along the arc using linspace for angles
-        angles = np.linspace(a1, a1 + delta, self.steps)
-        self._points_cache = [c + r * np.exp(1j * a) for a in angles]
+        self._points_cache, _ = sample_arcs(
+            np.array([c]), np.array([self.circle.radius]), np.array([a1]),
+            np.array([self.sweep_angle]), np.array([self.steps])
+        )
         return self._points_cache
 
-    def to_svg(self, dwg: svgwrite.Drawing, color="#000000", width=1.2):
+    def to_svg(self, dwg: 'SvgStreamWriter', color="#000000", width=1.2, precision: Optional[int] = None):
         """
         Renders the arc to an SVG element.
 
         Args:
-            dwg: The svgwrite Drawing object.
+            dwg: The drawing making the element (:class:`SvgStreamWriter` or svgwrite Drawing).
             color: The stroke color of the arc.
             width: The stroke width of the arc.
+            precision: Decimal places of the coordinates (see :func:`format_svg_numbers`).
 
         Returns:
-            An svgwrite Path object representing the arc, or None if the arc is not visible.
+            The drawing's path element for the arc, or None if the arc is not visible.
         """
         if not self.visible:
             return None
         # Get the discrete points for the arc
         pts = self.get_points()
-        if not pts:
+        if not len(pts):
             return None
         # Create a path string from the points
-        path_data = ["M", f"{pts[0].real},{pts[0].imag}"] + [f"L{p.real},{p.imag}" for p in pts[1:]]
+        pts = np.asarray(pts, dtype=complex)
+        numbers = format_svg_numbers(np.column_stack((pts.real, pts.imag)), precision)
+        coordinates = list(zip(numbers[0::2], numbers[1::2]))
+        path_data = ["M", "{},{}".format(*coordinates[0])] + [f"L{x},{y}" for x, y in coordinates[1:]]
         return dwg.path(d=" ".join(path_data), fill="none", stroke=color, stroke_width=width)
 
 # ============================================
@@ -1074,24 +2739,32 @@ class ArcGroup:
     """
     _id_counter = 0
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, group_id: Optional[int] = None):
         """
         Initializes an ArcGroup.
 
         Args:
             name: An optional name for the group.
+            group_id: Explicit ID. If None, a process-wide counter hands out a fresh one.
         """
-        ArcGroup._id_counter += 1
-        self.id = ArcGroup._id_counter
+        if group_id is None:
+            ArcGroup._id_counter += 1
+            group_id = ArcGroup._id_counter
+        self.id = group_id
         self.name = name or f"arcgroup_{self.id}"
         self.arcs: List[ArcElement] = []
-        self._arc_points_cache: Dict[ArcElement, List[complex]] = {}
-        self._outline_cache: Optional[List[complex]] = None
+        self._arc_points_cache: Dict[ArcElement, Optional[np.ndarray]] = {}
+        self._outline_cache: Optional[np.ndarray] = None
+        self._outline_order_cache: Optional[Tuple[List[Tuple[int, bool]], int]] = None
         # color for debug visualization
         self.debug_fill: Optional[str] = None
         self.debug_stroke: Optional[str] = None
         # public: ring layer index within the Doyle spiral (0-based from smallest radius)
         self.ring_index: Optional[int] = None
+        # similar group this one is a scaled/rotated copy of (see set_template)
+        self.template: Optional['ArcGroup'] = None
+        self.template_transform: complex = 1 + 0j
+        self._scaled_outline_cache: Optional[Tuple[float, np.ndarray]] = None
 
     def add_arc(self, arc: ArcElement):
         """
@@ -1101,7 +2774,8 @@ class ArcGroup:
             arc: The ArcElement to add.
         """
         self.arcs.append(arc)
-        self._cache_arc_points(arc)
+        # Sampled lazily: arc output and template groups may never need the points
+        self._arc_points_cache[arc] = arc.get_cached_points()
         self._invalidate_outline_cache()
 
     def extend(self, arcs: List[ArcElement]):
@@ -1120,7 +2794,60 @@ class ArcGroup:
         """
         self.arcs.clear()
         self._arc_points_cache.clear()
-        self._outline_cache = None
+        self._invalidate_outline_cache()
+
+    def set_template(self, template: Optional['ArcGroup'], transform: complex = 1 + 0j):
+        """
+        Marks this group as the image of ``template`` under ``z -> transform * z``.
+
+        The outline is then derived from the template instead of being computed
+        again; so are line fills when ``transform`` is a pure rotation (fill
+        spacing and inset do not scale). Pass None to detach the group.
+
+        Args:
+            template: The similar group to copy from.
+            transform: Complex factor (scale and rotation about the origin)
+                mapping the template onto this group.
+        """
+        if template is None and self.template is not None:
+            # Drop sample points seeded from the old template
+            for arc in self.arcs:
+                arc._invalidate_points_cache()
+        self.template = template
+        self.template_transform = complex(transform)
+        self._invalidate_outline_cache()
+
+    def add_arc_from_template(self, arc: ArcElement):
+        """
+        Adds ``arc`` as the image of the template's arc at the same position.
+
+        Its sample points are mapped from the template arc instead of being
+        sampled again; without a matching template arc this is :meth:`add_arc`.
+        """
+        position = len(self.arcs)
+        if self.template is not None and position < len(self.template.arcs):
+            arc.set_points_from(self.template.arcs[position], self.template_transform)
+        self.add_arc(arc)
+
+    def _uses_template(self) -> bool:
+        """Whether the outline can be taken from the template (same arc structure and sampling)."""
+        return (
+            self.template is not None
+            and len(self.template.arcs) == len(self.arcs)
+            and all(arc.steps == src.steps for arc, src in zip(self.arcs, self.template.arcs))
+        )
+
+    def matches_template(self, tol: float = 1e-6) -> bool:
+        """Whether every arc is the template's corresponding arc mapped by the transform."""
+        if not self._uses_template():
+            return False
+        transform = self.template_transform
+        scale_tol = tol * max(1.0, abs(transform))
+        return all(
+            abs(arc.start - src.start * transform) <= scale_tol * max(1.0, abs(src.start))
+            and abs(arc.end - src.end * transform) <= scale_tol * max(1.0, abs(src.end))
+            for arc, src in zip(self.arcs, self.template.arcs)
+        )
 
     def is_empty(self) -> bool:
         """
@@ -1138,20 +2865,11 @@ class ArcGroup:
         Returns:
             A list of complex numbers representing all points from all arcs in the group.
         """
-        pts = []
-        for arc in self.arcs:
-            pts.extend(self._ensure_arc_points(arc))
-        return pts
-
-    def _cache_arc_points(self, arc: ArcElement) -> List[complex]:
-        """Ensure that the group's cache stores the sampled points for ``arc``."""
-        points = arc.get_cached_points()
-        if points is None:
-            points = arc.get_points()
-        self._arc_points_cache[arc] = points
-        return points
+        if not self.arcs:
+            return []
+        return np.concatenate([self._ensure_arc_points(arc) for arc in self.arcs]).tolist()
 
-    def _ensure_arc_points(self, arc: ArcElement) -> List[complex]:
+    def _ensure_arc_points(self, arc: ArcElement) -> np.ndarray:
         """Retrieve cached points for ``arc``, populating the cache when necessary."""
         cached_points = self._arc_points_cache.get(arc)
         current_points = arc.get_cached_points()
@@ -1160,15 +2878,26 @@ class ArcGroup:
 
         if cached_points is not current_points:
             self._arc_points_cache[arc] = current_points
-            self._invalidate_outline_cache()
+            if cached_points is not None:
+                self._invalidate_outline_cache()
 
         return self._arc_points_cache[arc]
 
     def _invalidate_outline_cache(self):
         """Invalidate the cached outline for the group."""
         self._outline_cache = None
-
-    def get_cached_outline(self) -> Optional[List[complex]]:
+        self._outline_order_cache = None
+        self._scaled_outline_cache = None
+
+    def get_scaled_outline(self, scale_factor: float) -> np.ndarray:
+        """Return the closed outline multiplied by ``scale_factor`` (cached; do not modify)."""
+        cached = self._scaled_outline_cache
+        if cached is None or cached[0] != scale_factor:
+            cached = (scale_factor, self.get_closed_outline() * scale_factor)
+            self._scaled_outline_cache = cached
+        return cached[1]
+
+    def get_cached_outline(self) -> Optional[np.ndarray]:
         """Return the cached outline if it has been computed."""
         return self._outline_cache
 
@@ -1187,88 +2916,114 @@ class ArcGroup:
         return abs(a - b) <= tol
 
 
-    def _try_attach_arc(self, ordered_pts, pts, tol):
-        """Try to attach arc points to the ordered outline.
+    def _try_attach_arc(self, head, tail, start, end, tol):
+        """Try to attach an arc with endpoints ``start``/``end`` to the outline ``head`` ... ``tail``.
         
         Returns:
-            Modified ordered_pts if attachment successful, None otherwise.
+            ``(append, reversed)`` if an endpoint matches, None otherwise.
         """
-        start_existing = ordered_pts[0]
-        end_existing = ordered_pts[-1]
-        start_arc = pts[0]
-        end_arc = pts[-1]
-        
         # Try appending arc (original direction)
-        if self._match_points(end_existing, start_arc, tol):
-            return ordered_pts + pts[1:]
+        if self._match_points(tail, start, tol):
+            return True, False
         
         # Try appending arc (reversed)
-        if self._match_points(end_existing, end_arc, tol):
-            return ordered_pts + list(reversed(pts))[1:]
+        if self._match_points(tail, end, tol):
+            return True, True
         
         # Try prepending arc (original direction)
-        if self._match_points(start_existing, end_arc, tol):
-            return pts[:-1] + ordered_pts
+        if self._match_points(head, end, tol):
+            return False, False
         
         # Try prepending arc (reversed)
-        if self._match_points(start_existing, start_arc, tol):
-            return list(reversed(pts))[:-1] + ordered_pts
+        if self._match_points(head, start, tol):
+            return False, True
         
         return None
     
-    def _attach_by_proximity(self, ordered_pts, pts):
-        """Attach arc to outline by nearest endpoint."""
+    def _attach_by_proximity(self, head, tail, start, end):
+        """Attach arc to outline by nearest endpoint; returns ``(append, reversed)``."""
         # Calculate distances to front and back of outline
-        d_front = min(abs(pts[0] - ordered_pts[0]), abs(pts[-1] - ordered_pts[0]))
-        d_back = min(abs(pts[0] - ordered_pts[-1]), abs(pts[-1] - ordered_pts[-1]))
-        
-        if d_front < d_back:
+        d_front = min(abs(start - head), abs(end - head))
+        d_back = min(abs(start - tail), abs(end - tail))
+
+        # Mirror-image distances tie; they keep the back and the arc's own direction
+        def farther(a: float, b: float) -> bool:
+            return a > b + _TIE_RTOL * max(a, b)
+
+        if farther(d_back, d_front):
             # Attach to front
-            if abs(pts[-1] - ordered_pts[0]) <= abs(pts[0] - ordered_pts[0]):
-                return pts[:-1] + ordered_pts
-            else:
-                return list(reversed(pts))[:-1] + ordered_pts
-        else:
-            # Attach to back
-            if abs(pts[0] - ordered_pts[-1]) <= abs(pts[-1] - ordered_pts[-1]):
-                return ordered_pts + pts[1:]
-            else:
-                return ordered_pts + list(reversed(pts))[1:]
-    
-    def get_closed_outline(self, tol: float = 1e-3) -> List[complex]:
-        """Order arcs into a closed outline.
-        
-        Attempts to chain arcs by matching endpoints, reversing when needed.
-        Falls back to proximity-based attachment for remaining arcs.
+            return False, farther(abs(end - head), abs(start - head))
+        # Attach to back
+        return True, farther(abs(start - tail), abs(end - tail))
+
+    @staticmethod
+    def _snap(point: complex, cell: float) -> Tuple[int, int]:
+        """Grid cell of ``point`` for cells of size ``cell``."""
+        return math.floor(point.real / cell), math.floor(point.imag / cell)
+
+    def _get_outline_order(self, tol: float = 1e-3) -> Tuple[List[Tuple[int, bool]], int]:
+        """Chain the arcs by their endpoints, without sampling them.
+
+        Endpoints are snapped to a grid of ``tol``-sized cells, so each step only
+        tests the arcs ending next to the outline's head or tail. Like a linear
+        scan, it attaches the first matching arc in longest-first order.
         
         Returns:
-            List of points forming the outline (closed if endpoints match).
+            ``(order, anchor)``: ``(arc index, reversed)`` pairs in outline order
+            and the position of the arc the chain was grown from.
         """
-        if self._outline_cache is not None:
-            return list(self._outline_cache)
-
-        if not self.arcs:
-            return []
+        if self._outline_order_cache is not None:
+            return self._outline_order_cache
+
+        if self._uses_template():
+            self._outline_order_cache = self.template._get_outline_order(tol)
+            return self._outline_order_cache
+
+        # Longest arc first
+        entries = sorted(range(len(self.arcs)), key=lambda i: -self.arcs[i].steps)
+        first = self.arcs[entries[0]]
+        front: List[Tuple[int, bool]] = []
+        back: List[Tuple[int, bool]] = [(entries[0], False)]
+        head, tail = first.start, first.end
+        used = {0}
 
-        # Prepare arc entries sorted by point count (longest first)
-        entries = [(arc, self._ensure_arc_points(arc)) for arc in self.arcs]
-        entries.sort(key=lambda e: -len(e[1]))
+        # Snapped endpoint -> positions in entries
+        cell = tol if tol > 0 else 1.0
+        endpoint_cells: Dict[Tuple[int, int], List[int]] = {}
+        for idx, arc_index in enumerate(entries[1:], start=1):
+            arc = self.arcs[arc_index]
+            for point in (arc.start, arc.end):
+                endpoint_cells.setdefault(self._snap(point, cell), []).append(idx)
+
+        def candidates():
+            found = set()
+            for point in (head, tail):
+                cx, cy = self._snap(point, cell)
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        found.update(endpoint_cells.get((cx + dx, cy + dy), ()))
+            return sorted(found - used)
+
+        def attach(idx, append, reversed_arc):
+            nonlocal head, tail
+            arc = self.arcs[entries[idx]]
+            start, end = (arc.end, arc.start) if reversed_arc else (arc.start, arc.end)
+            if append:
+                back.append((entries[idx], reversed_arc))
+                tail = end
+            else:
+                front.append((entries[idx], reversed_arc))
+                head = start
+            used.add(idx)
 
-        # Start with longest arc
-        ordered_pts = entries[0][1].copy()
-        used = {0}
-        
         # Greedily attach arcs that match endpoints
         while True:
             attached_any = False
-            for idx, (arc, pts) in enumerate(entries):
-                if idx in used:
-                    continue
-                
-                result = self._try_attach_arc(ordered_pts, pts, tol)
+            for idx in candidates():
+                arc = self.arcs[entries[idx]]
+                result = self._try_attach_arc(head, tail, arc.start, arc.end, tol)
                 if result is not None:
-                    ordered_pts = result
-                    used.add(idx)
+                    attach(idx, *result)
                     attached_any = True
                     break
             
@@ -1276,18 +3031,77 @@ class ArcGroup:
                 break
         
         # Attach remaining arcs by proximity
-        for idx in range(len(entries)):
+        for idx, arc_index in enumerate(entries):
             if idx not in used:
-                ordered_pts = self._attach_by_proximity(ordered_pts, entries[idx][1])
+                arc = self.arcs[arc_index]
+                attach(idx, *self._attach_by_proximity(head, tail, arc.start, arc.end))
+
+        self._outline_order_cache = (front[::-1] + back, len(front))
+        return self._outline_order_cache
+
+    def get_outline_arcs(self, tol: float = 1e-3) -> List[Tuple[ArcElement, bool]]:
+        """Return the arcs in outline order as ``(arc, reversed)`` pairs.
+
+        Each arc (traversed end to start when ``reversed``) begins where the
+        previous one ends, so the outline can be written without sampling.
+        """
+        if not self.arcs:
+            return []
+        order, _ = self._get_outline_order(tol)
+        return [(self.arcs[i], reversed_arc) for i, reversed_arc in order]
+
+    def get_closed_outline(self, tol: float = 1e-3) -> np.ndarray:
+        """Order arcs into a closed outline.
+        
+        Attempts to chain arcs by matching endpoints, reversing when needed.
+        Falls back to proximity-based attachment for remaining arcs.
+        :meth:`DoyleSpiral.build_group_outlines` fills this cache for all
+        groups at once.
+        
+        Returns:
+            Complex array of the outline points (closed if endpoints match).
+            The array is cached and shared; do not modify it.
+        """
+        if self._outline_cache is not None:
+            return self._outline_cache
+
+        if not self.arcs:
+            return np.zeros(0, dtype=complex)
+
+        if self._uses_template():
+            self._outline_cache = self.template.get_closed_outline(tol) * self.template_transform
+            return self._outline_cache
+
+        order, anchor = self._get_outline_order(tol)
+        pieces = []
+        for position, (arc_index, reversed_arc) in enumerate(order):
+            pts = self._ensure_arc_points(self.arcs[arc_index])
+            if reversed_arc:
+                pts = pts[::-1]
+            # Arcs joined before the anchor drop their last point, later ones their first
+            if position < anchor:
+                pieces.append(pts[:-1])
+            elif position == anchor:
+                pieces.append(pts)
+            else:
+                pieces.append(pts[1:])
+
+        # Walk the chain once into a preallocated buffer
+        ordered = np.empty(sum(len(piece) for piece in pieces), dtype=complex)
+        offset = 0
+        for piece in pieces:
+            ordered[offset:offset + len(piece)] = piece
+            offset += len(piece)
         
         # Close the outline if endpoints match
-        if ordered_pts and abs(ordered_pts[0] - ordered_pts[-1]) <= tol:
-            ordered_pts[-1] = ordered_pts[0]
+        if len(ordered) and abs(ordered[0] - ordered[-1]) <= tol:
+            ordered[-1] = ordered[0]
         
-        self._outline_cache = ordered_pts.copy()
-        return ordered_pts
+        self._outline_cache = ordered
+        return self._outline_cache
 
-    def to_svg_fill(self, context: DrawingContext, debug: bool = False, fill_opacity: float = 0.25, pattern_fill: bool = False, line_settings = (2,0), use_clipped_lines: bool = True, draw_outline: bool = True, line_offset: float = 0):
+    def to_svg_fill(self, context: DrawingContext, debug: bool = False, fill_opacity: float = 0.25, pattern_fill: bool = False, line_settings = (2,0), use_clipped_lines: bool = True, draw_outline: bool = True, line_offset: float = 0,
+                    line_segments: Optional[np.ndarray] = None):
         """
         Render group outline as filled polygon if closed (or as polyline) for debug.
 
@@ -1302,28 +3116,73 @@ class ArcGroup:
             use_clipped_lines: If True, use actual clipped lines instead of SVG patterns (default: True).
             draw_outline: If True, draw the polygon outline (default: True).
             line_offset: Inset distance from polygon edge for line clipping (positive = shrink inward).
+            line_segments: Precomputed line fill (see :meth:`DrawingContext.line_fill_segments`).
         """
+        # Arc output writes the outline from the arcs; points are only sampled for line fills
+        arcs = self.get_outline_arcs() if context.arc_output == "arc" else None
         # Get the points for the outline
-        pts = self.get_closed_outline()
-        if not pts:
+        pts = self.get_closed_outline() if arcs is None or pattern_fill else np.zeros(0, dtype=complex)
+        if not len(pts) and not arcs:
             return
         # scale points using the drawing context's scale factor
-        scaled = [p * context.scale_factor for p in pts]
+        scaled = pts * context.scale_factor
         if debug:
             # Generate a random color if debug colors are not set
             fill = self.debug_fill or "#%06x" % random.randint(0, 0xFFFFFF)
             stroke = self.debug_stroke or "#000000"
             # set fill and stroke and draw as a polygon
-            context.draw_group_outline(scaled, fill=fill, stroke=stroke, stroke_width=0.8)
+            context.draw_group_outline(scaled, fill=fill, stroke=stroke, stroke_width=0.8, arcs=arcs)
         elif pattern_fill:
             stroke = self.debug_stroke or "#000000"
+            template = None
+            # Fills are only shared under pure rotation
+            if line_segments is None and self._uses_template() and abs(abs(self.template_transform) - 1.0) <= 1e-9:
+                template = (self.template.get_scaled_outline(context.scale_factor), self.template_transform)
             context.draw_group_outline(scaled, fill="pattern", stroke=stroke, stroke_width=0.8, 
                                       line_pattern_settings=line_settings, use_clipped_lines=use_clipped_lines,
-                                      draw_outline=draw_outline, line_offset=line_offset)
+                                      draw_outline=draw_outline, line_offset=line_offset, template=template,
+                                      arcs=arcs, line_segments=line_segments)
         else:
             # Only draw outline if draw_outline is explicitly True when pattern_fill is False
             if draw_outline:
-                context.draw_group_outline(scaled, fill=None, stroke="#000000", stroke_width=0.6)
+                context.draw_group_outline(scaled, fill=None, stroke="#000000", stroke_width=0.6, arcs=arcs)
+
+class OutlineSet:
+    """
+    Closed outlines of many arc groups as one ragged array.
+
+    Outline ``i`` belongs to the group ``keys[i]`` and is the view
+    ``vertices[offsets[i]:offsets[i + 1]]`` (see :meth:`DoyleSpiral.build_group_outlines`).
+    """
+    def __init__(self, keys: List[str], vertices: np.ndarray, offsets: np.ndarray):
+        """
+        Initializes an OutlineSet.
+
+        Args:
+            keys: Group keys, one per outline.
+            vertices: Complex vertices of all outlines back to back.
+            offsets: ``len(keys) + 1`` start offsets into ``vertices``.
+        """
+        self.keys = list(keys)
+        self.vertices = vertices
+        self.offsets = offsets
+        self._index = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """The outline of group ``key`` as a view into :attr:`vertices`."""
+        i = self._index[key]
+        return self.vertices[self.offsets[i]:self.offsets[i + 1]]
+
+    def xy_lists(self) -> Dict[str, List[List[float]]]:
+        """Every outline as ``[[x, y], ...]`` lists, converted in one pass."""
+        xy = np.column_stack((self.vertices.real, self.vertices.imag)).tolist()
+        return {key: xy[self.offsets[i]:self.offsets[i + 1]] for i, key in enumerate(self.keys)}
 
 # ============================================
 # Doyle Spiral Class
@@ -1331,7 +3190,11 @@ class ArcGroup:
 
 class DoyleSpiral:
     """Manages the generation, intersection, and rendering of a Doyle spiral."""
-    def __init__(self, p: int = 7, q: int = 32, t: float = 0, max_d: float = 2000, arc_mode: str = "closest", num_gaps: int = 2):
+    # Tolerance (in lattice steps) for circles that sit exactly on max_d or min_d
+    _STEP_EPS = 1e-9
+
+    def __init__(self, p: int = 7, q: int = 32, t: float = 0, max_d: float = 2000, arc_mode: str = "closest", num_gaps: int = 2,
+                 line_fill_cache: Optional[LineFillCache] = None):
         """
         Initializes a DoyleSpiral.
 
@@ -1342,110 +3205,217 @@ class DoyleSpiral:
             max_d: The maximum distance from the center for generating circles.
             arc_mode: The mode for selecting arcs ('closest', 'farthest', 'alternating', 'all', 'random', 'symmetric', 'angular').
             num_gaps: The number of "gaps" or arcs not to draw in 'arram_boyle' mode.
+            line_fill_cache: Cache of clipped line fills; the process-wide
+                :func:`default_line_fill_cache` if None.
         """
         self.p, self.q, self.t, self.max_d = p, q, t, max_d
         self.arc_mode = arc_mode
         self.num_gaps = num_gaps
         # Solve the underlying Doyle system for the given parameters
         self.root = DoyleMath.solve(p, q)
-        self.circles: List[CircleElement] = []
-        self.outer_circles: List[CircleElement] = []
+        self._root_key = (p, q)
+        # Columnar geometry; CircleElement lists are materialized from these on demand
+        self.circle_set = CircleSet([], [])
+        self.outer_circle_set = CircleSet([], [])
+        # Visible and outer circles stacked, with intersections (see compute_all_intersections)
+        self.intersection_set: Optional[CircleSet] = None
+        self._circles: Optional[List[CircleElement]] = None
+        self._outer_circles: Optional[List[CircleElement]] = None
         self._is_generated = False
 
         # ArcGroups keyed by circle id or arbitrary name
         self.arc_groups: Dict[str, ArcGroup] = {}
+        # Outlines of all arc groups (see build_group_outlines)
+        self.group_outlines: Optional[OutlineSet] = None
         self.fill_pattern_angle: float = 0.0
+        # Arcs drawn on their own, in creation order: (arc, from an outer circle)
+        self._primary_arcs: List[Tuple[ArcElement, bool]] = []
+        # Parameters each cached stage was computed with ("circles", "intersections", "arc_groups")
+        self._stage_keys: Dict[str, Any] = {}
+        # Clipped line fills, kept across renders (None: the process-wide cache)
+        self._line_fill_cache = line_fill_cache
+
+    @property
+    def circles(self) -> List[CircleElement]:
+        """Visible circles as CircleElement objects, materialized from :attr:`circle_set`."""
+        if self._circles is None:
+            self._materialize_elements()
+        return self._circles
+
+    @circles.setter
+    def circles(self, elements: List[CircleElement]):
+        self._circles = list(elements)
+        self.circle_set = CircleSet.from_elements(self._circles)
+        self.intersection_set = None
+
+    @property
+    def outer_circles(self) -> List[CircleElement]:
+        """Outer closure circles as CircleElement objects, materialized from :attr:`outer_circle_set`."""
+        if self._outer_circles is None:
+            self._materialize_elements()
+        return self._outer_circles
+
+    @outer_circles.setter
+    def outer_circles(self, elements: List[CircleElement]):
+        self._outer_circles = list(elements)
+        self.outer_circle_set = CircleSet.from_elements(self._outer_circles)
+        self.intersection_set = None
+
+    def _materialize_elements(self):
+        """Create CircleElement views of the circle sets, sharing intersections when computed."""
+        if self.intersection_set is not None and self._circles is None and self._outer_circles is None:
+            elements = self.intersection_set.to_elements()
+            split = len(self.circle_set)
+            self._circles, self._outer_circles = elements[:split], elements[split:]
+            return
+        if self._circles is None:
+            self._circles = self.circle_set.to_elements()
+        if self._outer_circles is None:
+            self._outer_circles = self.outer_circle_set.to_elements(first_id=len(self.circle_set) + 1)
+
+    def _lattice_frame(self) -> Tuple[np.ndarray, float, float, complex]:
+        """Return the family seeds ``a·b^f``, |a|, the t-scale and the t-rotation."""
+        a, b = self.root["a"], self.root["b"]
+        seeds = a * b ** np.arange(self.q)
+        scale = self.root["mod_a"] ** self.t
+        w = np.exp(1j * self.root["arg_a"] * self.t)
+        return seeds, abs(a), scale, w
+
+    def _lattice_circles(self, families: np.ndarray, steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Centers and radii of the lattice circles ``(families[i], steps[i])``.
+
+        Visible and outer circles both come from this one expression, so an outer
+        circle repeating a visible circle's index is bit-identical to it and
+        their shared tangent points merge when intersections are deduplicated.
+        """
+        seeds, _, scale, w = self._lattice_frame()
+        qv = seeds[families] * self.root["a"] ** steps
+        return scale * qv * w, self.root["r"] * scale * np.abs(qv)
+
+    def _circle_lattice(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes every visible circle of the spiral as array expressions.
+
+        Circle ``k`` of family ``f`` is centered at ``a**k * a * b**f`` (scaled and
+        rotated by ``t``). The number of steps outward (``|.| < max_d``) and
+        inward (``|.| > 1/scale``) follows in closed form from ``log(|a|)``.
+
+        Returns:
+            Tuple of arrays ``(centers, radii, families, steps)`` ordered like the
+            original per-family walk: each family outward from its seed, then inward.
+        """
+        seeds, mod_a, scale, _ = self._lattice_frame()
+        min_d = 1 / scale
+        mod_seeds = np.abs(seeds)
+        log_a = math.log(mod_a)
+
+        # k >= 0 while |seed|·|a|^k < max_d; m >= 1 while |seed|/|a|^m > min_d.
+        # Circles lying exactly on a bound (common when p == q) stay excluded
+        # instead of flipping with rounding noise.
+        n_out = np.maximum(np.ceil(np.log(self.max_d / mod_seeds) / log_a - self._STEP_EPS), 0).astype(int)
+        n_in = np.maximum(np.ceil(np.log(mod_seeds / min_d) / log_a - self._STEP_EPS) - 1, 0).astype(int)
+
+        counts = n_out + n_in
+        families = np.repeat(np.arange(self.q), counts)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        pos = np.arange(families.size) - np.repeat(offsets, counts)
+        outward = n_out[families]
+        steps = np.where(pos < outward, pos, outward - 1 - pos)
+
+        centers, radii = self._lattice_circles(families, steps)
+        return centers, radii, families, steps
+
+    def generate_circles(self):
+        """Generates the main set of visible circles based on the spiral parameters."""
+        if self._root_key != (self.p, self.q):
+            self.root = DoyleMath.solve(self.p, self.q)
+            self._root_key = (self.p, self.q)
+        centers, radii, families, steps = self._circle_lattice()
+        self.circle_set = CircleSet(centers, radii, families, steps)
+        self.intersection_set = None
+        self._circles = None
+        self._is_generated = True
+        self._stage_keys = {"circles": (self.p, self.q, self.t, self.max_d)}
+
+    def _ensure_circles(self):
+        """Generate the circles unless they are current for ``p``, ``q``, ``t`` and ``max_d``."""
+        if not self._is_generated or self._stage_keys.get("circles") != (self.p, self.q, self.t, self.max_d):
+            self.generate_circles()
+
+    def generate_outer_circles(self):
+        """Generates exactly one outer ring of invisible circles for Arram-Boyle closure."""
+        seeds, mod_a, scale, _ = self._lattice_frame()
+        families = np.arange(self.q)
+        # First step of each family whose scaled distance reaches max_d
+        steps = np.maximum(
+            np.ceil(np.log(self.max_d / (scale * np.abs(seeds))) / math.log(mod_a) - self._STEP_EPS), 0
+        ).astype(int)
+        # Use a generous multiplier for max_d check to ensure we get the next ring
+        keep = np.abs(seeds) * mod_a ** steps * scale < self.max_d * mod_a * 2
+        centers, radii = self._lattice_circles(families[keep], steps[keep])
+
+        self.outer_circle_set = CircleSet(centers, radii, families[keep], steps[keep], visible=False)
+        self.intersection_set = None
+        self._outer_circles = None
+        self._stage_keys.pop("intersections", None)
+        self._stage_keys.pop("arc_groups", None)
+
+    def compute_all_intersections(self, topology: str = "lattice"):
+        """
+        Computes all intersections for visible and outer circles.
+
+        Args:
+            topology: 'lattice' derives neighbours from the circles' (family, step)
+                indices and only searches spatially at the boundary; 'kdtree'
+                searches every circle with a KD-tree.
+
+        Raises:
+            ValueError: If an unknown topology is provided.
+        """
+        if topology not in ("lattice", "kdtree"):
+            raise ValueError(f"Unknown topology: {topology}")
+
+        circle_set = CircleSet.concatenate([self.circle_set, self.outer_circle_set])
+        # All circles need the spiral center (0+0j) as the reference for sorting
+        circle_set.compute_intersections(
+            start_reference=0+0j,
+            tol=1e-3,
+            lattice=(self.p, self.q) if topology == "lattice" else None,
+        )
+        self.intersection_set = circle_set
+        self._stage_keys["intersections"] = self._stage_keys.get("circles")
+        self._stage_keys.pop("arc_groups", None)
 
-    def generate_circles(self):
-        """Generates the main set of visible circles based on the spiral parameters."""
-        # Extract parameters from the Doyle solution
-        r = self.root["r"]
-        start = self.root["a"]
-        scale = self.root["mod_a"] ** self.t
-        alpha = self.root["arg_a"] * self.t
-        min_d = 1 / scale
-        a, b = self.root["a"], self.root["b"]
-        w = np.exp(1j * alpha)
-
-        circles = []
-        # Generate q families of circles
-        for _ in range(1, self.q + 1):
-            # Generate circles moving outward from the center
-            qv = start
-            mod_q = abs(qv)
-            while mod_q < self.max_d:
-                center = scale * qv * w
-                circles.append(CircleElement(center, r * scale * mod_q))
-                qv *= a
-                mod_q *= abs(a)
-
-            # Generate circles moving inward towards the center
-            qv = start / a # Start one step inward from the base
-            mod_q = abs(qv)
-            while mod_q > min_d:
-                center = scale * qv * w
-                circles.append(CircleElement(center, r * scale * mod_q))
-                qv /= a
-                mod_q /= abs(a)
-
-            # Move to the next family of circles
-            start *= b
-
-        self.circles = circles
-        self._is_generated = True
+        # Refresh element views that already exist; otherwise they pick the data up lazily
+        if self._circles is not None or self._outer_circles is not None:
+            circle_set.apply_to_elements(self.circles + self.outer_circles)
 
-    def generate_outer_circles(self):
-        """Generates exactly one outer ring of invisible circles for Arram-Boyle closure."""
-        r = self.root["r"]
-        start = self.root["a"]
-        scale = self.root["mod_a"] ** self.t
-        alpha = self.root["arg_a"] * self.t
-        a, b = self.root["a"], self.root["b"]
-        w = np.exp(1j * alpha)
-
-        outer_circles = []
-        # Generate one outer circle for each of the q families
-        for _ in range(1, self.q + 1):
-            qv = start
-            # Fast-forward to the last generated visible circle's 'qv'
-            while abs(qv) * scale < self.max_d:
-                qv *= a
-
-            # Add exactly one more circle (the next one outward)
-            center = scale * qv * w
-            # Use a generous multiplier for max_d check to ensure we get the next ring
-            if abs(qv) * scale < self.max_d * abs(a) * 2:
-                outer_circles.append(CircleElement(center, r * scale * abs(qv), visible=False))
-
-            start *= b
-
-        self.outer_circles = outer_circles
-
-    def compute_all_intersections(self):
-        """Computes all intersections for visible and outer circles."""
-        all_circles = self.circles + self.outer_circles
-        if not all_circles:
-            return
+    def validate_topology(self, tol: float = 1e-6) -> List[int]:
+        """
+        Cross-checks the lattice topology against a full KD-tree search.
 
-        centers = np.array([[c.center.real, c.center.imag] for c in all_circles], dtype=float)
-        radii = np.array([c.radius for c in all_circles], dtype=float)
-        tree = cKDTree(centers)
-        max_radius = float(radii.max())
-        tol = 1e-3
-
-        for idx, circle in enumerate(all_circles):
-            query_radius = circle.radius + max_radius + tol
-            candidate_indices = tree.query_ball_point(centers[idx], query_radius)
-            candidates = []
-            for j in candidate_indices:
-                if j == idx:
-                    continue
-                other = all_circles[j]
-                if abs(circle.center - other.center) <= circle.radius + other.radius + tol:
-                    candidates.append(other)
+        Requires :meth:`compute_all_intersections` to have run. The stored
+        intersections are left untouched.
 
-            # All circles need the spiral center (0+0j) as the reference for sorting
-            circle.compute_intersections(candidates, start_reference=0+0j, tol=tol)
+        Returns:
+            Indices into :attr:`intersection_set` whose intersections differ.
+        """
+        if self.intersection_set is None:
+            raise RuntimeError("No intersections to validate. Run compute_all_intersections() first.")
+
+        lattice_set = self.intersection_set
+        reference = CircleSet.concatenate([self.circle_set, self.outer_circle_set])
+        reference.compute_intersections(start_reference=0+0j, tol=1e-3)
+
+        mismatched = []
+        for idx in range(len(reference)):
+            pts_a, others_a = lattice_set.intersections_of(idx)
+            pts_b, others_b = reference.intersections_of(idx)
+            if (len(pts_a) != len(pts_b) or not np.array_equal(others_a, others_b)
+                    or not np.allclose(pts_a, pts_b, rtol=0, atol=tol)):
+                mismatched.append(idx)
+        return mismatched
 
     # ---- ArcGroup management APIs ----
     def create_group_for_circle(self, circle: CircleElement, name: Optional[str] = None) -> ArcGroup:
@@ -1460,9 +3430,7 @@ class DoyleSpiral:
             The created ArcGroup object.
         """
         key = name or f"circle_{circle.id}"
-        group = ArcGroup(name=key)
-        self.arc_groups[key] = group
-        return group
+        return self._new_group(key)
 
     def add_arc_to_group(self, group_key: str, arc: ArcElement):
         """
@@ -1473,9 +3441,15 @@ class DoyleSpiral:
             arc: The ArcElement to add to the group.
         """
         if group_key not in self.arc_groups:
-            self.arc_groups[group_key] = ArcGroup(name=group_key)
+            self._new_group(group_key)
         self.arc_groups[group_key].add_arc(arc)
 
+    def _new_group(self, key: str) -> ArcGroup:
+        """Registers an empty ArcGroup under ``key``, numbered by creation order within this spiral."""
+        group = ArcGroup(name=key, group_id=len(self.arc_groups) + 1)
+        self.arc_groups[key] = group
+        return group
+
     # ---- Rendering Helpers ----
     
     def _compute_ring_indices(self):
@@ -1484,161 +3458,371 @@ class DoyleSpiral:
         unique_radii = sorted(set(radii))
         return {r: i for i, r in enumerate(unique_radii)}
     
-    def _create_arc_groups_for_circles(self, radius_to_ring, spiral_center, debug_groups, 
-                                       add_fill_pattern, draw_group_outline, context):
-        """Create arc groups for visible circles and draw individual arcs."""
-        for c in self.circles:
-            if len(c.intersections) != 6:
+    def _add_circle_group(self, c, arcs_to_draw, radius_to_ring, context,
+                          template: Optional[ArcGroup] = None, transform: complex = 1 + 0j) -> ArcGroup:
+        """Create the arc group of circle ``c`` from the selected intersection index pairs."""
+        group = self.create_group_for_circle(c)
+        group.ring_index = radius_to_ring.get(round(c.radius, 6), None)
+        if template is not None:
+            group.set_template(template, transform)
+
+        # Debug colors are fixed per circle, so groups can be reused with or without debug rendering
+        rng = random.Random(c.id)
+        group.debug_fill = "#%06x" % rng.randint(0, 0xFFFFFF)
+        group.debug_stroke = "#000000"
+
+        # Create and add arcs to group
+        for i, j in arcs_to_draw:
+            start = c.intersections[i][0]
+            end = c.intersections[j][0]
+            arc = ArcElement(c, start, end, steps=context.arc_steps(c, start, end), visible=True)
+            if group.template is not None:
+                group.add_arc_from_template(arc)
+            else:
+                group.add_arc(arc)
+            self._primary_arcs.append((arc, False))
+        return group
+
+    def _create_arc_groups_for_circles(self, radius_to_ring, spiral_center, context):
+        """Create arc groups for visible circles."""
+        # Visible circles lead the intersection set, so element i is set index i
+        counts = self.intersection_set.intersection_counts()
+        for index, c in enumerate(self.circles):
+            if counts[index] != 6:
                 continue
             
             # Select arcs based on mode
-            arcs_to_draw = ArcSelector.select_arcs_for_gaps(
-                c, spiral_center, num_gaps=self.num_gaps, mode=self.arc_mode
+            arcs_to_draw = ArcSelector.select_arcs_in_set(
+                self.intersection_set, index, spiral_center, num_gaps=self.num_gaps, mode=self.arc_mode
             )
             if not arcs_to_draw:
                 continue
             
-            # Create group for this circle
-            group = self.create_group_for_circle(c)
-            group.ring_index = radius_to_ring.get(round(c.radius, 6), None)
-            
-            # Assign debug color if needed
-            if debug_groups:
-                rng = random.Random(c.id)
-                group.debug_fill = "#%06x" % rng.randint(0, 0xFFFFFF)
-                group.debug_stroke = "#000000"
-            
-            # Create and add arcs to group
-            for i, j in arcs_to_draw:
-                start = c.intersections[i][0]
-                end = c.intersections[j][0]
-                arc = ArcElement(c, start, end, visible=True)
-                
-                # Draw arc only if not using fill pattern and outline enabled
-                if not add_fill_pattern and draw_group_outline:
-                    context.draw_scaled(arc)
-                
-                group.add_arc(arc)
+            self._add_circle_group(c, arcs_to_draw, radius_to_ring, context)
+
+    @staticmethod
+    def _local_topology_key(c: CircleElement) -> Tuple[Tuple[Tuple[float, float], ...], ...]:
+        """
+        Similarity-invariant signature of a circle's neighbourhood.
+
+        Covers the intersections of the circle and of its neighbours (which
+        contribute arcs to its group), divided by the circle center so the key
+        is unchanged by any ``z -> lambda * z``. Interior circles of a spiral
+        share one key; circles near the border get their own.
+        """
+        def normalized(circle: CircleElement) -> Tuple[Tuple[float, float], ...]:
+            return tuple((round(w.real, 6), round(w.imag, 6)) for w in (p / c.center for p, _ in circle.intersections))
+
+        return (normalized(c),) + tuple(normalized(n) for n in c.get_neighbour_circles())
+
+    def _create_arc_groups_from_templates(self, radius_to_ring, spiral_center, context):
+        """Create arc groups, selecting arcs once per local topology.
+
+        Every circle is ``lambda * c0`` for its family seed ``c0`` (``lambda = a**k * b**f``),
+        and arc selection only depends on geometry relative to the spiral center,
+        so circles with the same :meth:`_local_topology_key` share their selection.
+        The first such circle is the template; the others take their outline from
+        it (see :meth:`ArcGroup.set_template`). Within a ring the transform is a
+        pure rotation (p == q), so there the first circle of the ring serves as
+        template and line fills are shared as well.
+
+        When p == q, each ring is mapped onto itself by rotations, so circles are
+        keyed by their ring rather than by :meth:`_local_topology_key`, whose
+        rounded coordinates could split one ring across several keys.
+        """
+        # key -> (template circle, its arcs); (key, ring) -> first circle of that ring
+        templates: Dict[Any, Tuple[CircleElement, List[Tuple[int, int]]]] = {}
+        ring_templates: Dict[Any, CircleElement] = {}
+        groups: Dict[CircleElement, ArcGroup] = {}
+        counts = self.intersection_set.intersection_counts()
+        for index, c in enumerate(self.circles):
+            if counts[index] != 6:
+                continue
+
+            if self.p == self.q:
+                key = ("ring", radius_to_ring.get(round(c.radius, 6)))
+            else:
+                key = self._local_topology_key(c)
+            if key not in templates:
+                templates[key] = (c, ArcSelector.select_arcs_in_set(
+                    self.intersection_set, index, spiral_center, num_gaps=self.num_gaps, mode=self.arc_mode
+                ))
+            template, arcs_to_draw = templates[key]
+            if not arcs_to_draw:
+                continue
+
+            ring_key = (key, radius_to_ring.get(round(c.radius, 6)))
+            source = ring_templates.setdefault(ring_key, c)
+            if source is c and template is not c:
+                source = template
+            source_group = groups.get(source) if source is not c else None
+
+            groups[c] = self._add_circle_group(
+                c, arcs_to_draw, radius_to_ring, context, template=source_group, transform=c.center / source.center,
+            )
+
+    def _verify_arc_group_templates(self):
+        """Detach groups whose arcs no longer map onto their template's (e.g. at the spiral border)."""
+        for group in self.arc_groups.values():
+            if group.template is not None and not group.matches_template():
+                group.set_template(None)
     
-    def _draw_outer_closure_arcs(self, spiral_center, debug_groups, red_outline, 
-                                 add_fill_pattern, draw_group_outline, context):
-        """Draw closure arcs from outer invisible circles."""
+    def _sample_arc_points(self):
+        """Sample every not yet sampled arc of the arc groups with one :func:`sample_arcs` call."""
+        arcs: Dict[int, ArcElement] = {}
+        for group in self.arc_groups.values():
+            for arc in group.arcs:
+                if arc.get_cached_points() is None:
+                    arcs.setdefault(id(arc), arc)
+        if not arcs:
+            return
+        arcs = list(arcs.values())
+        centers = np.array([arc.circle.center for arc in arcs], dtype=complex)
+        starts = np.array([arc.start for arc in arcs], dtype=complex)
+        ends = np.array([arc.end for arc in arcs], dtype=complex)
+        start_angles = np.angle(starts - centers)
+        # Same clockwise difference as arc_sweep_angle, folded into (-pi, pi]
+        sweeps = (np.angle(ends - centers) - start_angles + 2 * np.pi) % (2 * np.pi)
+        sweeps[sweeps > np.pi] -= 2 * np.pi
+        points, offsets = sample_arcs(
+            centers,
+            np.array([arc.circle.radius for arc in arcs]),
+            start_angles,
+            sweeps,
+            np.array([arc.steps for arc in arcs]),
+        )
+        for arc, begin, end in zip(arcs, offsets[:-1], offsets[1:]):
+            arc.set_points(points[begin:end])
+
+    def build_group_outlines(self, tol: float = 1e-3) -> OutlineSet:
+        """
+        Builds the closed outline of every arc group in one pass.
+
+        Each group only contributes its arc order (see :meth:`ArcGroup.get_outline_arcs`);
+        the vertices of all outlines are then gathered from one table of every
+        arc's samples with a single index array. Every group's outline cache is
+        set to its view of the result, which is also kept in :attr:`group_outlines`.
+
+        Args:
+            tol: Endpoint tolerance for chaining and closing outlines.
+
+        Returns:
+            The outlines keyed by group key.
+        """
+        self._sample_arc_points()
+        rows: Dict[int, int] = {}
+        table: List[np.ndarray] = []
+        piece_rows, piece_reversed, piece_drop, group_pieces = [], [], [], []
+        for group in self.arc_groups.values():
+            order, anchor = group._get_outline_order(tol) if group.arcs else ([], 0)
+            for position, (arc_index, reversed_arc) in enumerate(order):
+                arc = group.arcs[arc_index]
+                row = rows.get(id(arc))
+                if row is None:
+                    row = rows[id(arc)] = len(table)
+                    table.append(arc.get_points())
+                piece_rows.append(row)
+                piece_reversed.append(reversed_arc)
+                # Arcs joined before the anchor drop their last point (-1), later ones their first (1)
+                piece_drop.append(-1 if position < anchor else int(position > anchor))
+            group_pieces.append(len(order))
+
+        keys = list(self.arc_groups.keys())
+        group_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        if not piece_rows:
+            self.group_outlines = OutlineSet(keys, np.zeros(0, dtype=complex), group_offsets)
+            return self.group_outlines
+
+        arc_lengths = np.array([len(points) for points in table], dtype=np.int64)
+        arc_offsets = np.zeros(len(table) + 1, dtype=np.int64)
+        np.cumsum(arc_lengths, out=arc_offsets[1:])
+        samples = np.concatenate(table)
+
+        piece_rows = np.array(piece_rows, dtype=np.int64)
+        piece_reversed = np.array(piece_reversed, dtype=bool)
+        piece_drop = np.array(piece_drop, dtype=np.int64)
+        lengths = arc_lengths[piece_rows]
+        piece_lengths = lengths - (piece_drop != 0)
+        piece_offsets = np.zeros(len(piece_rows) + 1, dtype=np.int64)
+        np.cumsum(piece_lengths, out=piece_offsets[1:])
+
+        # Position within the (possibly reversed) arc, then within the stored samples
+        piece_of = np.repeat(np.arange(len(piece_rows)), piece_lengths)
+        position = np.arange(piece_offsets[-1]) - piece_offsets[piece_of] + (piece_drop[piece_of] == 1)
+        position = np.where(piece_reversed[piece_of], lengths[piece_of] - 1 - position, position)
+        vertices = samples[arc_offsets[piece_rows][piece_of] + position]
+
+        # A group's outline spans the vertices of its pieces
+        group_piece_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(group_pieces, out=group_piece_offsets[1:])
+        group_offsets = piece_offsets[group_piece_offsets]
+
+        # Close outlines whose endpoints match
+        nonempty = group_offsets[1:] > group_offsets[:-1]
+        first = group_offsets[:-1][nonempty]
+        last = group_offsets[1:][nonempty] - 1
+        closing = np.abs(vertices[first] - vertices[last]) <= tol
+        vertices[last[closing]] = vertices[first[closing]]
+
+        outlines = OutlineSet(keys, vertices, group_offsets)
+        for key, group in self.arc_groups.items():
+            group._outline_cache = outlines[key] if group.arcs else None
+        self.group_outlines = outlines
+        return outlines
+
+    def _current_group_outlines(self) -> OutlineSet:
+        """:attr:`group_outlines`, rebuilt if a group changed since it was built."""
+        outlines = self.group_outlines
+        if outlines is not None and len(outlines) == len(self.arc_groups):
+            current = all(
+                key in outlines and (
+                    not group.arcs
+                    or getattr(group.get_cached_outline(), "base", None) is outlines.vertices
+                )
+                for key, group in self.arc_groups.items()
+            )
+            if current:
+                return outlines
+        return self.build_group_outlines()
+
+    def _create_outer_closure_groups(self, spiral_center, context):
+        """Create groups of closure arcs from outer invisible circles."""
         for c in self.outer_circles:
             if len(c.intersections) < 2:
                 continue
             
             pts = [p for p, _ in c.intersections]
-            arc_distances = []
-            
-            # Calculate arc midpoint distances to center
-            for i in range(len(pts)):
-                j = (i + 1) % len(pts)
-                midpoint = (pts[i] + pts[j]) / 2
-                arc_distances.append((abs(midpoint - spiral_center), i, j))
-            
-            # Draw 2nd and 3rd closest arcs
+
+            # Calculate arc midpoint distances to center; mirror-image arcs tie and sort by index
+            distances = tie_classes(
+                [abs((pts[i] + pts[(i + 1) % len(pts)]) / 2 - spiral_center) for i in range(len(pts))],
+                scale=c.radius,
+            )
+            arc_distances = [(distance, i, (i + 1) % len(pts)) for i, distance in enumerate(distances)]
+
+            # Use 2nd and 3rd closest arcs
             arc_distances.sort()
             for idx in range(1, min(3, len(arc_distances))):
                 _, i, j = arc_distances[idx]
-                arc = ArcElement(c, pts[i], pts[j], visible=True)
-                
-                # Draw if red outline enabled or (no fill and outline enabled)
-                if red_outline or (not add_fill_pattern and draw_group_outline):
-                    color = "#ff0000" if red_outline else "#000000"
-                    context.draw_scaled(arc, color=color, width=1.2)
+                arc = ArcElement(c, pts[i], pts[j], steps=context.arc_steps(c, pts[i], pts[j]), visible=True)
+                self._primary_arcs.append((arc, True))
                 
                 # Add to outer closure group
                 key = f"outer_{c.id}"
                 if key not in self.arc_groups:
-                    self.arc_groups[key] = ArcGroup(name=key)
+                    self._new_group(key)
                     self.arc_groups[key].ring_index = -1
-                    if debug_groups:
-                        rng = random.Random(c.id + 1000)
-                        self.arc_groups[key].debug_fill = "#%06x" % rng.randint(0, 0xFFFFFF)
-                        self.arc_groups[key].debug_stroke = "#000000"
+                    rng = random.Random(c.id + 1000)
+                    self.arc_groups[key].debug_fill = "#%06x" % rng.randint(0, 0xFFFFFF)
+                    self.arc_groups[key].debug_stroke = "#000000"
                 
                 self.arc_groups[key].add_arc(arc)
     
     # ---- Rendering ----
 
-    def _render_arram_boyle(self, context: DrawingContext, debug_groups: bool = False, 
-                           add_fill_pattern: bool = False, fill_pattern_spacing: float = 5.0, 
-                           fill_pattern_angle: float = 0.0, red_outline: bool = False, 
-                           draw_group_outline: bool = True, fill_pattern_offset: float = 0):
-        """Render spiral in Arram-Boyle mode with arc groups.
-        
-        Creates arc groups for each circle, draws closure arcs, and optionally
-        adds pattern fills or debug visualization.
+    def _ensure_intersections(self):
+        """Generate circles, outer circles and intersections unless current for the spiral parameters."""
+        self._ensure_circles()
+        if self.intersection_set is None or self._stage_keys.get("intersections") != self._stage_keys["circles"]:
+            self.generate_outer_circles()
+            self.compute_all_intersections()
+
+    def _ensure_arc_groups(self, context: DrawingContext, use_symmetry: bool = True):
         """
-        # Setup
-        self.generate_outer_circles()
-        self.compute_all_intersections()
-        context.set_normalization_scale(self.circles + self.outer_circles)
+        Build the arc groups and their outlines unless current.
+
+        The groups only depend on the intersections, the arc selection settings and
+        the arc sampling (which follows the output scale only with an arc
+        tolerance). Random arc selection is drawn anew for every render.
+        """
+        self._ensure_intersections()
+        use_templates = use_symmetry and self.arc_mode != "random"
+        key = (
+            self._stage_keys["intersections"], self.arc_mode, self.num_gaps, use_templates,
+            context.arc_tolerance, context.scale_factor if context.arc_tolerance is not None else None,
+        )
+        if self.arc_groups and self.arc_mode != "random" and self._stage_keys.get("arc_groups") == key:
+            return
 
-        self.fill_pattern_angle = fill_pattern_angle
-        
         spiral_center = 0 + 0j
         self.arc_groups.clear()
+        self.group_outlines = None
+        # Arcs drawn on their own, in creation order: (arc, from an outer circle)
+        self._primary_arcs = []
         
         # Compute ring indices for all circles
         radius_to_ring_index = self._compute_ring_indices()
         
-        # Create arc groups for visible circles
-        self._create_arc_groups_for_circles(
-            radius_to_ring_index, spiral_center, debug_groups,
-            add_fill_pattern, draw_group_outline, context
-        )
+        # Create arc groups for visible circles; random selection must stay per circle
+        if use_templates:
+            self._create_arc_groups_from_templates(radius_to_ring_index, spiral_center, context)
+        else:
+            self._create_arc_groups_for_circles(radius_to_ring_index, spiral_center, context)
         
-        # Draw outer closure arcs
-        self._draw_outer_closure_arcs(
-            spiral_center, debug_groups, red_outline,
-            add_fill_pattern, draw_group_outline, context
-        )
+        # Create outer closure arc groups
+        self._create_outer_closure_groups(spiral_center, context)
         
-        #"""
-        # complete arc groups - This block appears to add additional arcs based on neighbor circles
-        # and specific indices. This might require further review for its geometric purpose.
-        max_index = max([group.ring_index for group in self.arc_groups.values()])
+        # Complete the groups of circles with six neighbours by one arc of each of
+        # four of those neighbours (neighbour index -> index of its arc)
+        neighbour_arcs = {-1: -3, -2: -2, -5: 1, -6: 0}
+        set_index = {c: i for i, c in enumerate(self.circles + self.outer_circles)}
         for c in self.circles:
-            if not f"circle_{c.id}" in self.arc_groups.keys(): continue
-            group = self.arc_groups[f"circle_{c.id}"]
+            group = self.arc_groups.get(f"circle_{c.id}")
+            if group is None:
+                continue
             neigh_lst = c.get_neighbour_circles()
-            if len(neigh_lst) == 6:
-                for k in [-1,-2,-5,-6]: #[0,-1,2,3]: # Indices to select neighbors
-                    neigh_a = neigh_lst[k]
-                    # Select all arcs from the neighbor circle
-                    arcs_a = ArcSelector.select_arcs_for_gaps(neigh_a, spiral_center, mode="all")
-                    #print(len(arcs_a)) # Debug print, can be removed
-                    if len(arcs_a) == 6:
-                        # Select specific arc index based on neighbor index k
-                        arc_i = 0
-                        if k == -1: arc_i = -3
-                        if k == -2: arc_i = -2
-                        if k == -5: arc_i = 1
-                        if k == -6: arc_i = 0
-                        i,j = arcs_a[arc_i]
-                        # Get start and end points from the neighbor circle's intersections
-                        start_a = neigh_a.intersections[i][0]
-                        end_a = neigh_a.intersections[j][0]
-                        # Create a new arc element from the neighbor circle
-                        arc_a = ArcElement(neigh_a, start_a, end_a, visible=True)
-                        # Add this arc to the current circle's group
-
-                        group.add_arc(arc_a)
-                    else:
-                        # Similar logic for neighbors with a different number of arcs
-                        arc_i = 0
-                        if k == -1: arc_i = -3
-                        if k == -2: arc_i = -2
-                        if k == -5: arc_i = 1
-                        if k == -6: arc_i = 0
-                        i,j = arcs_a[arc_i]
-                        start_a = neigh_a.intersections[i][0]
-                        end_a = neigh_a.intersections[j][0]
-                        arc_a = ArcElement(neigh_a, start_a, end_a, visible=True)
-                        group.add_arc(arc_a)
+            if len(neigh_lst) != 6:
+                continue
+            for k, arc_i in neighbour_arcs.items():
+                neigh_a = neigh_lst[k]
+                arcs_a = ArcSelector.select_arcs_in_set(
+                    self.intersection_set, set_index[neigh_a], spiral_center, mode="all"
+                )
+                i, j = arcs_a[arc_i]
+                # Start and end points from the neighbour circle's intersections
+                start_a = neigh_a.intersections[i][0]
+                end_a = neigh_a.intersections[j][0]
+                arc_a = ArcElement(neigh_a, start_a, end_a, steps=context.arc_steps(neigh_a, start_a, end_a),
+                                   visible=True)
+                group.add_arc_from_template(arc_a)
+
+        # Neighbour arcs differ at the spiral border; only keep templates that still map exactly
+        self._verify_arc_group_templates()
+
+        # All arcs exist now: sample them in one batch and build every outline
+        self.build_group_outlines()
+        self._stage_keys["arc_groups"] = key
+
+    def _render_arram_boyle(self, context: DrawingContext, debug_groups: bool = False, 
+                           add_fill_pattern: bool = False, fill_pattern_spacing: float = 5.0, 
+                           fill_pattern_angle: float = 0.0, red_outline: bool = False, 
+                           draw_group_outline: bool = True, fill_pattern_offset: float = 0,
+                           use_symmetry: bool = True):
+        """Render spiral in Arram-Boyle mode with arc groups.
         
-        #"""
+        Creates arc groups for each circle, draws closure arcs, and optionally
+        adds pattern fills or debug visualization. With ``use_symmetry``, groups
+        of similar circles are derived from one template each. Intersections and
+        arc groups are kept from the previous render while their inputs are
+        unchanged, so fill and outline options only redo the drawing.
+        """
+        # Setup
+        self._ensure_intersections()
+        context.set_normalization_scale(self.intersection_set)
+        self._ensure_arc_groups(context, use_symmetry=use_symmetry)
+
+        self.fill_pattern_angle = fill_pattern_angle
+
+        # Draw individual arcs: closure arcs if red outline enabled, all of them if no fill and outline enabled
+        for arc, outer in self._primary_arcs:
+            if outer and red_outline:
+                context.draw_scaled(arc, color="#ff0000", width=1.2)
+            elif not add_fill_pattern and draw_group_outline:
+                if outer:
+                    context.draw_scaled(arc, color="#000000", width=1.2)
+                else:
+                    context.draw_scaled(arc)
+
         # After drawing all arcs, render group outlines (debug fills) if debug is enabled
         if debug_groups:
             for key, group in self.arc_groups.items():
@@ -1647,20 +3831,26 @@ class DoyleSpiral:
                 # render group fill/outline
                 group.to_svg_fill(context, debug=True, fill_opacity=0.25)
 
-        #"""
         # After drawing all arcs, render line fillings
         if add_fill_pattern:
-            for key, group in self.arc_groups.items():
-                # Exclude outer circle groups from default debug rendering
-                if "outer" in key: continue
-                # render group fill/outline
-                #group.to_svg_fill(context, debug=True, fill_opacity=0.25)
-                # Interpret fill_pattern_angle as per-ring angle offset (degrees)
-                ring_idx = group.ring_index if group.ring_index is not None else 0
-                line_settings = (fill_pattern_spacing, ring_idx * fill_pattern_angle)
-                group.to_svg_fill(context, debug=False, fill_opacity=0.25, pattern_fill=True, line_settings=line_settings, draw_outline=draw_group_outline, line_offset=fill_pattern_offset)
+            # Exclude outer circle groups from default debug rendering
+            fill_groups = [group for key, group in self.arc_groups.items() if "outer" not in key]
+            # Interpret fill_pattern_angle as per-ring angle offset (degrees)
+            angles = [(group.ring_index or 0) * fill_pattern_angle for group in fill_groups]
+            # Clip the line fills of all groups in one batch
+            segments, segment_offsets = context.line_fill_segments(
+                [group.get_closed_outline() * context.scale_factor for group in fill_groups],
+                fill_pattern_spacing, angles, fill_pattern_offset,
+                arcs=[group.get_outline_arcs() for group in fill_groups] if context.fill_inset == "arc" else None,
+            )
+            for n, group in enumerate(fill_groups):
+                line_settings = (fill_pattern_spacing, angles[n])
+                group.to_svg_fill(context, debug=False, fill_opacity=0.25, pattern_fill=True, line_settings=line_settings,
+                                  draw_outline=draw_group_outline, line_offset=fill_pattern_offset,
+                                  line_segments=segments[segment_offsets[n]:segment_offsets[n + 1]])
 
         #draw red outline if option is set
+        max_index = max([group.ring_index for group in self.arc_groups.values()])
         for c in self.circles:
             if not f"circle_{c.id}" in self.arc_groups.keys(): continue
             group = self.arc_groups[f"circle_{c.id}"]
@@ -1676,13 +3866,12 @@ class DoyleSpiral:
     def _render_doyle(self, context: DrawingContext):
         """Handles the standard Doyle rendering mode (full circles)."""
         # Set normalization scale based on visible circles
-        context.set_normalization_scale(self.circles)
-        # Draw all visible circles
-        for c in self.circles:
-            context.draw_scaled(c)  # Use default circle color
+        context.set_normalization_scale(self.circle_set)
+        # Draw all visible circles straight from the arrays
+        context.draw_circle_set(self.circle_set)  # Use default circle color
 
 
-    def to_svg(self, mode: str = "doyle", size: int = 800, debug_groups: bool = False, add_fill_pattern: bool = False, fill_pattern_spacing: float = 5.0, fill_pattern_angle: float = 0.0, red_outline: bool = False, draw_group_outline: bool = True, fill_pattern_offset: float = 0) -> str:
+    def to_svg(self, mode: str = "doyle", size: int = 800, debug_groups: bool = False, add_fill_pattern: bool = False, fill_pattern_spacing: float = 5.0, fill_pattern_angle: float = 0.0, red_outline: bool = False, draw_group_outline: bool = True, fill_pattern_offset: float = 0, use_symmetry: bool = True, arc_output: str = "polyline", arc_tolerance: Optional[float] = None, fill_inset: str = "arc", svg_backend: str = "stream", out: Optional[TextIO] = None, hatch_output: str = "lines", precision: Optional[int] = None) -> str:
         """
         Generates the SVG representation of the spiral in the specified mode.
 
@@ -1696,29 +3885,51 @@ class DoyleSpiral:
             red_outline: If True, draw red outline on specific arcs.
             draw_group_outline: If True, draw the arc group polygon outlines (default: True).
             fill_pattern_offset: Inset distance from polygon edge for line clipping (positive = shrink inward).
+            use_symmetry: If True, derive groups of similar circles from shared templates (default: True).
+            arc_output: ``"polyline"`` to write arcs as sampled points or ``"arc"`` for
+                exact SVG ``A`` commands (default: "polyline").
+            arc_tolerance: Maximum chord deviation in output pixels when sampling arcs;
+                None keeps a fixed 40 points per arc (default: None).
+            fill_inset: ``"arc"`` to inset line fills exactly from the group arcs or
+                ``"polygon"`` to buffer the sampled group outlines (default: "arc").
+            svg_backend: ``"stream"`` to write the SVG as text while drawing or
+                ``"svgwrite"`` to build it with svgwrite (default: "stream").
+            out: Text file to write the SVG to instead of returning it (default: None).
+            hatch_output: ``"lines"`` to write every line fill segment as a ``<line>`` or
+                ``"path"`` for one ``<path>`` per group (default: "lines").
+            precision: Decimal places of the coordinates written; None writes every
+                digit (default: None).
 
         Returns:
-            A string containing the SVG representation of the spiral.
+            A string containing the SVG representation of the spiral, or an empty
+            string if it was written to ``out``.
 
         Raises:
-            ValueError: If an unknown rendering mode is provided.
+            ValueError: If an unknown rendering mode, arc output, fill inset, SVG
+                backend or hatch output, a non-positive arc tolerance or a negative
+                precision is provided.
         """
-        # Generate circles if not already generated
-        if not self._is_generated:
-            self.generate_circles()
+        # Generate circles unless current for the spiral parameters
+        self._ensure_circles()
 
         # Create a drawing context
-        context = DrawingContext(size)
+        context = DrawingContext(size, arc_output=arc_output, arc_tolerance=arc_tolerance,
+                                 line_fill_cache=self._line_fill_cache, fill_inset=fill_inset,
+                                 svg_backend=svg_backend, out=out, hatch_output=hatch_output,
+                                 precision=precision)
 
         # Render based on the selected mode
         if mode == "doyle":
             self._render_doyle(context)
         elif mode == "arram_boyle":
-            self._render_arram_boyle(context, debug_groups=debug_groups, add_fill_pattern=add_fill_pattern, fill_pattern_spacing=fill_pattern_spacing, fill_pattern_angle=fill_pattern_angle, red_outline=red_outline, draw_group_outline=draw_group_outline, fill_pattern_offset=fill_pattern_offset)
+            self._render_arram_boyle(context, debug_groups=debug_groups, add_fill_pattern=add_fill_pattern, fill_pattern_spacing=fill_pattern_spacing, fill_pattern_angle=fill_pattern_angle, red_outline=red_outline, draw_group_outline=draw_group_outline, fill_pattern_offset=fill_pattern_offset, use_symmetry=use_symmetry)
         else:
             raise ValueError(f"Unknown rendering mode: {mode}")
 
-        # Return the SVG as a string
+        # Return the SVG as a string unless it was written to a file
+        if out is not None:
+            context.finish()
+            return ""
         return context.to_string()
 
     def to_json_dict(self) -> Dict[str, object]:
@@ -1750,18 +3961,13 @@ class DoyleSpiral:
             "arcgroups": [],
         }
 
+        outline_lists = self._current_group_outlines().xy_lists()
+
         for group_key, group in self.arc_groups.items():
             if "outer" in group_key:
                 continue
 
-            outline = group.get_cached_outline()
-            if outline is None:
-                computed_outline = group.get_closed_outline()
-                outline = group.get_cached_outline()
-                if outline is None:
-                    outline = computed_outline
-
-            outline_points = [[p.real, p.imag] for p in outline] if outline else []
+            outline_points = outline_lists[group_key]
 
             ring_index = group.ring_index if group.ring_index is not None else 0
             line_angle = ring_index * self.fill_pattern_angle
@@ -1804,8 +4010,211 @@ class DoyleSpiral:
 # Doyle Math and Arc Selection
 # ============================================
 
+class DoyleSolveError(RuntimeError):
+    """Raised when the Doyle system for ``(p, q)`` has no usable root."""
+
+    def __init__(self, p: int, q: int, residual: float, iterations: int, reason: str):
+        super().__init__(
+            f"Root finding did not converge for p={p}, q={q}: {reason} "
+            f"(residual={residual:.3g}, iterations={iterations})"
+        )
+        self.p = p
+        self.q = q
+        self.residual = residual
+        self.iterations = iterations
+        self.reason = reason
+
+
+class DoyleSolutionTable:
+    """Process-wide memo of solved Doyle systems keyed by ``(p, q)``.
+
+    Solutions are stored as plain Python numbers so the table can be written to
+    disk as JSON, shared between worker processes and loaded back without
+    touching the root finder.
+    """
+
+    # Version 2: p > q solved through their mirror image, real Newton iteration counts
+    # Version 3: roots polished to machine precision
+    FORMAT_VERSION = 3
+    # Ranges covered by the interactive sliders (see ``spiral_ui``)
+    DEFAULT_P_RANGE = range(2, 65)
+    DEFAULT_Q_RANGE = range(4, 129)
+
+    def __init__(self):
+        self._solutions: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._solutions)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return self._key(*key) in self._solutions
+
+    @staticmethod
+    def _key(p: int, q: int) -> Tuple[int, int]:
+        return int(p), int(q)
+
+    @staticmethod
+    def _normalize_solution(solution: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "a": complex(solution["a"]),
+            "b": complex(solution["b"]),
+            "r": float(solution["r"]),
+            "mod_a": float(solution["mod_a"]),
+            "arg_a": float(solution["arg_a"]),
+            "iterations": int(solution.get("iterations", 0)),
+            "residual": float(solution.get("residual", 0.0)),
+        }
+
+    def get(self, p: int, q: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of the stored solution for ``(p, q)`` or ``None``."""
+        solution = self._solutions.get(self._key(p, q))
+        return dict(solution) if solution is not None else None
+
+    def nearest(self, p: int, q: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of the stored solution closest to ``(p, q)``, or ``None``.
+
+        Distance is measured on the integer (p, q) grid, ties going to the
+        smallest key, so the seed only depends on the table contents; the result
+        seeds the continuation solver in :meth:`DoyleMath.solve`.
+        """
+        with self._lock:
+            keys = list(self._solutions)
+        if not keys:
+            return None
+        best = min(keys, key=lambda key: ((key[0] - p) ** 2 + (key[1] - q) ** 2, key))
+        return self.get(*best)
+
+    def store(self, p: int, q: int, solution: Dict[str, Any]) -> Dict[str, Any]:
+        """Store ``solution`` for ``(p, q)`` and return the normalized entry."""
+        entry = self._normalize_solution(solution)
+        with self._lock:
+            self._solutions[self._key(p, q)] = entry
+        return dict(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._solutions.clear()
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Return a JSON-ready representation of every stored solution."""
+        with self._lock:
+            items = sorted(self._solutions.items())
+        return {
+            "version": self.FORMAT_VERSION,
+            "solutions": [
+                {
+                    "p": p,
+                    "q": q,
+                    "a": [entry["a"].real, entry["a"].imag],
+                    "b": [entry["b"].real, entry["b"].imag],
+                    "r": entry["r"],
+                    "mod_a": entry["mod_a"],
+                    "arg_a": entry["arg_a"],
+                    "iterations": entry["iterations"],
+                    "residual": entry["residual"],
+                }
+                for (p, q), entry in items
+            ],
+        }
+
+    def update_from_json_dict(self, data: Dict[str, Any]) -> int:
+        """Merge solutions from :meth:`to_json_dict` output.
+
+        Returns:
+            The number of solutions loaded.
+
+        Raises:
+            ValueError: If the data was written by an incompatible version.
+        """
+        version = data.get("version")
+        if version != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported solution table version: {version!r}")
+
+        loaded = {}
+        for item in data.get("solutions", []):
+            loaded[self._key(item["p"], item["q"])] = self._normalize_solution({
+                "a": complex(*item["a"]),
+                "b": complex(*item["b"]),
+                "r": item["r"],
+                "mod_a": item["mod_a"],
+                "arg_a": item["arg_a"],
+                "iterations": item.get("iterations", 0),
+                "residual": item.get("residual", 0.0),
+            })
+        with self._lock:
+            self._solutions.update(loaded)
+        return len(loaded)
+
+    def save(self, filename: str) -> None:
+        """Write the table to ``filename`` atomically so readers never see a partial file."""
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".doyle_solutions_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_json_dict(), f)
+            os.replace(tmp_path, filename)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, filename: str) -> int:
+        """Merge solutions stored in ``filename`` into the table.
+
+        Returns:
+            The number of solutions loaded.
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            return self.update_from_json_dict(json.load(f))
+
+    def precompute(self, p_values=DEFAULT_P_RANGE, q_values=DEFAULT_Q_RANGE) -> int:
+        """Solve every missing ``(p, q)`` combination of the given ranges.
+
+        All missing systems are solved together with :meth:`DoyleMath.solve_batch`;
+        only the ones that fail to converge there go through the continuation
+        solver. Pairs without a usable root are left out of the table.
+
+        Returns:
+            The number of newly solved systems.
+        """
+        missing = [(p, q) for p in p_values for q in q_values if (p, q) not in self]
+        if not missing:
+            return 0
+
+        p_arr, q_arr = np.array(missing, dtype=int).T
+        batch = DoyleMath.solve_batch(p_arr, q_arr)
+        solved = 0
+        for idx, (p, q) in enumerate(missing):
+            if batch["converged"][idx]:
+                solution = {key: batch[key][idx] for key in DoyleMath.SOLUTION_KEYS}
+            else:
+                try:
+                    solution = DoyleMath.solve_continued(p, q, self)
+                except DoyleSolveError:
+                    continue
+            self.store(p, q, solution)
+            solved += 1
+        return solved
+
+
 class DoyleMath:
     """Static methods for solving the Doyle spiral system."""
+
+    # Shared by every DoyleSpiral in the process; see DoyleSolutionTable
+    solution_table = DoyleSolutionTable()
+    DEFAULT_GUESS = (2.0, 0.0)
+    # Largest residual norm accepted as a converged root
+    RESIDUAL_TOL = 1e-7
+    # Valid spirals on the slider grid stay below r = 0.79 and |a| = 8.4; roots
+    # past these bounds have circles as large as their spacing or jump so far
+    # per step that only a handful of circles fit inside max_d.
+    MAX_RADIUS_RATIO = 0.95
+    MAX_MOD_A = 100.0
+    SOLUTION_KEYS = ("a", "b", "r", "mod_a", "arg_a", "iterations", "residual")
+    # Full Newton steps at most taken past the tolerance (see solve_batch)
+    POLISH_STEPS = 4
+
     @staticmethod
     def d_(z: float, t: float, p: int, q: int) -> float:
         # Helper function for the Doyle equation
@@ -1824,33 +4233,316 @@ class DoyleMath:
         return DoyleMath.d_(z, t, p, q) / DoyleMath.s_(z, p, q)
 
     @staticmethod
-    def solve(p: int, q: int) -> dict:
+    def solve(p: int, q: int, use_cache: bool = True) -> dict:
+        """
+        Solves the Doyle system for a given (p, q), memoized in :attr:`solution_table`.
+
+        Unsolved pairs are warm-started from the nearest solution already in the
+        table (see :meth:`solve_continued`).
+
+        Args:
+            p: The p parameter of the Doyle spiral.
+            q: The q parameter of the spiral.
+            use_cache: If False, always run the root finder from the default guess
+                and leave the table untouched.
+
+        Returns:
+            A dictionary containing the solution parameters 'a', 'b', 'r', 'mod_a', and 'arg_a',
+            plus the root finder's 'iterations' and final 'residual' norm.
+
+        Raises:
+            DoyleSolveError: If no usable root is found.
+        """
+        if not use_cache:
+            return DoyleMath.solve_system(p, q)
+
+        solution = DoyleMath.solution_table.get(p, q)
+        if solution is None:
+            solution = DoyleMath.solution_table.store(
+                p, q, DoyleMath.solve_continued(p, q, DoyleMath.solution_table)
+            )
+        return solution
+
+    @staticmethod
+    def solve_continued(p: int, q: int, table: Optional[DoyleSolutionTable] = None) -> dict:
         """
-        Solves the Doyle system for a given (p, q).
+        Solves (p, q) seeded from the nearest already-solved pair in ``table``.
+
+        Neighbouring (p, q) have nearby roots, so during slider drags the warm
+        start converges in a few iterations. If it fails, the default guess is
+        tried before giving up. Within the bounds of :meth:`_is_usable_root`
+        each system has a single root (p > q being solved through its mirror
+        image, see :meth:`solve_batch`), so the result does not depend on which
+        seed converged or on the order in which pairs were solved.
 
         Args:
             p: The p parameter of the Doyle spiral.
             q: The q parameter of the spiral.
+            table: Table to take the seed from; no seed is used when None or empty.
+
+        Returns:
+            The solution dictionary described in :meth:`solve`.
+
+        Raises:
+            DoyleSolveError: If neither the warm start nor the default guess converges.
+        """
+        guesses = []
+        nearest = table.nearest(p, q) if table is not None else None
+        if nearest is not None:
+            guesses.append((nearest["mod_a"], nearest["arg_a"]))
+        # None picks DEFAULT_GUESS for the system solved, which for p > q is
+        # the mirrored one; passing DEFAULT_GUESS itself would mirror the guess
+        guesses.append(None)
+
+        error: Optional[DoyleSolveError] = None
+        for guess in guesses:
+            try:
+                return DoyleMath.solve_system(p, q, guess=guess)
+            except DoyleSolveError as exc:
+                error = exc
+        raise error
+
+    @staticmethod
+    def _ratio_with_partials(x, y, phi):
+        """
+        Evaluates ``(x² + y² - 2xy·cos φ) / (x + y)²`` and its partial derivatives.
+
+        Every ``r_`` term of the Doyle system has this form, so the closed-form
+        Jacobian is assembled from these partials by the chain rule.
+
+        Returns:
+            Tuple ``(value, d/dx, d/dy, d/dphi)``; works elementwise on arrays.
+        """
+        cos_phi = np.cos(phi)
+        inv_denom = 1.0 / (x + y) ** 2
+        value = (x * x + y * y - 2 * x * y * cos_phi) * inv_denom
+        d_denom = 2 * (x + y)
+        d_x = (2 * x - 2 * y * cos_phi - value * d_denom) * inv_denom
+        d_y = (2 * y - 2 * x * cos_phi - value * d_denom) * inv_denom
+        d_phi = 2 * x * y * np.sin(phi) * inv_denom
+        return value, d_x, d_y, d_phi
+
+    @staticmethod
+    def residual_and_jacobian(z, t, p, q) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluates the Doyle system and its analytic Jacobian with respect to (z, t).
+
+        All arguments may be scalars or broadcastable arrays.
 
         Returns:
-            A dictionary containing the solution parameters 'a', 'b', 'r', 'mod_a', and 'arg_a'.
-        """
-        # Define the system of equations to solve
-        def f_(x: np.ndarray) -> List[float]:
-            z, t = x
-            f1 = DoyleMath.r_(z, t, 0, 1) - DoyleMath.r_(z, t, p, q)
-            f2 = DoyleMath.r_(z, t, 0, 1) - DoyleMath.r_(z ** (p / q), (p * t + 2 * np.pi) / q, 0, 1)
-            return [f1, f2]
-
-        # Use scipy's root finder to solve the system
-        sol = root(f_, [2.0, 0.0], tol=1e-6)
-        z, t = sol.x
-        # Calculate spiral parameters from the solution
+            Tuple ``(F, J)`` with ``F`` of shape ``(2, ...)`` and ``J`` of shape ``(2, 2, ...)``.
+        """
+        k = np.divide(p, q)
+        w = z ** k
+        sigma = (p * t + 2 * np.pi) / q
+        dw_dz = k * w / z
+
+        r0, r0_x, _, r0_phi = DoyleMath._ratio_with_partials(z, 1.0, t)
+        r1, r1_x, r1_y, r1_phi = DoyleMath._ratio_with_partials(z, w, t - sigma)
+        r2, r2_x, _, r2_phi = DoyleMath._ratio_with_partials(w, 1.0, sigma)
+
+        residual = np.array([r0 - r1, r0 - r2])
+        jacobian = np.array([
+            [r0_x - (r1_x + r1_y * dw_dz), r0_phi - r1_phi * (1 - k)],
+            [r0_x - r2_x * dw_dz, r0_phi - r2_phi * k],
+        ])
+        return residual, jacobian
+
+    @staticmethod
+    def _is_usable_root(z, t, residual, tol: float):
+        """
+        Checks that (z, t) is a converged root that yields a finite, growing spiral.
+
+        Roots with |a| <= 1 never reach ``max_d`` when stepping outward, and
+        non-finite radii produce empty drawings, so both are rejected along
+        with large residuals. Radius ratios from ``MAX_RADIUS_RATIO`` and
+        |a| from ``MAX_MOD_A`` up are degenerate packings, and arguments outside
+        [-π, π] pick another branch of ``z ** (p / q)``. Works elementwise on arrays.
+        """
+        with np.errstate(invalid="ignore"):
+            r_sq = DoyleMath.r_(z, t, 0, 1)
+            return (np.isfinite(residual) & (residual <= tol)
+                    & (z > 1) & (z < DoyleMath.MAX_MOD_A) & (np.abs(t) <= np.pi)
+                    & np.isfinite(r_sq) & (r_sq > 0) & (r_sq < DoyleMath.MAX_RADIUS_RATIO ** 2))
+
+    @staticmethod
+    def _mirror_roots(z, t, p, q):
+        """
+        Maps a root (z, t) of the (p, q) system to the mirror-image root of (q, p).
+
+        Swapping p and q reflects the packing and exchanges the roles of a and b
+        (the new ``a`` is ``conj(b)``), keeping r. The map is its own inverse
+        once p and q are swapped; works elementwise on arrays.
+        """
+        return z ** (p / q), -(p * t + 2 * np.pi) / q
+
+    @staticmethod
+    def _solution_from_roots(z, t, p, q) -> dict:
+        """Derives the spiral parameters from solved (z, t); works on scalars and arrays."""
         r = np.sqrt(DoyleMath.r_(z, t, 0, 1))
         a = z * np.exp(1j * t)
         b = z ** (p / q) * np.exp(1j * (p * t + 2 * np.pi) / q)
         return {"a": a, "b": b, "r": r, "mod_a": z, "arg_a": t}
 
+    @staticmethod
+    def solve_batch(p_values, q_values, guess=None,
+                    tol: float = 1e-12, max_iter: int = 50) -> Dict[str, np.ndarray]:
+        """
+        Solves many Doyle systems at once with damped Newton steps.
+
+        Every (p, q) pair is iterated simultaneously using the analytic Jacobian,
+        so a whole parameter sweep costs a handful of NumPy passes instead of one
+        root finder call per pair. Steps that would increase the residual (or
+        leave the domain z > 0) are halved until they do not. Once under ``tol``,
+        roots take full steps for as long as these still lower the residual, so
+        they end up at machine precision wherever the iteration started.
+
+        Systems with p > q have spurious roots next to the one that mirrors
+        (q, p), and the default guess often misses the latter, so they are
+        solved as (q, p) and reflected back with :meth:`_mirror_roots`.
+
+        Args:
+            p_values: Array-like of p parameters.
+            q_values: Array-like of q parameters (broadcast against ``p_values``).
+            guess: Initial (z, t), either shared by every system or one pair per
+                system (an array of shape ``(n, 2)``) for warm starts. Defaults
+                to ``DEFAULT_GUESS`` for the (possibly mirrored) system solved.
+            tol: Convergence threshold on the residual norm.
+            max_iter: Maximum number of Newton iterations.
+
+        Returns:
+            A dictionary of flat arrays: the solution parameters 'a', 'b', 'r',
+            'mod_a', 'arg_a' plus 'p', 'q', 'converged', 'iterations' and 'residual'.
+            'converged' is only set for usable roots (see :meth:`_is_usable_root`).
+        """
+        p_arr, q_arr = np.broadcast_arrays(np.asarray(p_values, dtype=float).ravel(),
+                                           np.asarray(q_values, dtype=float).ravel())
+        n = p_arr.size
+        guess_arr = np.broadcast_to(np.asarray(DoyleMath.DEFAULT_GUESS if guess is None else guess,
+                                               dtype=float), (n, 2))
+        z = guess_arr[:, 0].copy()
+        t = guess_arr[:, 1].copy()
+        iterations = np.zeros(n, dtype=int)
+
+        swap = p_arr > q_arr
+        if guess is not None and swap.any():
+            z[swap], t[swap] = DoyleMath._mirror_roots(z[swap], t[swap], p_arr[swap], q_arr[swap])
+        solve_p = np.where(swap, q_arr, p_arr)
+        solve_q = np.where(swap, p_arr, q_arr)
+
+        def residual_norm(z_, t_, p_, q_):
+            with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+                f, _ = DoyleMath.residual_and_jacobian(z_, t_, p_, q_)
+                norm = np.hypot(f[0], f[1])
+            return np.where(np.isfinite(norm) & (z_ > 0), norm, np.inf)
+
+        def newton_step(z_, t_, p_, q_):
+            with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+                f, jac = DoyleMath.residual_and_jacobian(z_, t_, p_, q_)
+                det = jac[0, 0] * jac[1, 1] - jac[0, 1] * jac[1, 0]
+                # Cramer's rule for the 2x2 Newton system J · step = -F
+                return ((-f[0] * jac[1, 1] + f[1] * jac[0, 1]) / det,
+                        (-f[1] * jac[0, 0] + f[0] * jac[1, 0]) / det)
+
+        norm = residual_norm(z, t, solve_p, solve_q)
+        active = np.flatnonzero(norm > tol)
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            za, ta, pa, qa = z[active], t[active], solve_p[active], solve_q[active]
+            step_z, step_t = newton_step(za, ta, pa, qa)
+
+            current = norm[active]
+            scale = np.ones(active.size)
+            accepted = np.zeros(active.size, dtype=bool)
+            trial_norm = np.full(active.size, np.inf)
+            for _ in range(30):
+                pending = ~accepted
+                if not pending.any():
+                    break
+                trial = residual_norm(za[pending] + scale[pending] * step_z[pending],
+                                      ta[pending] + scale[pending] * step_t[pending],
+                                      pa[pending], qa[pending])
+                ok = trial < current[pending]
+                idx = np.flatnonzero(pending)
+                accepted[idx[ok]] = True
+                trial_norm[idx[ok]] = trial[ok]
+                scale[idx[~ok]] *= 0.5
+
+            moved = active[accepted]
+            z[moved] = za[accepted] + scale[accepted] * step_z[accepted]
+            t[moved] = ta[accepted] + scale[accepted] * step_t[accepted]
+            norm[moved] = trial_norm[accepted]
+            iterations[active] += 1
+            # Systems that could not make progress are stuck; stop iterating them
+            active = moved[norm[moved] > tol]
+
+        # Polish converged roots to machine precision with full steps. Tangent points
+        # move by about sqrt(residual) circle radii, so a root just under tol (as left
+        # by a warm start) would still shift the intersections of large circles.
+        polish = np.flatnonzero(norm <= tol)
+        for _ in range(DoyleMath.POLISH_STEPS):
+            if polish.size == 0:
+                break
+            step_z, step_t = newton_step(z[polish], t[polish], solve_p[polish], solve_q[polish])
+            trial_z, trial_t = z[polish] + step_z, t[polish] + step_t
+            trial = residual_norm(trial_z, trial_t, solve_p[polish], solve_q[polish])
+            better = trial < norm[polish]
+            z[polish[better]], t[polish[better]] = trial_z[better], trial_t[better]
+            norm[polish[better]] = trial[better]
+            iterations[polish[better]] += 1
+            polish = polish[better]
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            if swap.any():
+                z[swap], t[swap] = DoyleMath._mirror_roots(z[swap], t[swap], solve_p[swap], solve_q[swap])
+            solution = DoyleMath._solution_from_roots(z, t, p_arr, q_arr)
+        solution.update({
+            "p": p_arr.astype(int),
+            "q": q_arr.astype(int),
+            "converged": DoyleMath._is_usable_root(z, t, norm, tol),
+            "iterations": iterations,
+            "residual": norm,
+        })
+        return solution
+
+    @staticmethod
+    def solve_system(p: int, q: int, guess: Optional[Tuple[float, float]] = None) -> dict:
+        """
+        Runs the root finder for a given (p, q) without consulting the solution table.
+
+        This is :meth:`solve_batch` for a single system, so lazily solved pairs
+        match the ones from :meth:`DoyleSolutionTable.precompute`.
+
+        Args:
+            p: The p parameter of the Doyle spiral.
+            q: The q parameter of the spiral.
+            guess: Initial (z, t) for the root finder; ``DEFAULT_GUESS`` when None.
+
+        Returns:
+            A dictionary containing the solution parameters 'a', 'b', 'r', 'mod_a', and 'arg_a',
+            plus the number of Newton 'iterations' and the final 'residual' norm.
+
+        Raises:
+            DoyleSolveError: If the root finder fails or returns an unusable root.
+        """
+        batch = DoyleMath.solve_batch([p], [q], guess=guess)
+        z, t = float(batch["mod_a"][0]), float(batch["arg_a"][0])
+        residual = float(batch["residual"][0])
+        iterations = int(batch["iterations"][0])
+
+        # Judge convergence by the residual: Newton may stall right at machine
+        # precision, just above the batch tolerance.
+        if not DoyleMath._is_usable_root(z, t, residual, DoyleMath.RESIDUAL_TOL):
+            reason = ("root does not describe a valid spiral" if residual <= DoyleMath.RESIDUAL_TOL
+                      else "Newton iteration stalled")
+            raise DoyleSolveError(p, q, residual, iterations, reason)
+
+        solution = DoyleMath._solution_from_roots(z, t, p, q)
+        solution["iterations"] = iterations
+        solution["residual"] = residual
+        return solution
+
 class ArcSelector:
     """Static methods for selecting which arcs to draw based on a mode."""
     @staticmethod
@@ -1876,8 +4568,38 @@ class ArcSelector:
         """
         # Get intersection points from the circle
         pts = [p for p, _ in circle.intersections]
+        return ArcSelector.select_arcs_for_points(circle.center, pts, spiral_center, num_gaps, mode)
+
+    @staticmethod
+    def select_arcs_in_set(
+        circle_set: CircleSet,
+        index: int,
+        spiral_center: complex,
+        num_gaps: int = 2,
+        mode: str = "closest"
+    ) -> List[Tuple[int, int]]:
+        """
+        Selects arcs for circle ``index`` of a CircleSet; see :meth:`select_arcs_for_gaps`.
+        """
+        pts, _ = circle_set.intersections_of(index)
+        return ArcSelector.select_arcs_for_points(
+            complex(circle_set.centers[index]), pts.tolist(), spiral_center, num_gaps, mode
+        )
+
+    @staticmethod
+    def select_arcs_for_points(
+        center: complex,
+        pts: List[complex],
+        spiral_center: complex,
+        num_gaps: int = 2,
+        mode: str = "closest"
+    ) -> List[Tuple[int, int]]:
+        """
+        Core of :meth:`select_arcs_for_gaps` working on a circle center and its
+        clockwise-sorted intersection points.
+        """
         n = len(pts)
-        c = circle.center # Center of the current circle
+        c = center # Center of the current circle
         s = spiral_center # Center of the spiral
 
         if n < 2:
@@ -1899,6 +4621,8 @@ class ArcSelector:
                  distances = [abs(m - s) for m in midpoints]
             else:
                  distances = [abs(np.imag(np.conj(line_vec) * (m - c))) / abs(line_vec) for m in midpoints]
+            # Mirror-image arcs are tied; they then sort by index rather than rounding noise
+            distances = tie_classes(distances, scale=abs(pts[0] - c))
 
             # Sort arcs based on distance, reverse if mode is 'farthest'
             sorted_arcs = [arc for _, arc in sorted(zip(distances, arcs), reverse=(mode == "farthest"))]
@@ -1934,8 +4658,8 @@ class ArcSelector:
                 angles = [np.angle(m - c) for m in midpoints]
                 target_angle = np.angle(s - c)
 
-            angular_diffs = [abs(np.angle(np.exp(1j * (a - target_angle)))) for a in angles]
-            sorted_indices = np.argsort(angular_diffs)
+            angular_diffs = tie_classes([abs(np.angle(np.exp(1j * (a - target_angle)))) for a in angles])
+            sorted_indices = np.argsort(angular_diffs, kind="stable")
 
             # Choose indices for half the gaps
             num_half_gaps = num_gaps // 2
@@ -1972,7 +4696,10 @@ class ArcSelector:
             # we skip the arc that crosses the line.
             if num_gaps % 2 != 0 and abs(line_vec) > 1e-6:
                  # Find the intersection point closest to the line
-                 intersection_distances = [abs(np.imag(np.conj(line_vec) * (p - c))) / abs(line_vec) for p, _ in circle.intersections]
+                 intersection_distances = tie_classes(
+                     [abs(np.imag(np.conj(line_vec) * (p - c))) / abs(line_vec) for p in pts],
+                     scale=abs(pts[0] - c),
+                 )
                  closest_intersection_idx = np.argmin(intersection_distances)
                  # The arc that crosses the line is likely the one starting at or ending at this point
                  # We'll skip the arc starting at this point
@@ -1997,7 +4724,7 @@ class ArcSelector:
                 angles = [np.angle(m - c) for m in midpoints]
                 target_angle = np.angle(s - c)
 
-            angular_diffs = [abs(np.angle(np.exp(1j * (a - target_angle)))) for a in angles]
+            angular_diffs = tie_classes([abs(np.angle(np.exp(1j * (a - target_angle)))) for a in angles])
             # Sort arcs by angular difference
             sorted_arcs = [arc for _, arc in sorted(zip(angular_diffs, arcs))]
             # Select arcs to draw (skip the ones creating gaps)
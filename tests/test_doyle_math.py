@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.doyle_spiral import DoyleMath, DoyleSolutionTable, DoyleSolveError
+
+P_RANGE = DoyleSolutionTable.DEFAULT_P_RANGE
+Q_RANGE = DoyleSolutionTable.DEFAULT_Q_RANGE
+
+
+def slider_grid(p_step=1, q_step=1):
+    return [(p, q) for p in P_RANGE[::p_step] for q in Q_RANGE[::q_step]]
+
+
+def test_batch_solves_whole_slider_grid_within_bounds():
+    p, q = np.array(slider_grid()).T
+    batch = DoyleMath.solve_batch(p, q)
+
+    assert batch["converged"].all()
+    assert (batch["r"] < DoyleMath.MAX_RADIUS_RATIO).all()
+    assert (batch["mod_a"] > 1).all() and (batch["mod_a"] < DoyleMath.MAX_MOD_A).all()
+    assert (np.abs(batch["arg_a"]) <= np.pi).all()
+    residual, _ = DoyleMath.residual_and_jacobian(batch["mod_a"], batch["arg_a"], p, q)
+    assert np.abs(residual).max() < 1e-10
+
+
+def test_swapped_pairs_are_mirror_images():
+    p, q = np.array([(p, q) for p, q in slider_grid() if p > q and p in Q_RANGE and q in P_RANGE]).T
+    direct = DoyleMath.solve_batch(p, q)
+    swapped = DoyleMath.solve_batch(q, p)
+
+    np.testing.assert_allclose(direct["r"], swapped["r"], rtol=1e-9)
+    np.testing.assert_allclose(direct["a"], np.conj(swapped["b"]), rtol=1e-9)
+
+
+def test_solution_does_not_depend_on_solve_order():
+    # A coarse grid plus the corners, where warm starts come from far away
+    p_values = list(P_RANGE[::4]) + [P_RANGE[-1]]
+    q_values = list(Q_RANGE[::8]) + [Q_RANGE[-1]]
+    pairs = [(p, q) for p in p_values for q in q_values]
+    batch = DoyleSolutionTable()
+    assert batch.precompute(p_values, q_values) == len(pairs)
+
+    for seed in range(3):
+        order = pairs[:]
+        random.Random(seed).shuffle(order)
+        lazy = DoyleSolutionTable()
+        for p, q in order:
+            lazy.store(p, q, DoyleMath.solve_continued(p, q, lazy))
+        for p, q in pairs:
+            # Roots are polished to machine precision, so any start gives the same root
+            assert lazy.get(p, q)["a"] == pytest.approx(batch.get(p, q)["a"], rel=1e-13, abs=1e-13)
+
+
+def test_solve_system_reports_newton_iterations():
+    solution = DoyleMath.solve_system(16, 16)
+    batch = DoyleMath.solve_batch([16], [16])
+
+    assert solution["iterations"] == batch["iterations"][0]
+    assert 0 < solution["iterations"] < 50
+    assert solution["residual"] < DoyleMath.RESIDUAL_TOL
+
+
+def test_unusable_root_raises():
+    # A guess far outside the bounds never comes back to a usable root
+    with pytest.raises(DoyleSolveError):
+        DoyleMath.solve_system(9, 4, guess=(1e6, 3.0))
@@ -0,0 +1,345 @@
+import numpy as np
+import pytest
+
+from src.doyle_spiral import (
+    ArcElement, CircleElement, DoyleSpiral, DrawingContext, LineFillCache, arc_outline_boundary,
+    arc_steps_for_chord_error, clip_hatch_lines, clip_hatch_lines_batch, hatch_arc_outlines,
+    outline_primitives,
+)
+
+
+def make_context(**kwargs):
+    return DrawingContext(line_fill_cache=LineFillCache(), **kwargs)
+
+
+def test_line_fill_segments_without_polygons():
+    segments, offsets = make_context().line_fill_segments([], 4.0, 30.0, 1.0)
+
+    assert segments.shape == (0, 2)
+    assert offsets.tolist() == [0]
+
+
+def test_line_fill_segments_offsets_are_integers_for_degenerate_polygons():
+    degenerate = [np.array([0j, 10 + 0j]), np.array([], dtype=complex)]
+    segments, offsets = make_context().line_fill_segments(degenerate, 4.0, 30.0, 1.0)
+
+    assert segments.shape == (0, 2)
+    assert offsets.dtype.kind == "i"
+    assert segments[offsets[0]:offsets[1]].shape == (0, 2)
+
+
+def test_line_fill_segments_slices_per_polygon():
+    square = np.array([0, 40, 40 + 40j, 40j])
+    triangle = np.array([100, 160, 130 + 50j])
+    segments, offsets = make_context().line_fill_segments([square, triangle], 5.0, 0.0, 0.0)
+
+    assert offsets.dtype.kind == "i" and len(offsets) == 3
+    assert (segments[offsets[0]:offsets[1]].real <= 40 + 1e-9).all()
+    assert (segments[offsets[1]:offsets[2]].real >= 100 - 1e-9).all()
+
+
+def merged_intervals(intervals, tol=1e-9):
+    merged = []
+    for start, end in sorted(intervals):
+        if end - start <= tol:
+            continue
+        if merged and start <= merged[-1][1] + tol:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def clipped_intervals(segments, spacing, angle, origin):
+    """Group (M, 2, 2) segments by line index and project them onto the line direction."""
+    theta = np.radians(angle)
+    direction = np.array([np.cos(theta), np.sin(theta)])
+    normal = np.array([-direction[1], direction[0]])
+    lines = {}
+    for start, end in segments:
+        k = int(round((start - origin) @ normal / spacing))
+        lines.setdefault(k, []).append(sorted(((start - origin) @ direction, (end - origin) @ direction)))
+    return {k: merged for k, v in lines.items() if (merged := merged_intervals(v))}
+
+
+def shapely_intervals(polygon_array, spacing, angle, origin):
+    shapely = pytest.importorskip("shapely")
+    polygon = shapely.make_valid(shapely.Polygon(polygon_array))
+    theta = np.radians(angle)
+    direction = np.array([np.cos(theta), np.sin(theta)])
+    normal = np.array([-direction[1], direction[0]])
+    relative = polygon_array - origin
+    reach = np.abs(relative).sum() + 1
+    lines = {}
+    for k in range(int(np.floor((relative @ normal).min() / spacing)) - 1,
+                   int(np.ceil((relative @ normal).max() / spacing)) + 2):
+        base = origin + k * spacing * normal
+        line = shapely.LineString([base - reach * direction, base + reach * direction])
+        pieces = []
+        for part in shapely.get_parts(shapely.intersection(line, polygon)):
+            coords = shapely.get_coordinates(part)
+            if len(coords) >= 2:
+                u = (coords - base) @ direction
+                pieces.append((u.min(), u.max()))
+        if merged_intervals(pieces):
+            lines[k] = merged_intervals(pieces)
+    return lines
+
+
+def assert_same_intervals(actual, expected):
+    assert sorted(actual) == sorted(expected)
+    for k in expected:
+        np.testing.assert_allclose(actual[k], expected[k], atol=1e-9)
+
+
+# Lattice vertices, so the hatch lines below run through many of them; no edge
+# is parallel to a hatch line, where the boundary itself would be the answer
+NON_CONVEX = np.array([[0, 0], [3, 2], [6, 0], [5, 3], [7, 6], [4, 5], [3, 8], [2, 4], [-1, 5], [1, 2]], dtype=float)
+# Two counter-clockwise diamonds touching at (2, 1), traced as one ring
+SELF_TOUCHING = np.array([[0, 1], [1, 0], [2, 1], [3, 0], [4, 1], [3, 2], [2, 1], [1, 2]], dtype=float)
+# Two uneven lobes pinched together at (2, 1)
+PINCHED = np.array([[0, -1], [2, 1], [4, 0], [5, 5], [4, 4], [2, 1], [1, 3], [-1, 5]], dtype=float)
+
+
+@pytest.mark.parametrize("polygon", [NON_CONVEX, SELF_TOUCHING, PINCHED, NON_CONVEX[::-1]])
+@pytest.mark.parametrize("spacing, angle, origin", [
+    (0.5, 0.0, (0.0, 0.0)),
+    (0.5, 90.0, (0.0, 0.0)),
+    (1 / np.sqrt(5), np.degrees(np.arctan2(1, 2)), (0.0, 0.0)),
+    (0.37, 17.0, (0.1, -0.2)),
+])
+def test_clip_hatch_lines_matches_shapely(polygon, spacing, angle, origin):
+    origin = np.array(origin)
+    segments = clip_hatch_lines(polygon, spacing, angle, origin)
+
+    assert_same_intervals(clipped_intervals(segments, spacing, angle, origin),
+                          shapely_intervals(polygon, spacing, angle, origin))
+
+
+def test_clip_hatch_lines_batch_matches_single_polygons():
+    polygons = [NON_CONVEX, SELF_TOUCHING, PINCHED]
+    spacings, angles = [0.5, 0.3, 0.7], [0.0, 33.0, 120.0]
+    origins = np.array([[0.0, 0.0], [2.0, 1.0], [0.5, 0.5]])
+    segments, offsets = clip_hatch_lines_batch(
+        np.concatenate(polygons), np.concatenate(([0], np.cumsum([len(p) for p in polygons]))),
+        spacings, angles, origins)
+
+    assert len(offsets) == len(polygons) + 1
+    for i, polygon in enumerate(polygons):
+        expected = clip_hatch_lines(polygon, spacings[i], angles[i], origins[i])
+        np.testing.assert_allclose(segments[offsets[i]:offsets[i + 1]], expected)
+
+
+def disk_outline(center=0j, radius=2.0, parts=3):
+    circle = CircleElement(center, radius)
+    points = center + radius * np.exp(2j * np.pi * np.arange(parts) / parts)
+    return [(ArcElement(circle, points[i], points[(i + 1) % parts]), False) for i in range(parts)]
+
+
+def test_outline_primitives_joins_gaps_and_maps_coordinates():
+    arcs = disk_outline()
+    (starts, ends, centers, radii, sweeps), offsets = outline_primitives([arcs, arcs[:2]], scales=[1, 2j], shifts=[0, 1])
+
+    # The open outline is closed by a straight segment
+    assert offsets.tolist() == [0, 3, 6]
+    assert np.isinf(radii).tolist() == [False] * 5 + [True]
+    np.testing.assert_allclose(sweeps[:5], 2 * np.pi / 3)
+    np.testing.assert_allclose(starts[3:5], (np.array([arcs[0][0].start, arcs[1][0].start]) - 1) / 2j)
+    np.testing.assert_allclose(radii[3:5], 1.0)
+    np.testing.assert_allclose(ends[5], starts[3])
+
+
+def test_hatch_arc_outlines_insets_a_disk_exactly():
+    curves, offsets = outline_primitives([disk_outline()])
+    for distance in (0.0, 0.5, 1.5):
+        segments, segment_offsets = hatch_arc_outlines(*curves, offsets, [distance], [0.25], [0.0], [0j])
+
+        y = np.arange(-7, 8) * 0.25
+        y = y[np.abs(y) < 2 - distance]
+        half = np.sqrt((2 - distance) ** 2 - y ** 2)
+        assert segment_offsets.tolist() == [0, len(y)]
+        np.testing.assert_allclose(segments.imag, np.column_stack((y, y)), atol=1e-12)
+        np.testing.assert_allclose(np.sort(segments.real, axis=1), np.column_stack((-half, half)), atol=1e-9)
+
+
+def test_hatch_arc_outlines_collapses_large_insets():
+    curves, offsets = outline_primitives([disk_outline(), disk_outline(10j, 1.0)])
+    segments, segment_offsets = hatch_arc_outlines(*curves, offsets, [2.0, 0.2], [0.25, 0.25], [0.0, 0.0], [0j, 0j])
+
+    assert segment_offsets[1] == 0
+    assert segment_offsets[2] > 0 and (np.abs(segments - 10j) < 0.8 + 1e-9).all()
+
+    segments, segment_offsets = hatch_arc_outlines(*curves, offsets, [2.5, 1.0], [0.25, 0.25], [0.0, 0.0], [0j, 0j])
+    assert segments.shape == (0, 2) and segment_offsets.tolist() == [0, 0, 0]
+
+
+def test_arc_outline_boundary_keeps_stretches_traced_twice_once():
+    # A square traced counter-clockwise, then a clockwise square below it that
+    # runs along the shared edge again in the same direction
+    corners = np.array([0, 2, 2 + 2j, 2j, 0, 2, 2 - 2j, -2j])
+    starts, ends = corners, np.roll(corners, -1)
+    lines = (starts, ends, np.zeros(8, dtype=complex), np.full(8, np.inf), np.zeros(8))
+    (piece_starts, piece_ends, _, _, _), piece_offsets = arc_outline_boundary(*lines, np.array([0, 8]))
+
+    assert piece_offsets.tolist() == [0, 4]
+    assert sorted(zip(piece_starts.tolist(), piece_ends.tolist()), key=str) == sorted(
+        [(0j, 2 + 0j), (2 + 0j, 2 + 2j), (2 + 2j, 2j), (2j, 0j)], key=str)
+
+    segments, _ = hatch_arc_outlines(*lines, np.array([0, 8]), [0.5], [0.3], [0.0], [0j])
+    np.testing.assert_allclose(np.sort(segments.real, axis=1), np.tile([0.5, 1.5], (len(segments), 1)))
+
+
+def sampled_ring(curves, chord_error):
+    starts, _, centers, radii, sweeps = curves
+    points = []
+    for start, center, radius, sweep in zip(starts, centers, radii, sweeps):
+        if np.isfinite(radius):
+            steps = arc_steps_for_chord_error(radius, abs(sweep), chord_error)
+            points.append(center + (start - center) * np.exp(1j * sweep * np.arange(steps - 1) / (steps - 1)))
+        else:
+            points.append([start])
+    ring = np.concatenate(points)
+    return np.column_stack((ring.real, ring.imag))
+
+
+def shapely_hatch_length(geometry, spacing):
+    shapely = pytest.importorskip("shapely")
+    if geometry.is_empty:
+        return 0.0
+    x0, y0, x1, y1 = geometry.bounds
+    y = np.arange(np.ceil(y0 / spacing), np.floor(y1 / spacing) + 1) * spacing
+    lines = shapely.linestrings(np.stack((np.column_stack((np.full_like(y, x0 - 1), y)),
+                                          np.column_stack((np.full_like(y, x1 + 1), y))), axis=1))
+    return shapely.length(shapely.intersection(lines, geometry)).sum()
+
+
+@pytest.mark.parametrize("p, q", [(8, 16), (5, 9), (16, 16), (9, 4)])
+def test_arc_inset_matches_sampled_polygon_inset(p, q):
+    shapely = pytest.importorskip("shapely")
+    spiral = DoyleSpiral(p, q, 0)
+    spiral.to_svg(mode="arram_boyle")
+    groups = [group for key, group in spiral.arc_groups.items() if "outer" not in key]
+
+    for group in groups[::max(1, len(groups) // 8)]:
+        curves, offsets = outline_primitives([group.get_outline_arcs()])
+        size = np.ptp(curves[0].real) + np.ptp(curves[0].imag)
+        chord_error, spacing = 1e-4 * size, size / 40
+        ring = sampled_ring(curves, chord_error)
+        region = shapely.Polygon(ring).buffer(0)
+        for distance in (0.0, 0.03 * size, 0.1 * size, size):
+            segments, _ = hatch_arc_outlines(*curves, offsets, [distance], [spacing], [0.0], [0j])
+            length = np.abs(segments[:, 1] - segments[:, 0]).sum()
+            if distance == 0:
+                expected = np.linalg.norm(np.diff(clip_hatch_lines(ring, spacing, 0.0, np.zeros(2)), axis=1), axis=2).sum()
+            else:
+                expected = shapely_hatch_length(region.buffer(-distance, quad_segs=64), spacing)
+            # The samples stay within the chord error of the arcs, the buffer within
+            # its own chord error of the round joins; hatching divides areas by the spacing
+            tolerance = region.length * (chord_error + distance * (1 - np.cos(np.pi / 256))) / spacing
+            assert abs(length - expected) <= tolerance
+
+
+def test_line_fill_cache_accounts_bytes():
+    cache = LineFillCache(max_bytes=None)
+    segments = np.zeros((10, 2), dtype=complex)
+    cache.ensure_entry("a", 0.0, 1.0, 0.0)
+    cache.store_segments("a", 0.0, 1.0, 0.0, segments)
+    polygon = np.zeros((4, 2))
+    cache.store_polygon_data("a", 0.0, LineFillCache.polygon_data_from_inset(polygon, polygon))
+
+    stats = cache.stats()
+    assert stats["items"] == 2
+    # Fill entry with its segments, prepared polygon with its source and inset
+    assert stats["bytes"] == 2 * 512 + segments.nbytes + 2 * polygon.nbytes
+
+    # Replacing the segments re-accounts the entry instead of adding to it
+    cache.store_segments("a", 0.0, 1.0, 0.0, segments[:4])
+    assert cache.stats()["bytes"] == 2 * 512 + segments[:4].nbytes + 2 * polygon.nbytes
+
+    cache.clear()
+    assert cache.stats()["items"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_line_fill_cache_evicts_least_recently_used():
+    segments = np.zeros((32, 2), dtype=complex)
+    item_bytes = 512 + segments.nbytes
+    cache = LineFillCache(max_bytes=3 * item_bytes)
+    for name in "abc":
+        cache.ensure_entry(name, 0.0, 1.0, 0.0)
+        cache.store_segments(name, 0.0, 1.0, 0.0, segments)
+    assert cache.stats()["evictions"] == 0
+
+    # A hit makes "a" the most recently used, so adding "d" evicts "b"
+    assert cache.ensure_entry("a", 0.0, 1.0, 0.0)["segments"] is segments
+    cache.ensure_entry("d", 0.0, 1.0, 0.0)
+    cache.store_segments("d", 0.0, 1.0, 0.0, segments)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["items"] == 3 and stats["bytes"] <= stats["max_bytes"]
+    assert stats["hits"] == 1 and stats["misses"] == 4
+    assert cache.ensure_entry("b", 0.0, 1.0, 0.0)["segments"] is None
+    assert cache.stats()["misses"] == 5
+
+    # An item larger than the whole budget still stays, alone
+    cache.ensure_entry("e", 0.0, 1.0, 0.0)
+    cache.store_segments("e", 0.0, 1.0, 0.0, np.zeros((1000, 2), dtype=complex))
+    assert cache.stats()["items"] == 1
+    assert cache.ensure_entry("e", 0.0, 1.0, 0.0)["segments"].shape == (1000, 2)
+
+
+def test_line_fill_cache_rejects_empty_budget():
+    with pytest.raises(ValueError):
+        LineFillCache(max_bytes=0)
+
+
+def assert_same_hatch(segments, polygon, spacing, angle, atol):
+    """``segments`` hatch ``polygon`` like lines through its vertex mean clipped directly."""
+    origin = polygon.mean(axis=0)
+    expected = clip_hatch_lines(polygon, spacing, angle, origin) @ np.array([1, 1j])
+    as_xy = lambda segs: np.stack((segs.real, segs.imag), axis=-1)
+    actual = clipped_intervals(as_xy(segments), spacing, angle, origin)
+    expected = clipped_intervals(as_xy(expected), spacing, angle, origin)
+    assert sorted(actual) == sorted(expected)
+    for k in expected:
+        np.testing.assert_allclose(actual[k], expected[k], rtol=0, atol=atol)
+
+
+def test_congruent_polygons_share_a_line_fill_entry():
+    context = make_context()
+    base = NON_CONVEX[:, 0] + 1j * NON_CONVEX[:, 1]
+    segments, _ = context.line_fill_segments([base], 0.4, 10.0, 0.0)
+    misses = context._line_fill_cache.stats()["misses"]
+
+    for size, turn in [(2.5, 0.7), (0.3, -2.0), (1.0, np.pi)]:
+        transform = size * np.exp(1j * turn)
+        moved = 40 - 25j + transform * base
+        # Spacing and angle follow the polygon, so its local hatch is the same
+        spacing, angle = 0.4 * size, 10.0 + np.degrees(turn)
+        moved_segments, _ = context.line_fill_segments([moved], spacing, angle, 0.0)
+
+        assert context._line_fill_cache.stats()["misses"] == misses
+        assert moved_segments.shape == segments.shape
+        moved_xy = np.column_stack((moved.real, moved.imag))
+        # Local spacing and angle are quantized to six digits
+        assert_same_hatch(moved_segments, moved_xy, spacing, angle, atol=1e-4 * size)
+
+
+def test_polygons_with_colliding_signatures_are_clipped_apart():
+    # The mirror image, traced in reverse, has the same vertex count, area and perimeter;
+    # turned so that both canonical frames share one rotation, and so one cache key
+    polygon = NON_CONVEX[:, 0] + 1j * NON_CONVEX[:, 1]
+    mirrored = np.conj(polygon)[::-1]
+    bounds = np.array([0, len(polygon), 2 * len(polygon)])
+    _, _, _, scales = LineFillCache.canonical_frames(np.concatenate((polygon, mirrored)), bounds)
+    mirrored = mirrored * scales[0] / scales[1] + 20
+    signatures, local, _, scales = LineFillCache.canonical_frames(np.concatenate((polygon, mirrored)), bounds)
+    assert signatures[0] == signatures[1] and np.isclose(scales[0], scales[1])
+    assert not np.allclose(local[:len(polygon)], local[len(polygon):])
+
+    # In one batch, and with the entry already owned by the other polygon
+    context = make_context()
+    batch, offsets = context.line_fill_segments([polygon, mirrored], 0.4, 30.0, 0.0)
+    single, _ = context.line_fill_segments([mirrored], 0.4, 30.0, 0.0)
+    for segments, points in [(batch[offsets[0]:offsets[1]], polygon), (batch[offsets[1]:], mirrored),
+                             (single, mirrored)]:
+        assert_same_hatch(segments, np.column_stack((points.real, points.imag)), 0.4, 30.0, atol=1e-5)
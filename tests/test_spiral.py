@@ -0,0 +1,316 @@
+import io
+import random
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from src.doyle_spiral import (
+    ArcElement, ArcGroup, ArcSelector, CircleElement, CircleSet, DoyleMath, DoyleSolutionTable, DoyleSpiral, LineFillCache,
+    SvgStreamWriter, default_line_fill_cache, set_default_line_fill_cache,
+)
+
+
+@pytest.mark.parametrize("p, q, t", [
+    (2, 4, 0), (3, 3, 0), (4, 4, 0), (7, 7, 0), (16, 16, 0), (30, 30, 0),  # p == q
+    (5, 4, 0), (9, 4, 0), (12, 5, 0), (20, 7, 0), (64, 4, 0),  # p > q
+    (2, 8, 0), (3, 5, 0), (8, 16, 0), (16, 32, 0),  # p < q
+    # Rotated: outer circles repeat the (family, step) of visible ones
+    (8, 16, 0.3), (16, 16, 0.5), (7, 32, 0.7), (12, 5, 0.9), (5, 9, 0.3), (9, 4, -0.4),
+])
+def test_lattice_topology_matches_kd_tree_search(p, q, t):
+    spiral = DoyleSpiral(p, q, t)
+    spiral.generate_circles()
+    spiral.compute_all_intersections()
+
+    assert spiral.validate_topology() == []
+
+
+def lattice_interior(spiral):
+    """Indices of visible circles whose six lattice neighbours all exist, visible or outer."""
+    p, q = spiral.p, spiral.q
+    sets = (spiral.circle_set, spiral.outer_circle_set)
+    present = {(f, k) for s in sets for f, k in zip(s.families.tolist(), s.steps.tolist())}
+
+    def wrapped(f, k):
+        return f % q, k + p if f >= q else k - p if f < 0 else k
+
+    return [
+        idx for idx, (f, k) in enumerate(zip(spiral.circle_set.families.tolist(), spiral.circle_set.steps.tolist()))
+        if all(wrapped(f + df, k + dk) in present for df, dk in CircleSet.LATTICE_OFFSETS)
+    ]
+
+
+@pytest.mark.parametrize("p, q, t, baseline_groups", [
+    # Group counts of the original per-circle search, where it found every interior circle
+    (7, 32, 0.3, 1152), (7, 32, 0.7, 1152), (16, 32, 0.2, 1040),
+    (8, 16, 0.3, None), (16, 16, 0.5, None), (12, 5, 0.9, None), (5, 9, 0.3, None), (9, 4, -0.4, None),
+    (16, 16, 0, None), (5, 4, 0, None),
+])
+def test_interior_circles_have_six_intersections(p, q, t, baseline_groups):
+    spiral = DoyleSpiral(p, q, t)
+    spiral.to_svg(mode="arram_boyle")
+    interior = lattice_interior(spiral)
+
+    assert interior
+    for idx in interior:
+        points, others = spiral.intersection_set.intersections_of(idx)
+        assert len(points) == 6 and len(set(others.tolist())) == 6
+        gaps = np.abs(points[:, None] - points[None, :])
+        assert gaps[~np.eye(6, dtype=bool)].min() > 1e-3
+    groups = sorted(int(key.split("_")[1]) for key in spiral.arc_groups if key.startswith("circle_"))
+    assert groups == sorted(spiral.circles[idx].id for idx in interior)
+    if baseline_groups is not None:
+        assert len(groups) == baseline_groups
+
+
+@pytest.mark.parametrize("p, q, t", [(7, 32, 0.3), (8, 16, 0.3), (16, 16, 0.5), (5, 9, 0.3)])
+def test_outer_circles_repeating_a_lattice_index_are_identical(p, q, t):
+    spiral = DoyleSpiral(p, q, t)
+    spiral.generate_circles()
+    spiral.generate_outer_circles()
+    visible, outer = spiral.circle_set, spiral.outer_circle_set
+    index = {(f, k): i for i, (f, k) in enumerate(zip(visible.families.tolist(), visible.steps.tolist()))}
+
+    shared = [(index[f, k], j) for j, (f, k) in enumerate(zip(outer.families.tolist(), outer.steps.tolist()))
+              if (f, k) in index]
+    assert shared
+    for i, j in shared:
+        assert visible.centers[i] == outer.centers[j] and visible.radii[i] == outer.radii[j]
+
+
+@pytest.mark.parametrize("mode", ["closest", "farthest", "alternating", "all", "symmetric", "angular"])
+def test_arc_selection_in_set_matches_elements(mode):
+    spiral = DoyleSpiral(7, 32, 0.3)
+    spiral.generate_circles()
+    spiral.generate_outer_circles()
+    spiral.compute_all_intersections()
+
+    for index, circle in enumerate(spiral.circles + spiral.outer_circles):
+        assert (ArcSelector.select_arcs_in_set(spiral.intersection_set, index, 0j, num_gaps=2, mode=mode)
+                == ArcSelector.select_arcs_for_gaps(circle, 0j, num_gaps=2, mode=mode))
+
+
+@pytest.mark.parametrize("p, q", [(3, 3), (12, 12), (16, 16)])
+@pytest.mark.parametrize("offset", [0, 1])
+def test_symmetry_renders_like_per_circle_path(p, q, offset):
+    spirals = [DoyleSpiral(p, q, line_fill_cache=LineFillCache()) for _ in range(2)]
+    svgs = [
+        spiral.to_svg(mode="arram_boyle", add_fill_pattern=True, fill_pattern_offset=offset, use_symmetry=use_symmetry)
+        for spiral, use_symmetry in zip(spirals, (True, False))
+    ]
+    templated, per_circle = (spiral.arc_groups for spiral in spirals)
+
+    assert list(templated) == list(per_circle)
+    for key, group in templated.items():
+        if group.arcs:
+            assert np.array_equal(group.get_closed_outline(), per_circle[key].get_closed_outline())
+    assert svgs[0] == svgs[1]
+
+
+@pytest.mark.parametrize("p, q", [(3, 3), (4, 4), (10, 10), (16, 16), (30, 30)])
+@pytest.mark.parametrize("use_symmetry", [True, False])
+def test_outlines_within_a_ring_are_rotations(p, q, use_symmetry):
+    spiral = DoyleSpiral(p, q)
+    spiral.to_svg(mode="arram_boyle", use_symmetry=use_symmetry)
+
+    rings = {}
+    for circle in spiral.circles:
+        group = spiral.arc_groups.get(f"circle_{circle.id}")
+        if group is not None:
+            rings.setdefault(group.ring_index, []).append((circle, group.get_closed_outline()))
+    assert len(rings) > 1
+    for members in rings.values():
+        first, first_outline = members[0]
+        for circle, outline in members[1:]:
+            rotation = circle.center / first.center
+            assert abs(abs(rotation) - 1) < 1e-9
+            np.testing.assert_allclose(outline, first_outline * rotation, rtol=0, atol=1e-6 * circle.radius)
+    if use_symmetry:
+        # One template per ring
+        roots = {}
+        for group in spiral.arc_groups.values():
+            root = group
+            while root.template is not None:
+                root = root.template
+            roots.setdefault(group.ring_index, set()).add(root.name)
+        assert all(len(names) == 1 for ring, names in roots.items() if ring != -1)
+
+
+def linear_scan_outline_order(group, tol):
+    """The chaining loop before the endpoint grid: rescan every unused arc each step."""
+    entries = sorted(range(len(group.arcs)), key=lambda i: -group.arcs[i].steps)
+    front, back = [], [(entries[0], False)]
+    head, tail = group.arcs[entries[0]].start, group.arcs[entries[0]].end
+    used = {0}
+
+    def attach(idx, append, reversed_arc):
+        nonlocal head, tail
+        arc = group.arcs[entries[idx]]
+        start, end = (arc.end, arc.start) if reversed_arc else (arc.start, arc.end)
+        if append:
+            back.append((entries[idx], reversed_arc))
+            tail = end
+        else:
+            front.append((entries[idx], reversed_arc))
+            head = start
+        used.add(idx)
+
+    attached_any = True
+    while attached_any:
+        attached_any = False
+        for idx, arc_index in enumerate(entries):
+            if idx in used:
+                continue
+            arc = group.arcs[arc_index]
+            result = group._try_attach_arc(head, tail, arc.start, arc.end, tol)
+            if result is not None:
+                attach(idx, *result)
+                attached_any = True
+                break
+    for idx, arc_index in enumerate(entries):
+        if idx not in used:
+            arc = group.arcs[arc_index]
+            attach(idx, *group._attach_by_proximity(head, tail, arc.start, arc.end))
+    return front[::-1] + back, len(front)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_outline_order_matches_linear_scan(seed):
+    tol = 1e-3
+    rng = random.Random(seed)
+    circle = CircleElement(0j, 1.0)
+    corners = np.exp(2j * np.pi * np.arange(300) / 300)
+    arcs = []
+    for k, (start, end) in enumerate(zip(corners, np.roll(corners, -1))):
+        # Endpoints a fraction of tol apart, some straddling grid cells
+        jitter = tol * 0.45 * np.exp(2j * np.pi * rng.random())
+        arcs.append(ArcElement(circle, start + jitter if k % 3 else start, end, steps=rng.randint(1, 40)))
+    # Arcs with near-coincident endpoints compete for the same head or tail
+    for k in rng.sample(range(300), 20):
+        arcs.append(ArcElement(circle, corners[k] + tol * 0.9, corners[(k + 7) % 300], steps=rng.randint(1, 40)))
+    # Far from everything: attached by proximity
+    arcs.append(ArcElement(circle, 5 + 5j, 6 + 5j, steps=3))
+    rng.shuffle(arcs)
+
+    group = ArcGroup(group_id=1)
+    group.extend(arcs)
+
+    assert group._get_outline_order(tol) == linear_scan_outline_order(group, tol)
+
+
+def test_element_svg_respects_precision():
+    dwg = SvgStreamWriter()
+    circle = CircleElement(1 / 3 - 2j / 3, 0.123456)
+    arc = ArcElement(circle, circle.center + 0.123456, circle.center + 0.123456j, steps=4)
+
+    assert circle.to_svg(dwg, precision=2).startswith('<circle cx="0.33" cy="-0.67" r="0.12"')
+    assert circle.to_svg(dwg).startswith(f'<circle cx="{1 / 3!r}"')
+    path = arc.to_svg(dwg, precision=1)
+    assert path.startswith('<path d="M 0.5,-0.7 L') and "0.33" not in path
+
+
+def test_warm_started_root_renders_like_fresh_solve():
+    table = DoyleSolutionTable()
+    table.store(5, 9, DoyleMath.solve_system(5, 9))
+    warm = DoyleMath.solve_continued(16, 16, table)
+    fresh = DoyleMath.solve_system(16, 16)
+    assert warm["residual"] < 1e-15 and fresh["residual"] < 1e-15
+
+    spirals, svgs = [], []
+    for root in (warm, fresh):
+        spiral = DoyleSpiral(16, 16, line_fill_cache=LineFillCache())
+        spiral.root = root
+        svgs.append(spiral.to_svg(mode="arram_boyle", add_fill_pattern=True))
+        spirals.append(spiral)
+    warm_spiral, fresh_spiral = spirals
+
+    warm_set, fresh_set = warm_spiral.intersection_set, fresh_spiral.intersection_set
+    assert (warm_set.intersection_counts() == fresh_set.intersection_counts()).all()
+    for idx in range(len(warm_set)):
+        warm_points, fresh_points = warm_set.intersections_of(idx)[0], fresh_set.intersections_of(idx)[0]
+        assert (np.abs(warm_points[:, None] - fresh_points[None, :]).min(axis=1) < 1e-3).all()
+    assert list(warm_spiral.arc_groups) == list(fresh_spiral.arc_groups)
+    for key, group in warm_spiral.arc_groups.items():
+        np.testing.assert_allclose(group.get_closed_outline(),
+                                   fresh_spiral.arc_groups[key].get_closed_outline(), rtol=0, atol=1e-3)
+    assert svgs[0].count("<line") == svgs[1].count("<line")
+
+
+@pytest.mark.parametrize("use_symmetry", [True, False])
+def test_line_fill_cache_is_shared_between_spirals(use_symmetry):
+    cache = LineFillCache()
+    svgs, stats = [], []
+    for _ in range(2):
+        spiral = DoyleSpiral(8, 16, line_fill_cache=cache)
+        svgs.append(spiral.to_svg(mode="arram_boyle", add_fill_pattern=True, use_symmetry=use_symmetry))
+        stats.append(cache.stats())
+    first, second = stats
+
+    assert first["misses"] > 0
+    # The second spiral finds every fill in the cache the first one filled
+    assert second["misses"] == first["misses"] and second["hits"] > first["hits"]
+    assert second["items"] == first["items"]
+    assert svgs[0] == svgs[1]
+
+
+def test_spirals_default_to_the_process_wide_line_fill_cache():
+    cache = LineFillCache()
+    set_default_line_fill_cache(cache)
+    try:
+        assert default_line_fill_cache() is cache
+        DoyleSpiral(5, 9).to_svg(mode="arram_boyle", add_fill_pattern=True)
+        misses = cache.stats()["misses"]
+        assert misses > 0
+        DoyleSpiral(5, 9).to_svg(mode="arram_boyle", add_fill_pattern=True)
+        assert cache.stats()["misses"] == misses
+    finally:
+        set_default_line_fill_cache(None)
+    assert default_line_fill_cache() is not cache
+
+
+def svg_elements(svg):
+    """(tag, attributes, text) of every element in document order; empty ``<defs>`` dropped."""
+    elements = [(e.tag, e.attrib, (e.text or "").strip()) for e in ET.fromstring(svg).iter()]
+    return [e for e in elements if not (e[0].endswith("defs") and not e[1] and not e[2])]
+
+
+@pytest.mark.parametrize("mode, options", [
+    ("doyle", {}),
+    ("arram_boyle", {}),
+    ("arram_boyle", {"add_fill_pattern": True, "fill_pattern_offset": 1, "red_outline": True}),
+    ("arram_boyle", {"add_fill_pattern": True, "hatch_output": "path", "precision": 2}),
+    ("arram_boyle", {"debug_groups": True, "arc_output": "arc", "draw_group_outline": False}),
+])
+def test_stream_writer_matches_svgwrite(mode, options):
+    pytest.importorskip("svgwrite")
+    spiral = DoyleSpiral(5, 9, line_fill_cache=LineFillCache())
+    stream = spiral.to_svg(mode=mode, svg_backend="stream", **options)
+    reference = spiral.to_svg(mode=mode, svg_backend="svgwrite", **options)
+    out = io.StringIO()
+    assert spiral.to_svg(mode=mode, svg_backend="stream", out=out, **options) == ""
+
+    assert svg_elements(stream) == svg_elements(reference)
+    assert out.getvalue() == stream
+
+
+@pytest.mark.parametrize("p, q, use_symmetry", [(5, 9, True), (16, 16, True), (16, 16, False)])
+@pytest.mark.parametrize("precision", [None, 3])
+def test_path_hatch_holds_the_line_segments(p, q, use_symmetry, precision):
+    spiral = DoyleSpiral(p, q, line_fill_cache=LineFillCache())
+    options = dict(mode="arram_boyle", add_fill_pattern=True, use_symmetry=use_symmetry, precision=precision)
+    lines = svg_elements(spiral.to_svg(hatch_output="lines", **options))
+    paths = svg_elements(spiral.to_svg(hatch_output="path", **options))
+
+    line_segments = [(a["x1"], a["y1"], a["x2"], a["y2"]) for tag, a, _ in lines if tag.endswith("line")]
+    hatches = [a for tag, a, _ in paths if tag.endswith("path") and a.get("stroke-width") == "0.5"]
+    path_segments = []
+    for attributes in hatches:
+        moves = attributes["d"].split("M")[1:]
+        path_segments.extend(tuple(",".join(move.split("L")).split(",")) for move in moves)
+
+    assert line_segments and len(hatches) < len(line_segments)
+    assert path_segments == line_segments
+    # Everything else is drawn alike
+    assert ([e for e in lines if not e[0].endswith("line")]
+            == [e for e in paths if e[1] not in hatches])